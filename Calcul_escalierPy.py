@@ -3,8 +3,10 @@
 import sys
 import os
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import json
+from collections import OrderedDict
+from time import perf_counter
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(BASE_DIR)
@@ -16,6 +18,21 @@ try:
 except ImportError as exc:
     raise ImportError("Impossible d'importer core.constants") from exc
 
+try:
+    from core.preferences import PREFERENCES
+except ImportError as exc:
+    raise ImportError("Impossible d'importer core.preferences") from exc
+
+try:
+    from core.geometrie import elevation
+except ImportError as exc:
+    raise ImportError("Impossible d'importer core.geometrie") from exc
+
+try:
+    from core.instrumentation import CHRONO
+except ImportError as exc:
+    raise ImportError("Impossible d'importer core.instrumentation") from exc
+
 try:
     from core import reporting
 except ImportError as exc:
@@ -23,48 +40,169 @@ except ImportError as exc:
     reporting = None
 
 try:
-    from core import file_operations
+    from utils import file_operations as operations_projet
 except ImportError as exc:
-    print("ERREUR : Impossible d'importer core.file_operations :", exc)
-    file_operations = None
+    print("ERREUR : Impossible d'importer utils.file_operations :", exc)
+    operations_projet = None
 
 try:
-    from core import formatting
+    from core import projets
 except ImportError as exc:
-    print("ERREUR : Impossible d'importer core.formatting :", exc)
-    formatting = None
+    print("ERREUR : Impossible d'importer core.projets :", exc)
+    projets = None
 
 try:
-    from core import calculations
+    from core import view_model
 except ImportError as exc:
-    print("ERREUR : Impossible d'importer core.calculations :", exc)
-    calculations = None
+    print("ERREUR : Impossible d'importer core.view_model :", exc)
+    view_model = None
+
+try:
+    from gui.liaison_tk import LiaisonTk
+except ImportError as exc:
+    raise ImportError("Impossible d'importer gui.liaison_tk") from exc
 
 try:
     from core.preferences_dialog import PreferencesDialog
 except ImportError as exc:
     raise ImportError("Impossible d'importer PreferencesDialog") from exc
 
-print("Chemin actuel :", BASE_DIR)
-print("Chemin PYTHONPATH :", sys.path)
-
-constants_path = os.path.join(BASE_DIR, "core", "constants.py")
-if not os.path.exists(constants_path):
-    print("ERREUR : Le fichier constants.py est introuvable :", constants_path)
-else:
-    print("Fichier constants.py trouvé :", constants_path)
-
-# --- Vérification et création du dossier et fichier de préférences ---
 DEFAULTS_FILE = constants.DEFAULTS_FILE
 DEFAULT_APP_PREFERENCES = constants.DEFAULT_APP_PREFERENCES
 
-defaults_dir = os.path.dirname(DEFAULTS_FILE)
-if defaults_dir:
-    os.makedirs(defaults_dir, exist_ok=True)
 
-if not os.path.exists(DEFAULTS_FILE):
-    with open(DEFAULTS_FILE, 'w') as f:
-        json.dump(DEFAULT_APP_PREFERENCES, f, indent=4)
+def preparer_environnement():
+    """
+    Vérification et création du dossier et fichier de préférences. Appelée au
+    lancement de l'application, jamais à l'import du module.
+    """
+    if constants.DEBUG_MODE_ACTIVE:
+        print("Chemin actuel :", BASE_DIR)
+        print("Chemin PYTHONPATH :", sys.path)
+
+    constants_path = os.path.join(BASE_DIR, "core", "constants.py")
+    if not os.path.exists(constants_path):
+        print("ERREUR : Le fichier constants.py est introuvable :", constants_path)
+
+    defaults_dir = os.path.dirname(DEFAULTS_FILE)
+    if defaults_dir:
+        os.makedirs(defaults_dir, exist_ok=True)
+
+    if not os.path.exists(DEFAULTS_FILE):
+        PREFERENCES.enregistrer(DEFAULT_APP_PREFERENCES)
+
+# Délai (ms) pendant lequel les écritures successives des champs sont regroupées
+# en un seul recalcul ; chaque nouvelle écriture repousse l'échéance.
+DELAI_RECALCUL_MS = 40
+# Intervalle minimal (ms) entre deux redessins de l'aperçu pendant un redimensionnement
+DELAI_APERCU_MS = 50
+
+
+class ApercuEscalier:
+    """
+    Scène 2D conservée de l'aperçu : les objets du canevas (contremarches,
+    girons, planchers, trémie, ligne d'échappée, limon) sont créés une fois puis
+    déplacés avec `coords`. Quand le nombre de marches change, seuls les objets
+    en trop ou en moins sont supprimés ou créés. La géométrie vient de
+    core.geometrie, comme pour l'export SVG/DXF.
+    """
+
+    MARGE = 50
+
+    def __init__(self, canvas, couleurs):
+        self.canvas = canvas
+        self.couleurs = couleurs
+        self._traits = []   # ids des contremarches puis des girons
+        self._objets = {}   # nom → id des autres objets
+        self._options = {}  # nom → dernières options appliquées
+
+    def _objet(self, nom, type_objet, coords, **options):
+        """Crée l'objet `nom` au premier appel, sinon le déplace ; le rend visible."""
+        options["state"] = "normal"
+        ident = self._objets.get(nom)
+        if ident is None:
+            self._objets[nom] = getattr(self.canvas, f"create_{type_objet}")(*coords, **options)
+            self._options[nom] = options
+            return
+        self.canvas.coords(ident, *coords)
+        if self._options[nom] != options:
+            self.canvas.itemconfigure(ident, **options)
+            self._options[nom] = options
+
+    def _masquer(self, *noms):
+        for nom in noms:
+            ident = self._objets.get(nom)
+            if ident is not None and self._options[nom].get("state") != "hidden":
+                self.canvas.itemconfigure(ident, state="hidden")
+                self._options[nom] = dict(self._options[nom], state="hidden")
+
+    def _ajuster_traits(self, nombre):
+        trait = {"fill": self.couleurs["canvas_line"], "width": 2}
+        while len(self._traits) < nombre:
+            self._traits.append(self.canvas.create_line(0, 0, 0, 0, **trait))
+        while len(self._traits) > nombre:
+            self.canvas.delete(self._traits.pop())
+
+    def effacer(self):
+        self._ajuster_traits(0)
+        self._masquer(*self._objets)
+
+    def dessiner(self, res, largeur, hauteur):
+        """Met la scène à jour pour le résultat `res` (StairResult) et la taille du canevas."""
+        elev = elevation(res)
+        if elev is None:
+            self.effacer()
+            return
+        e = elev.etendue
+        echelle = min((largeur - 2 * self.MARGE) / (e.x2 - e.x1), (hauteur - 2 * self.MARGE) / (e.y2 - e.y1))
+        if echelle <= 0:
+            self.effacer()
+            return
+
+        def point(x, y):
+            return self.MARGE + (x - e.x1) * echelle, hauteur - self.MARGE - (y - e.y1) * echelle
+
+        def rectangle(r, epaisseur_min=0):
+            (gauche, bas), (droite, haut) = point(r.x1, r.y1), point(r.x2, r.y2)
+            return gauche, haut, droite, max(bas, haut + epaisseur_min)
+
+        traits = elev.contremarches + elev.girons
+        self._ajuster_traits(len(traits))
+        for ident, t in zip(self._traits, traits):
+            self.canvas.coords(ident, *point(t.x1, t.y1), *point(t.x2, t.y2))
+
+        if elev.limon:
+            self._objet("limon", "polygon", [c for x, y in elev.limon for c in point(x, y)],
+                        fill="", outline=self.couleurs["canvas_line"], width=1)
+        else:
+            self._masquer("limon")
+
+        couleur_plancher = self.couleurs["canvas_floor"]
+        if elev.plancher_inf:
+            self._objet("plancher_inf", "rectangle", rectangle(elev.plancher_inf), fill=couleur_plancher, outline="")
+        else:
+            self._masquer("plancher_inf")
+
+        # Plancher supérieur (au moins 2 px d'épaisseur), interrompu par la trémie
+        noms_plancher_sup = ("plancher_sup_gauche", "plancher_sup_droite")
+        for nom, partie in zip(noms_plancher_sup, elev.plancher_sup):
+            self._objet(nom, "rectangle", rectangle(partie, 2), fill=couleur_plancher, outline="")
+        self._masquer(*noms_plancher_sup[len(elev.plancher_sup):])
+        if elev.tremie:
+            self._objet("tremie", "rectangle", rectangle(elev.tremie, 2), outline=self.couleurs["canvas_line"], dash=(2, 2))
+        else:
+            self._masquer("tremie")
+
+        # Échappée réglementaire : ligne de foulée relevée de la hauteur libre minimale
+        if elev.echappee:
+            t = elev.echappee
+            self._objet("echappee", "line", (*point(t.x1, t.y1), *point(t.x2, t.y2)),
+                        fill=self.couleurs["warning"], dash=(6, 4))
+        else:
+            self._masquer("echappee")
+
+        self._objet("titre", "text", (largeur / 2, 30), text=elev.titre,
+                    fill=self.couleurs["canvas_line"], font=("Arial", 12, "bold"))
 
 class ModernStairCalculator(tk.Tk):
     """
@@ -75,22 +213,15 @@ class ModernStairCalculator(tk.Tk):
     def on_unit_change(self):
         """Callback exécuté quand on change l'unité (Pouces / Centimètres)."""
         new_unit = self.unites_var.get()
-        previous_unit = getattr(self, "_current_input_unit", new_unit)
+        previous_unit = self.modele.unite
         print(f"⚙️ Unité sélectionnée : {new_unit}")
 
-        if new_unit == previous_unit:
-            self.app_preferences["unites_affichage"] = new_unit
-            self._current_input_unit = new_unit
-            return
-
         try:
-            self._convert_inputs_between_units(previous_unit, new_unit)
+            self.modele.changer_unite(new_unit)
         except Exception as exc:
             print(f"Erreur lors de la conversion des unités : {exc}")
-
-        # Mettre à jour les préférences
-        self.app_preferences["unites_affichage"] = new_unit
-        self._current_input_unit = new_unit
+        if new_unit == previous_unit:
+            return
 
         # Recalculer et rafraîchir l'UI
         try:
@@ -98,6 +229,18 @@ class ModernStairCalculator(tk.Tk):
         except Exception as e:
             print(f"Erreur lors du recalcul après changement d'unité : {e}")
 
+    @property
+    def app_preferences(self):
+        return self.modele.preferences
+
+    @app_preferences.setter
+    def app_preferences(self, preferences):
+        self.modele.preferences = preferences
+
+    @property
+    def latest_results(self):
+        return self.modele.resultat
+
     def __init__(self):
         super().__init__()
         self.style = ttk.Style(self)
@@ -112,11 +255,15 @@ class ModernStairCalculator(tk.Tk):
         self._create_menu()
         self._create_main_layout()
         self._bind_events()
-        self.clear_messages()
 
     def _initialize_state(self):
         self._is_updating_ui = False
-        self.latest_results = {}
+        self._recalcul_planifie = None
+        self._variables_modifiees = []
+        self.stats_recalcul = {"demandes": 0, "fusionnees": 0, "executes": 0}
+        # Rapports générés à la demande : onglet → texte affiché à jour ou non, cache par empreinte
+        self._rapports_a_jour = {"plan": False, "tableau": False}
+        self._cache_rapports = OrderedDict()
         self.input_labels_map = {}
 
         self.themes = {
@@ -126,74 +273,33 @@ class ModernStairCalculator(tk.Tk):
                 "warning": "#c27c1f",
                 "error": "#c0392b",
                 "canvas_line": "#274472",
+                "canvas_floor": "#c5ccd6",
             }
         }
         self.current_theme = "light"
 
-        base_preferences = DEFAULT_APP_PREFERENCES.copy()
-        if file_operations and hasattr(file_operations, 'load_application_preferences'):
-            try:
-                loaded_prefs = file_operations.load_application_preferences()
-                if isinstance(loaded_prefs, dict):
-                    base_preferences.update(loaded_prefs)
-            except Exception as exc:
-                print("⚠️ Préférences par défaut utilisées (erreur de chargement) :", exc)
-        self.app_preferences = base_preferences
-
-        default_hcm = str(constants.HAUTEUR_CM_CONFORT_CIBLE)
-        if formatting:
-            try:
-                default_hcm = formatting.decimal_to_fraction_str(
-                    constants.HAUTEUR_CM_CONFORT_CIBLE, self.app_preferences
-                )
-            except Exception as exc:
-                print("⚠️ Impossible de formater la hauteur CM par défaut :", exc)
+        base_preferences = PREFERENCES.instantane()
+        # Toute la logique de saisie et de calcul est dans le modèle de vue ;
+        # les variables Tk ci-dessous lui sont liées dans _bind_events.
+        self.modele = view_model.StairViewModel(base_preferences)
+        self._couleur_conformite = None
 
         self.unites_var = tk.StringVar(
             value=self.app_preferences.get("unites_affichage", "pouces")
         )
         self.hauteur_totale_var = tk.StringVar()
-        self.epaisseur_plancher_sup_var = tk.StringVar(
-            value=self.app_preferences.get("default_floor_finish_thickness_upper", "0")
-        )
-        self.epaisseur_plancher_inf_var = tk.StringVar(
-            value=self.app_preferences.get("default_floor_finish_thickness_lower", "0")
-        )
+        self.epaisseur_plancher_sup_var = tk.StringVar()
+        self.epaisseur_plancher_inf_var = tk.StringVar()
         self.profondeur_tremie_ouverture_var = tk.StringVar()
         self.position_tremie_var = tk.StringVar()
         self.espace_disponible_var = tk.StringVar()
-        self.nombre_marches_manuel_var = tk.StringVar(value="")
-        self.nombre_cm_manuel_var = tk.StringVar(value="")
-        self.giron_souhaite_var = tk.StringVar(
-            value=self.app_preferences.get("default_tread_width_straight", "9 1/4")
-        )
-        self.hauteur_cm_souhaitee_var = tk.StringVar(value=default_hcm)
-
-        self.tk_input_vars_dict = {
-            "hauteur_totale_var": self.hauteur_totale_var,
-            "hauteur_cm_souhaitee_var": self.hauteur_cm_souhaitee_var,
-            "giron_souhaite_var": self.giron_souhaite_var,
-            "epaisseur_plancher_sup_var": self.epaisseur_plancher_sup_var,
-            "epaisseur_plancher_inf_var": self.epaisseur_plancher_inf_var,
-            "profondeur_tremie_ouverture_var": self.profondeur_tremie_ouverture_var,
-            "position_tremie_var": self.position_tremie_var,
-            "espace_disponible_var": self.espace_disponible_var,
-        }
-
-        self._current_input_unit = self.unites_var.get()
-        self._unit_sensitive_vars = [
-            self.hauteur_totale_var,
-            self.giron_souhaite_var,
-            self.hauteur_cm_souhaitee_var,
-            self.epaisseur_plancher_sup_var,
-            self.epaisseur_plancher_inf_var,
-            self.profondeur_tremie_ouverture_var,
-            self.position_tremie_var,
-            self.espace_disponible_var,
-        ]
+        self.nombre_marches_manuel_var = tk.StringVar()
+        self.nombre_cm_manuel_var = tk.StringVar()
+        self.giron_souhaite_var = tk.StringVar()
+        self.hauteur_cm_souhaitee_var = tk.StringVar()
 
-        self.conformity_status_var = tk.StringVar(value="EN ATTENTE")
-        self.warnings_var = tk.StringVar(value="")
+        self.conformity_status_var = tk.StringVar()
+        self.warnings_var = tk.StringVar()
         self.hauteur_reelle_cm_res_var = tk.StringVar()
         self.giron_utilise_res_var = tk.StringVar()
         self.longueur_totale_res_var = tk.StringVar()
@@ -210,36 +316,6 @@ class ModernStairCalculator(tk.Tk):
         self.angle_message_var = tk.StringVar()
         self.hauteur_totale_ecart_message_var = tk.StringVar()
 
-    def _convert_inputs_between_units(self, from_unit, to_unit):
-        if not formatting or from_unit == to_unit:
-            return
-
-        factor = constants.POUCE_EN_CM
-        was_updating = self._is_updating_ui
-        self._is_updating_ui = True
-        try:
-            for var in self._unit_sensitive_vars:
-                raw_value = var.get().strip()
-                if not raw_value:
-                    continue
-
-                normalized_value = raw_value.replace(',', '.')
-                try:
-                    numeric_value = formatting.parser_fraction(normalized_value)
-                except Exception:
-                    continue
-
-                if from_unit == "cm":
-                    numeric_value /= factor
-
-                if to_unit == "cm":
-                    converted_value = numeric_value * factor
-                    var.set(f"{converted_value:.2f}")
-                else:
-                    var.set(formatting.decimal_to_fraction_str(numeric_value, self.app_preferences))
-        finally:
-            self._is_updating_ui = was_updating
-
     def _setup_style_definitions(self):
         colors = self.themes[self.current_theme]
         self.style.configure("TLabelFrame", borderwidth=2, relief="groove", padding=10)
@@ -255,7 +331,23 @@ class ModernStairCalculator(tk.Tk):
         self.config(menu=menubar)
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Fichier", menu=file_menu)
+        file_menu.add_command(label="Ouvrir un projet...", command=self.load_project)
+        file_menu.add_command(label="Enregistrer le projet...", command=self.save_project)
+        file_menu.add_command(label="Archive des projets...", command=self.open_archive_dialog)
+        file_menu.add_separator()
+        file_menu.add_command(label="Exporter l'élévation (SVG/DXF)...", command=self.export_vector_drawing)
+        file_menu.add_command(label="Exporter le rapport PDF...", command=self.export_pdf_report)
+        file_menu.add_command(label="Exporter les rapports (texte, Markdown, HTML, CSV)...", command=self.export_reports)
+        file_menu.add_separator()
         file_menu.add_command(label="Quitter", command=self.quit)
+        outils_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Outils", menu=outils_menu)
+        self.instrumentation_var = tk.BooleanVar(value=CHRONO.actif)
+        outils_menu.add_checkbutton(
+            label="Mesurer les temps de recalcul", variable=self.instrumentation_var,
+            command=self.toggle_instrumentation,
+        )
+        outils_menu.add_command(label="Exporter les temps (JSON)...", command=self.export_instrumentation)
 
     def _create_main_layout(self):
         main_pane = ttk.PanedWindow(self, orient=tk.HORIZONTAL)
@@ -271,6 +363,7 @@ class ModernStairCalculator(tk.Tk):
         self._create_report_tab(right_notebook)
         self._create_table_tab(right_notebook)
         main_pane.add(right_notebook, weight=2)
+        right_notebook.bind("<<NotebookTabChanged>>", self._on_notebook_tab_changed)
         
     def _create_input_frame(self, parent):
         input_frame = ttk.LabelFrame(parent, text="1. Entrées et Ajustements de l'Escalier")
@@ -384,402 +477,317 @@ class ModernStairCalculator(tk.Tk):
         visual_frame = ttk.Frame(notebook, padding=5)
         self.canvas = tk.Canvas(visual_frame) 
         self.canvas.pack(expand=True, fill="both")
+        self.apercu = ApercuEscalier(self.canvas, self.themes[self.current_theme])
+        self._apercu_planifie = None
+        self._taille_apercu = None
         notebook.add(visual_frame, text="Aperçu 2D")
 
     def _create_report_tab(self, notebook):
-        report_frame = ttk.Frame(notebook, padding=5)
-        self.report_text = tk.Text(report_frame, wrap="word", font=("Courier New", 9)) 
+        self.report_frame = ttk.Frame(notebook, padding=5)
+        self.report_text = tk.Text(self.report_frame, wrap="word", font=("Courier New", 9)) 
         self.report_text.pack(expand=True, fill="both")
-        notebook.add(report_frame, text="Plan de Traçage")
+        notebook.add(self.report_frame, text="Plan de Traçage")
     
     def _create_table_tab(self, notebook):
-        table_frame = ttk.Frame(notebook, padding=5)
-        self.table_text = tk.Text(table_frame, wrap="none", font=("Courier New", 9)) 
+        self.table_frame = ttk.Frame(notebook, padding=5)
+        self.table_text = tk.Text(self.table_frame, wrap="none", font=("Courier New", 9)) 
         self.table_text.pack(expand=True, fill="both")
-        notebook.add(table_frame, text="Tableau des Marches")
+        notebook.add(self.table_frame, text="Tableau des Marches")
 
     def _bind_events(self):
-        for var_name, var_obj in self.tk_input_vars_dict.items():
-            var_obj.trace_add("write", lambda *args, vn=var_name: self.recalculate_and_update_ui(changed_var_name=vn))
-        self.nombre_cm_manuel_var.trace_add("write", lambda *args, vn="nombre_cm_manuel_var": self.recalculate_and_update_ui(changed_var_name=vn))
-        self.nombre_marches_manuel_var.trace_add("write", lambda *args, vn="nombre_marches_manuel_var": self.recalculate_and_update_ui(changed_var_name=vn))
-        self.canvas.bind("<Configure>", self.update_visual_preview)
-        self.hauteur_totale_var.trace_add("write", lambda *args: self._update_from_height())
-
-    def _update_from_height(self):
-        """Met à jour les valeurs quand la hauteur totale change"""
-        if self._is_updating_ui:
-            return
-        try:
-            height = formatting.parser_fraction(self.hauteur_totale_var.get())
-            if height <= 0:
-                return
-                
-            # Calcul du nombre de contremarches optimal
-            hcm_ideal = constants.HAUTEUR_CM_CONFORT_CIBLE
-            nb_cm = max(2, round(height / hcm_ideal))
-            hcm_reel = height / nb_cm
-            
-            # Mise à jour des champs
-            self._is_updating_ui = True
-            self.nombre_cm_manuel_var.set(str(nb_cm))
-            self.nombre_marches_manuel_var.set(str(nb_cm - 1))
-            self.hauteur_cm_souhaitee_var.set(
-                formatting.decimal_to_fraction_str(hcm_reel, self.app_preferences)
-            )
-            
-            if constants.DEBUG_MODE_ACTIVE:
-                print(f"DEBUG - Mise à jour depuis hauteur {height}: CM={nb_cm}, HCM={hcm_reel}")
-        finally:
-            self._is_updating_ui = False
-            self.recalculate_and_update_ui()
-
-    def _update_from_marches(self, new_nb_marches):
-        """Met à jour les valeurs quand le nombre de marches change"""
-        if self._is_updating_ui:
-            return
-        try:
-            self._is_updating_ui = True
-            nb_cm = new_nb_marches + 1
-            self.nombre_cm_manuel_var.set(str(nb_cm))
-            
-            # Si on a une hauteur totale, on ajuste la hauteur de contremarse
-            height = formatting.parser_fraction(self.hauteur_totale_var.get() or "0")
-            if height > 0:
-                hcm = height / nb_cm
-                self.hauteur_cm_souhaitee_var.set(
-                    formatting.decimal_to_fraction_str(hcm, self.app_preferences)
-                )
-            
-            if constants.DEBUG_MODE_ACTIVE:
-                print(f"DEBUG - Mise à jour depuis marches {new_nb_marches}: CM={nb_cm}")
-        finally:
-            self._is_updating_ui = False
-            self.recalculate_and_update_ui()
-
-    def _update_from_cm(self, new_nb_cm):
-        """Met à jour les valeurs quand le nombre de contremarches change"""
+        # Chaque champ du modèle de vue est lié à la variable Tk <nom>_var
+        variables = {
+            nom: getattr(self, f"{nom}_var")
+            for nom in view_model.CHAMPS_SAISIE + view_model.CHAMPS_AFFICHAGE
+            if nom != "couleur_conformite"
+        }
+        self.liaison = LiaisonTk(self.modele, variables, au_changement=self.schedule_recalculation)
+        self.modele.observer("couleur_conformite", self._set_conformity_color)
+        self._set_conformity_color(self.modele.get("couleur_conformite"))
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        PREFERENCES.abonner(self._on_preferences_changed)
+        # Au retour dans la fenêtre, le fichier de préférences n'est relu que si sa date a changé
+        self.bind("<FocusIn>", lambda event: PREFERENCES.instantane() if event.widget is self else None)
+
+    def schedule_recalculation(self, changed_var_name=None):
+        """
+        Planifie un recalcul après DELAI_RECALCUL_MS au lieu de recalculer à
+        chaque écriture : une rafale de frappes ou de clics ne donne qu'un seul
+        recalcul, sur les valeurs finales. Les écritures faites par le programme
+        pendant une mise à jour de l'interface sont ignorées.
+        """
         if self._is_updating_ui:
             return
-        try:
-            self._is_updating_ui = True
-            self.nombre_marches_manuel_var.set(str(new_nb_cm - 1))
-            
-            # Si on a une hauteur totale, on ajuste la hauteur de contremarche
-            height = formatting.parser_fraction(self.hauteur_totale_var.get() or "0")
-            if height > 0:
-                hcm = height / new_nb_cm
-                self.hauteur_cm_souhaitee_var.set(
-                    formatting.decimal_to_fraction_str(hcm, self.app_preferences)
-                )
-            
-            if constants.DEBUG_MODE_ACTIVE:
-                print(f"DEBUG - Mise à jour depuis CM {new_nb_cm}")
-        finally:
-            self._is_updating_ui = False
-            self.recalculate_and_update_ui()
+        self.stats_recalcul["demandes"] += 1
+        if changed_var_name and changed_var_name not in self._variables_modifiees:
+            self._variables_modifiees.append(changed_var_name)
+        if self._recalcul_planifie is not None:
+            # La demande en attente devient caduque : on repousse l'échéance
+            self.after_cancel(self._recalcul_planifie)
+            self.stats_recalcul["fusionnees"] += 1
+        self._recalcul_planifie = self.after(DELAI_RECALCUL_MS, self._run_scheduled_recalculation)
+
+    def _run_scheduled_recalculation(self):
+        self._recalcul_planifie = None
+        variables = self._variables_modifiees
+        self._variables_modifiees = []
+        self.stats_recalcul["executes"] += 1
+        # Variable saisie par l'utilisateur (None si plusieurs champs ont changé) ;
+        # la cascade depuis la hauteur totale est faite par le modèle de vue
+        changed_var_name = variables[0] if len(variables) == 1 else None
+        self.recalculate_and_update_ui(changed_var_name=changed_var_name)
+        if constants.DEBUG_MODE_ACTIVE:
+            print(f"DEBUG - Recalcul pour {variables or 'aucune variable'} ; statistiques : {self.stats_recalcul}")
+
+    def _ajuster(self, nom, sens):
+        """Boutons +/- : le modèle de vue ajuste le champ (et ceux qui en dépendent)."""
+        self.modele.incrementer(nom, sens)
+        self.schedule_recalculation(nom)
 
     def decrement_cm(self):
         """Décrémente le nombre de contremarches"""
-        try:
-            current_val = int(self.nombre_cm_manuel_var.get().strip() or "0")
-            if current_val > 2:
-                self._update_from_cm(current_val - 1)
-        except ValueError:
-            pass
+        self._ajuster("nombre_cm_manuel", -1)
 
     def increment_cm(self):
         """Incrémente le nombre de contremarches"""
-        try:
-            current_val = int(self.nombre_cm_manuel_var.get().strip() or "0")
-            if current_val < 50:
-                self._update_from_cm(current_val + 1)
-        except ValueError:
-            pass
+        self._ajuster("nombre_cm_manuel", 1)
 
     def decrement_marches(self):
         """Décrémente le nombre de marches"""
-        try:
-            current_val = int(self.nombre_marches_manuel_var.get().strip() or "0")
-            if current_val > 1:
-                self._update_from_marches(current_val - 1)
-        except ValueError:
-            pass
+        self._ajuster("nombre_marches_manuel", -1)
 
     def increment_marches(self):
         """Incrémente le nombre de marches"""
-        try:
-            current_val = int(self.nombre_marches_manuel_var.get().strip() or "0")
-            if current_val < 49:
-                self._update_from_marches(current_val + 1)
-        except ValueError:
-            pass
+        self._ajuster("nombre_marches_manuel", 1)
 
     def decrement_hcm(self):
-        try:
-            current_val = formatting.parser_fraction(self.hauteur_cm_souhaitee_var.get())
-            new_val = max(constants.HAUTEUR_CM_MIN_REGLEMENTAIRE, current_val - 0.125)
-            self.hauteur_cm_souhaitee_var.set(formatting.decimal_to_fraction_str(new_val, self.app_preferences))
-        except (ValueError, Exception): pass
+        self._ajuster("hauteur_cm_souhaitee", -1)
 
     def increment_hcm(self):
-        try:
-            current_val = formatting.parser_fraction(self.hauteur_cm_souhaitee_var.get())
-            new_val = min(constants.HAUTEUR_CM_MAX_REGLEMENTAIRE, current_val + 0.125)
-            self.hauteur_cm_souhaitee_var.set(formatting.decimal_to_fraction_str(new_val, self.app_preferences))
-        except (ValueError, Exception): pass
+        self._ajuster("hauteur_cm_souhaitee", 1)
 
     def decrement_giron(self):
-        try:
-            current_val = formatting.parser_fraction(self.giron_souhaite_var.get())
-            new_val = max(constants.GIRON_MIN_REGLEMENTAIRE, current_val - 0.125)
-            self.giron_souhaite_var.set(formatting.decimal_to_fraction_str(new_val, self.app_preferences))
-        except (ValueError, Exception): pass
+        self._ajuster("giron_souhaite", -1)
 
     def increment_giron(self):
-        try:
-            current_val = formatting.parser_fraction(self.giron_souhaite_var.get())
-            new_val = min(constants.GIRON_MAX_REGLEMENTAIRE, current_val + 0.125)
-            self.giron_souhaite_var.set(formatting.decimal_to_fraction_str(new_val, self.app_preferences))
-        except (ValueError, Exception): pass
+        self._ajuster("giron_souhaite", 1)
 
     def apply_ideal_values(self):
-        default_tread = self.app_preferences.get("default_tread_width_straight", "9 1/4").replace('"', '')
-        self.giron_souhaite_var.set(formatting.decimal_to_fraction_str(formatting.parser_fraction(default_tread), self.app_preferences))
-        self.hauteur_cm_souhaitee_var.set(formatting.decimal_to_fraction_str(constants.HAUTEUR_CM_CONFORT_CIBLE, self.app_preferences))
-        h_tot = formatting.parser_fraction(self.hauteur_totale_var.get() or "0")
-        if h_tot > 0:
-            nb_cm = max(2, round(h_tot / constants.HAUTEUR_CM_CONFORT_CIBLE))
-            self.nombre_cm_manuel_var.set(str(nb_cm))
-            self.nombre_marches_manuel_var.set(str(nb_cm - 1))
+        self.modele.appliquer_valeurs_ideales()
+        self.schedule_recalculation()
         messagebox.showinfo("Valeurs Idéales", "Les valeurs de confort ont été appliquées.", parent=self)
 
+    def _set_conformity_color(self, cle):
+        if cle != self._couleur_conformite:
+            self.conformity_label.config(foreground=self.themes[self.current_theme][cle])
+            self._couleur_conformite = cle
+
     def recalculate_and_update_ui(self, *args, changed_var_name=None):
         if self._is_updating_ui: return
         self._is_updating_ui = True
-        self.clear_messages()
-        
-        try:
-            # Vérification de l'initialisation des modules
-            # Supprimé car inutile si le module est bien défini
-
-            # 1. Récupération des valeurs
-            input_values = {
-                'hauteur_totale': self.hauteur_totale_var.get().strip(),
-                'hauteur_cm': self.hauteur_cm_souhaitee_var.get().strip(),
-                'nb_cm': self.nombre_cm_manuel_var.get().strip(),
-                'nb_marches': self.nombre_marches_manuel_var.get().strip(),
-                'giron': self.giron_souhaite_var.get().strip(),
-                'ep_plancher_sup': self.epaisseur_plancher_sup_var.get().strip(),
-                'ep_plancher_inf': self.epaisseur_plancher_inf_var.get().strip()
-            }
 
+        mesurer = CHRONO.actif
+        debut = perf_counter() if mesurer else 0.0
+        try:
             if constants.DEBUG_MODE_ACTIVE:
                 print("\nDEBUG - Valeurs d'entrée:")
-                for k, v in input_values.items():
-                    print(f"  {k}: '{v}'")
-
-            # 2. Validation des formats
-            required_numeric_fields = {
-                'giron': input_values['giron'],
-                'ep_plancher_sup': input_values['ep_plancher_sup'],
-                'ep_plancher_inf': input_values['ep_plancher_inf']
-            }
+                for nom in view_model.CHAMPS_SAISIE:
+                    print(f"  {nom}: '{self.modele.get(nom)}'")
+
+            # Validation, calcul et mise en forme : les champs liés sont mis à jour
+            # par le modèle de vue (seulement ceux dont la valeur change)
+            calc_output = self.modele.recalculer(changed_var_name)
+            if mesurer:
+                fin_resultats = perf_counter()
+                CHRONO.enregistrer("interface.resultats", fin_resultats - debut)
+
+            if calc_output is not None:
+                if constants.DEBUG_MODE_ACTIVE:
+                    print("\nDEBUG - Résultats reçus:", calc_output.is_valid)
+                    print("  - nb_girons:", calc_output.nombre_girons)
+                    print("  - hauteur_cm:", calc_output.hauteur_reelle_contremarche)
+                    print("  - giron:", calc_output.giron_utilise)
+                    print("  - étapes recalculées:", self.modele.moteur.derniere_execution)
+                self.update_visual_preview()
+                if mesurer:
+                    fin_apercu = perf_counter()
+                    CHRONO.enregistrer("interface.apercu", fin_apercu - fin_resultats)
+                self.update_reports()
+                if mesurer:
+                    CHRONO.enregistrer("interface.rapports", perf_counter() - fin_apercu)
+            elif constants.DEBUG_MODE_ACTIVE:
+                print(f"\nDEBUG - Erreur de validation: {self.modele.erreur}")
 
-            # Vérification des champs numériques obligatoires
-            for field_name, value in required_numeric_fields.items():
-                if not value:
-                    raise ValueError(f"Le champ {field_name} est obligatoire")
-                try:
-                    _ = formatting.parser_fraction(value)
-                except Exception as e:
-                    raise ValueError(f"Format invalide pour {field_name}: {value} ({str(e)})")
-
-            # 3. Vérification de la règle de saisie minimale
-            valid_combinations = [
-                input_values['hauteur_totale'] and input_values['hauteur_cm'],  # Cas 1
-                input_values['nb_cm'] and input_values['hauteur_cm']           # Cas 2
-                # Cas 3 supprimé car redondant avec le calcul automatique du nombre de contremarches
-            ]
-
-            if not any(valid_combinations):
-                raise ValueError("Configuration invalide: fournir (hauteur totale ET hauteur CM) OU (nombre CM ET hauteur CM)")
-
-            # 4. Conversion et calcul
-            unite_calcul = "Pouces" if self.unites_var.get() == "pouces" else "Centimètres"
-            
-            if constants.DEBUG_MODE_ACTIVE:
-                print(f"\nDEBUG - Lancement calcul avec unité: {unite_calcul}")
-
-            calc_output = calculations.calculer_escalier_ajuste(
-                hauteur_totale_escalier_str=input_values['hauteur_totale'],
-                giron_souhaite_str=input_values['giron'],
-                hauteur_cm_souhaitee_str=input_values['hauteur_cm'],
-                nombre_marches_manuel_str=input_values['nb_marches'],
-                nombre_cm_manuel_str=input_values['nb_cm'],
-                epaisseur_plancher_sup_str=input_values['ep_plancher_sup'],
-                epaisseur_plancher_inf_str=input_values['ep_plancher_inf'],
-                profondeur_tremie_ouverture_str=self.profondeur_tremie_ouverture_var.get(),
-                position_tremie_ouverture_str=self.position_tremie_var.get(),
-                espace_disponible_str=self.espace_disponible_var.get(),
-                loaded_app_preferences_dict=self.app_preferences,
-                changed_var_name=changed_var_name,
-                unite=unite_calcul
-            )
-
-            # 5. Traitement des résultats
-            self.latest_results = calc_output.get("results", {})
-            
-            if constants.DEBUG_MODE_ACTIVE:
-                print("\nDEBUG - Résultats reçus:", bool(self.latest_results))
-                if self.latest_results:
-                    print("  - nb_girons:", self.latest_results.get("nombre_girons"))
-                    print("  - hauteur_cm:", self.latest_results.get("hauteur_reelle_contremarche"))
-                    print("  - giron:", self.latest_results.get("giron_utilise"))
-
-            if not self.latest_results:
-                raise ValueError("Aucun résultat retourné par le calcul")
-
-            # 6. Mise à jour de l'interface
-            self._update_interface_from_results(self.latest_results)
-            self.update_results_display()
-            self.update_warnings_display(calc_output["warnings"], calc_output["is_conform"])
-            self.update_visual_preview()
-            self.update_reports()
-
-        except ValueError as ve:
-            self.conformity_status_var.set("DONNÉES INVALIDES")
-            self.warnings_var.set(f"Erreur de validation: {str(ve)}")
-            if constants.DEBUG_MODE_ACTIVE:
-                print(f"\nDEBUG - Erreur de validation: {str(ve)}")
         except Exception as e:
-            self.conformity_status_var.set("ERREUR DE CALCUL")
-            self.warnings_var.set(f"Une erreur inattendue s'est produite: {str(e)}")
+            self.modele.afficher_erreur("ERREUR DE CALCUL", f"Une erreur inattendue s'est produite: {str(e)}")
             if constants.DEBUG_MODE_ACTIVE:
                 import traceback
                 print("\nDEBUG - Erreur inattendue:")
                 traceback.print_exc()
         finally:
             self._is_updating_ui = False
-
-    def _update_interface_from_results(self, results):
-        """Nouvelle méthode pour centraliser la mise à jour des champs depuis les résultats"""
-        if not results:
+            if mesurer:
+                CHRONO.enregistrer("interface.total", perf_counter() - debut)
+                self._update_instrumentation_overlay()
+            if constants.DEBUG_MODE_ACTIVE:
+                print(f"DEBUG - Affichage : {self.modele.stats['ecrites']} écritures, {self.modele.stats['evitees']} évitées (total {self.modele.total})")
+
+    # Phases affichées en surimpression sur l'aperçu quand la mesure des temps est active
+    PHASES_SURIMPRESSION = (
+        "calcul.parsing", "calcul.total", "modele.messages",
+        "interface.resultats", "interface.apercu", "interface.rapports", "interface.total",
+    )
+
+    def toggle_instrumentation(self):
+        CHRONO.activer(self.instrumentation_var.get())
+        if not CHRONO.actif:
+            self.canvas.delete("surimpression_temps")
+        self._update_instrumentation_overlay()
+
+    def _update_instrumentation_overlay(self):
+        if not CHRONO.actif:
             return
+        texte = CHRONO.texte(self.PHASES_SURIMPRESSION) or "Mesure des temps : en attente d'un recalcul"
+        if not self.canvas.find_withtag("surimpression_temps"):
+            self.canvas.create_text(
+                8, 8, anchor="nw", font=("Courier New", 8), fill=self.themes[self.current_theme]["fg"],
+                tags="surimpression_temps",
+            )
+        self.canvas.itemconfigure("surimpression_temps", text=texte)
+        self.canvas.tag_raise("surimpression_temps")
 
-        # Mise à jour des valeurs calculées
-        if self.unites_var.get() == 'pouces':
-            if results.get("hauteur_reelle_contremarche") is not None:
-                self.hauteur_cm_souhaitee_var.set(
-                    formatting.decimal_to_fraction_str(
-                        results["hauteur_reelle_contremarche"], 
-                        self.app_preferences
-                    )
-                )
-            if results.get("giron_utilise") is not None:
-                self.giron_souhaite_var.set(
-                    formatting.decimal_to_fraction_str(
-                        results["giron_utilise"], 
-                        self.app_preferences
-                    )
-                )
-        else:
-            if results.get("hauteur_reelle_contremarche") is not None:
-                self.hauteur_cm_souhaitee_var.set(
-                    f"{results['hauteur_reelle_contremarche'] * constants.POUCE_EN_CM:.2f}"
-                )
-            if results.get("giron_utilise") is not None:
-                self.giron_souhaite_var.set(
-                    f"{results['giron_utilise'] * constants.POUCE_EN_CM:.2f}"
-                )
-
-        # Mise à jour des nombres de marches/contremarches
-        if results.get("nombre_contremarches") is not None:
-            self.nombre_cm_manuel_var.set(str(results["nombre_contremarches"]))
-        if results.get("nombre_girons") is not None:
-            self.nombre_marches_manuel_var.set(str(results["nombre_girons"]))
-
-    def update_results_display(self):
-        res, prefs = self.latest_results, self.app_preferences
-        df = lambda v: formatting.decimal_to_fraction_str(v, prefs) if v is not None else ""
-        if self.unites_var.get() == 'cm':
-            df_mm = lambda v: f"{v * constants.POUCE_EN_CM:.2f} cm" if v is not None else ""
-        else:
-            df_mm = lambda v: f"{df(v)} ({round(v * constants.POUCE_EN_MM)} mm)" if v else ""
-        if not res: self.clear_results_display(); return
-        self.hauteur_reelle_cm_res_var.set(df_mm(res.get("hauteur_reelle_contremarche")))
-        self.giron_utilise_res_var.set(df_mm(res.get('giron_utilise')))
-        self.longueur_totale_res_var.set(df_mm(res.get("longueur_calculee_escalier")))
-        self.angle_res_var.set(f"{res.get('angle_escalier', 0):.2f}°")
-        self.limon_res_var.set(df_mm(res.get("longueur_limon_approximative")))
-        self.echappee_res_var.set(df_mm(res.get("min_echappee_calculee")))
-        nb_girons = res.get("nombre_girons", 0)
-        self.longueur_min_escalier_var.set(f"Req: {df_mm(nb_girons * constants.GIRON_MIN_REGLEMENTAIRE)}" if nb_girons else "")
-        self.hauteur_cm_message_var.set(res.get("hauteur_cm_message", ""))
-        self.giron_message_var.set(res.get("giron_message", ""))
-        self.echappee_message_var.set(res.get("echappee_message", ""))
-        self.blondel_message_var.set(f"{res.get('blondel_message', '')} ({df(res.get('blondel_value'))}\")")
-        self.longueur_disponible_message_var.set(res.get("longueur_disponible_message", ""))
-        self.angle_message_var.set(res.get("angle_message", ""))
-        self.hauteur_totale_ecart_message_var.set(res.get("hauteur_totale_ecart_message", ""))
-
-    def update_warnings_display(self, warnings, is_conform):
-        self.warnings_var.set("\n".join(warnings) if warnings else "Aucun avertissement.")
-        if not is_conform:
-            self.conformity_status_var.set("✗ NON CONFORME")
-            self.conformity_label.config(foreground=self.themes[self.current_theme]["error"])
-        elif warnings:
-            self.conformity_status_var.set("CONFORME AVEC AVERTISSEMENTS")
-            self.conformity_label.config(foreground=self.themes[self.current_theme]["warning"])
-        else:
-            self.conformity_status_var.set("✓ CONFORME")
-            self.conformity_label.config(foreground=self.themes[self.current_theme]["success"])
+    def export_instrumentation(self):
+        chemin = filedialog.asksaveasfilename(
+            parent=self, title="Exporter les temps de recalcul", defaultextension=".json",
+            filetypes=[("JSON", "*.json")],
+        )
+        if chemin:
+            CHRONO.exporter_json(chemin)
 
-    def clear_messages(self):
-        for var in [self.warnings_var, self.hauteur_cm_message_var, self.giron_message_var, self.echappee_message_var, self.blondel_message_var, self.longueur_disponible_message_var, self.angle_message_var, self.hauteur_totale_ecart_message_var]: var.set("")
-        self.conformity_status_var.set("EN ATTENTE")
-        self.conformity_label.config(foreground=self.themes[self.current_theme]["fg"])
+    def _on_canvas_configure(self, event):
+        """Redimensionnement : au plus un redessin par DELAI_APERCU_MS, et seulement si la taille change."""
+        if (event.width, event.height) == self._taille_apercu or self._apercu_planifie is not None:
+            return
+        self._apercu_planifie = self.after(DELAI_APERCU_MS, self._run_scheduled_preview)
 
-    def clear_results_display(self):
-        for var in [self.hauteur_reelle_cm_res_var, self.giron_utilise_res_var, self.longueur_totale_res_var, self.angle_res_var, self.limon_res_var, self.echappee_res_var, self.longueur_min_escalier_var]: var.set("")
-        self.clear_messages()
+    def _run_scheduled_preview(self):
+        self._apercu_planifie = None
+        self.update_visual_preview()
 
     def update_visual_preview(self, event=None):
-        self.canvas.delete("all")
-        canvas_width, canvas_height = self.canvas.winfo_width(), self.canvas.winfo_height()
-        nombre_girons = self.latest_results.get("nombre_girons")
-        if nombre_girons is not None and nombre_girons > 0:
-            res = self.latest_results
-            giron, h_cm = res.get("giron_utilise", 0), res.get("hauteur_reelle_contremarche", 0)
-            if giron <= 0 or h_cm <= 0: return
-            total_w, total_h = res["nombre_girons"] * giron, res["nombre_contremarches"] * h_cm
-            scale = min(canvas_width / total_w, canvas_height / total_h) * 0.8 if total_w > 0 and total_h > 0 else 1
-            x, y = 50, canvas_height - 50
-            for _ in range(res["nombre_girons"]):
-                self.canvas.create_line(x, y, x + giron * scale, y, fill=self.themes[self.current_theme]["canvas_line"], width=2)
-                x += giron * scale
-                self.canvas.create_line(x, y, x, y - h_cm * scale, fill=self.themes[self.current_theme]["canvas_line"], width=2)
-                y -= h_cm * scale
-            self.canvas.create_text(canvas_width/2, 30, text=f"Escalier: {res['nombre_girons']} marches", fill=self.themes[self.current_theme]["canvas_line"], font=("Arial", 12, "bold"))
+        self._taille_apercu = (self.canvas.winfo_width(), self.canvas.winfo_height())
+        self.apercu.dessiner(self.latest_results, *self._taille_apercu)
+
+    # Nombre de rapports gardés en cache (un par empreinte de résultat)
+    TAILLE_CACHE_RAPPORTS = 16
 
     def update_reports(self):
-        if self.latest_results and self.latest_results.get("nombre_girons") is not None:
-            plan = reporting.generer_texte_trace(self.latest_results, self.app_preferences)
-            self.report_text.delete("1.0", tk.END); self.report_text.insert(tk.END, plan)
-            params = reporting.generer_tableau_parametres(self.latest_results, self.app_preferences)
-            marches = reporting.generer_tableau_marches(self.latest_results, self.app_preferences)
-            self.table_text.delete("1.0", tk.END); self.table_text.insert(tk.END, f"{params}\n\n{marches}")
+        """
+        Marque les rapports comme périmés après un recalcul. Seul l'onglet de
+        rapport affiché est régénéré tout de suite ; les autres le seront à leur
+        sélection (ou à l'export, via get_report_text).
+        """
+        for nom in self._rapports_a_jour:
+            self._rapports_a_jour[nom] = False
+        nom = self._selected_report()
+        if nom:
+            self._render_report(nom)
+
+    def _selected_report(self):
+        selection = self.notebook.select()
+        if selection == str(self.report_frame):
+            return "plan"
+        if selection == str(self.table_frame):
+            return "tableau"
+        return None
+
+    def _on_notebook_tab_changed(self, event=None):
+        nom = self._selected_report()
+        if nom and not self._rapports_a_jour[nom]:
+            self._render_report(nom)
+
+    def get_report_text(self, nom):
+        """Texte du rapport "plan" ou "tableau" pour le résultat courant (généré au besoin)."""
+        res = self.latest_results
+        if not (res and res.nombre_girons is not None):
+            return "Aucun résultat de calcul disponible."
+        empreinte = (nom, res, json.dumps(self.app_preferences, sort_keys=True, default=str))
+        texte = self._cache_rapports.get(empreinte)
+        if texte is not None:
+            self._cache_rapports.move_to_end(empreinte)
+            return texte
+        if nom == "plan":
+            texte = reporting.generer_texte_trace(res, self.app_preferences)
         else:
-            msg = "Aucun résultat de calcul disponible."
-            self.report_text.delete("1.0", tk.END); self.report_text.insert(tk.END, msg)
-            self.table_text.delete("1.0", tk.END); self.table_text.insert(tk.END, msg)
+            params = reporting.generer_tableau_parametres(res, self.app_preferences)
+            marches = reporting.generer_tableau_marches(res, self.app_preferences)
+            texte = f"{params}\n\n{marches}"
+        self._cache_rapports[empreinte] = texte
+        if len(self._cache_rapports) > self.TAILLE_CACHE_RAPPORTS:
+            self._cache_rapports.popitem(last=False)
+        return texte
+
+    def _render_report(self, nom):
+        widget = self.report_text if nom == "plan" else self.table_text
+        texte = self.get_report_text(nom)
+        # Le widget n'est réécrit que si son contenu change
+        if widget.get("1.0", "end-1c") != texte:
+            widget.delete("1.0", tk.END)
+            widget.insert(tk.END, texte)
+        self._rapports_a_jour[nom] = True
 
     def open_preferences_dialog(self):
+        # L'enregistrement passe par le magasin, qui appelle _on_preferences_changed
         PreferencesDialog(self, self.app_preferences)
-        if file_operations and hasattr(file_operations, 'load_application_preferences'):
-            self.app_preferences = file_operations.load_application_preferences()
+
+    def _on_preferences_changed(self, preferences, modifiees):
+        """Préférences enregistrées (ici ou par un autre programme) : seules les clés modifiées sont reprises."""
+        for cle in modifiees:
+            if cle in preferences:
+                self.app_preferences[cle] = preferences[cle]
+            else:
+                self.app_preferences.pop(cle, None)
         self.recalculate_and_update_ui()
 
+    def save_project(self):
+        if projets is None or operations_projet is None:
+            messagebox.showerror("Erreur", "Le module de projets est introuvable.", parent=self)
+            return
+        operations_projet.sauvegarder_projet(projets.projet_depuis_modele(self.modele), self)
+
+    def load_project(self):
+        if operations_projet is None:
+            messagebox.showerror("Erreur", "Le module de projets est introuvable.", parent=self)
+            return
+        operations_projet.charger_projet(self)
+
+    def open_archive_dialog(self):
+        try:
+            from core.archive_dialog import ArchiveDialog
+        except ImportError:
+            messagebox.showerror("Erreur", "Le module ArchiveDialog est introuvable.", parent=self)
+            return
+        dlg = ArchiveDialog(self)
+        self.wait_window(dlg)
+        if dlg.result:
+            self.ouvrir_projet(dlg.result)
+
+    def ouvrir_projet(self, projet):
+        """
+        Affiche un projet enregistré tel quel : champs, résultat, aperçu et
+        rapports, sans recalcul (il aura lieu à la prochaine modification).
+        """
+        if self._recalcul_planifie is not None:
+            self.after_cancel(self._recalcul_planifie)
+            self._recalcul_planifie = None
+        self._variables_modifiees = []
+        projets.appliquer_au_modele(projet, self.modele)
+        self.unites_var.set(self.modele.unite)
+        titre = f"Calculateur d'Escalier Pro v{constants.VERSION_PROGRAMME}"
+        self.title(f"{titre} - {projet['nom']}" if projet.get("nom") else titre)
+        self.update_visual_preview()
+        self.update_reports()
+
     def open_laser_dialog(self):
         # Import or define LaserDialog before using it
         try:
@@ -791,9 +799,59 @@ class ModernStairCalculator(tk.Tk):
         self.wait_window(dlg)  # Attend la fermeture
         if dlg.result:
             self.hauteur_totale_var.set(dlg.result)
-    def export_pdf_report(self): messagebox.showinfo("Export PDF", "La fonction d'exportation PDF est en développement.", parent=self)
+    def export_vector_drawing(self):
+        from core.export_vectoriel import exporter
+        if elevation(self.latest_results) is None:
+            messagebox.showinfo("Exporter l'élévation", "Aucun résultat de calcul à dessiner.", parent=self)
+            return
+        chemin = filedialog.asksaveasfilename(
+            parent=self, title="Exporter l'élévation", defaultextension=".svg",
+            filetypes=[("SVG", "*.svg"), ("DXF", "*.dxf")],
+        )
+        if not chemin:
+            return
+        try:
+            exporter(self.latest_results, chemin)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Exporter l'élévation", f"Impossible d'exporter l'élévation :\n{e}", parent=self)
+
+    def export_reports(self):
+        res = self.latest_results
+        if not (res and res.nombre_girons is not None):
+            messagebox.showinfo("Exporter les rapports", "Aucun résultat de calcul à exporter.", parent=self)
+            return
+        chemin = filedialog.asksaveasfilename(
+            parent=self, title="Exporter les rapports (un fichier par format)", defaultextension=".html",
+            filetypes=[("HTML", "*.html"), ("Markdown", "*.md"), ("Texte", "*.txt"), ("CSV", "*.csv")],
+        )
+        if not chemin:
+            return
+        # Un seul calcul du rapport, écrit dans chaque format à côté du fichier choisi
+        try:
+            reporting.exporter_rapports(res, self.app_preferences, os.path.splitext(chemin)[0])
+        except OSError as e:
+            messagebox.showerror("Exporter les rapports", f"Impossible d'écrire les rapports :\n{e}", parent=self)
+
+    def export_pdf_report(self):
+        from core.export_pdf import exporter_pdf
+        res = self.latest_results
+        if not (res and res.nombre_girons is not None):
+            messagebox.showinfo("Export PDF", "Aucun résultat de calcul à exporter.", parent=self)
+            return
+        chemin = filedialog.asksaveasfilename(
+            parent=self, title="Exporter le rapport PDF", defaultextension=".pdf", filetypes=[("PDF", "*.pdf")],
+        )
+        if not chemin:
+            return
+        # Mêmes textes que les onglets (déjà en cache s'ils ont été affichés)
+        textes = (self.get_report_text("plan"), self.get_report_text("tableau"))
+        try:
+            exporter_pdf(res, self.app_preferences, chemin, textes)
+        except OSError as e:
+            messagebox.showerror("Export PDF", f"Impossible d'écrire le rapport PDF :\n{e}", parent=self)
 
 if __name__ == "__main__":
+    preparer_environnement()
     app = ModernStairCalculator()
     app.mainloop()
     # Si aucun résultat n'est affiché et que la conformité est "EN ATTENTE", cela signifie que les champs obligatoires ne sont pas tous remplis ou qu'une erreur de saisie empêche le calcul.
@@ -9,128 +9,16 @@ import json # Utilisé pour la sortie structurée des données
 # Constante de conversion
 POUCE_EN_MM = 25.4
 
-# --- Fonctions de Calcul (adaptées pour des entrées en mm) ---
-def calculer_H90_mm(rayon_lame_mm, epaisseur_bois_mm, profondeur_depassement_P_mm):
-    if profondeur_depassement_P_mm < epaisseur_bois_mm:
-        return {
-            "H_val": None,
-            "message": f"ERREUR_H90: P ({profondeur_depassement_P_mm:.2f}mm) < h ({epaisseur_bois_mm:.2f}mm)."
-        }
-    try:
-        d_dessous = rayon_lame_mm - profondeur_depassement_P_mm
-        d_dessus = rayon_lame_mm - profondeur_depassement_P_mm + epaisseur_bois_mm
-
-        if rayon_lame_mm**2 < d_dessous**2:
-            return {
-                "H_val": None,
-                "message": f"ERREUR_H90: r² < d_dessous² (r={rayon_lame_mm:.2f}, d_inf={d_dessous:.2f}). Vérifiez P."
-            }
-        # Gestion des cas où le terme sous la racine est très proche de zéro ou négatif
-        terme_sqrt_dessous = rayon_lame_mm**2 - d_dessous**2
-        proj_dessous = math.sqrt(max(0, terme_sqrt_dessous))
-
-
-        terme_sqrt_dessus = rayon_lame_mm**2 - d_dessus**2
-        if terme_sqrt_dessus < -1e-9 and not abs(terme_sqrt_dessus) < 1e-9 : # si négatif et pas quasi nul
-             return { "H_val": None, "message": f"ERREUR_H90: r² < d_dessus² (r={rayon_lame_mm:.2f}, d_sup={d_dessus:.2f})." }
-        proj_dessus = math.sqrt(max(0, terme_sqrt_dessus))
-        
-        H90_val = proj_dessous - proj_dessus
-        return {"H_val": H90_val, "message": "Calcul H90 réussi."}
-    except Exception as e:
-        return {"H_val": None, "message": f"ERREUR_H90_INATTENDUE: {e}"}
-
-def calculer_H45_mm(rayon_lame_mm, epaisseur_bois_mm, profondeur_depassement_P_mm):
-    cos_45 = math.cos(math.radians(45))
-    limite_sup_P_mm = (2 * rayon_lame_mm * cos_45) - epaisseur_bois_mm
-
-    if not (-1e-9 <= profondeur_depassement_P_mm <= limite_sup_P_mm + 1e-9): # Tolérance pour comparaison flottants
-        return {
-            "H_val": None,
-            "message": f"ERREUR_H45: P ({profondeur_depassement_P_mm:.2f}mm) hors intervalle [0, {limite_sup_P_mm:.2f}mm]."
-        }
-    try:
-        zc = (rayon_lame_mm * cos_45) - profondeur_depassement_P_mm
-        d_prime_dessous = abs(zc) / cos_45
-        d_prime_dessus = abs(epaisseur_bois_mm - zc) / cos_45
-        
-        terme_sqrt_dessous = rayon_lame_mm**2 - d_prime_dessous**2
-        if terme_sqrt_dessous < -1e-9:
-            return {
-                "H_val": None,
-                "message": f"ERREUR_H45: r² < d'_dessous² (r={rayon_lame_mm:.2f}, d'_inf={d_prime_dessous:.2f})."
-            }
-        proj_dessous_45 = math.sqrt(max(0, terme_sqrt_dessous))
-
-        terme_sqrt_dessus = rayon_lame_mm**2 - d_prime_dessus**2
-        if terme_sqrt_dessus < -1e-9:
-            return {
-                "H_val": None,
-                "message": f"ERREUR_H45: r² < d'_dessus² (r={rayon_lame_mm:.2f}, d'_sup={d_prime_dessus:.2f})."
-            }
-        proj_dessus_45 = math.sqrt(max(0, terme_sqrt_dessus))
-        
-        H45_val = proj_dessous_45 - proj_dessus_45
-        return {"H_val": H45_val, "message": "Calcul H45 réussi."}
-    except Exception as e:
-        return {"H_val": None, "message": f"ERREUR_H45_INATTENDUE: {e}"}
-
-# --- Utilitaire de parsing (identique à celui de votre projet) ---
-# Pour que ce programme soit vraiment indépendant et puisse utiliser parser_fraction,
-# il faudrait soit que ce fichier soit dans la structure de Calcul_escalierPy
-# pour que l'import fonctionne, soit copier/adapter parser_fraction ici.
-# Option 1: Si ProfondeurCoupe.py est dans le dossier racine de Calcul_escalierPy:
+# --- Fonctions de calcul (entrées en mm) et utilitaire de parsing (ceux du projet) ---
+# ProfondeurCoupe.py se trouve à la racine de Calcul_escalierPy : le parseur de
+# mesures est celui de core.formatting (via utils.formatting), comme pour le
+# calculateur d'escalier.
 try:
-    from utils.formatting import parser_fraction, ALLOWED_DENOMINATORS # Tente d'importer depuis le projet parent
+    from core.coupe import calculer_H90_mm, calculer_H45_mm
+    from utils.formatting import parser_fraction, ALLOWED_DENOMINATORS
     from core.validation import validate_generic_fraction_format
-except ImportError:
-    # Fallback si l'import échoue (ProfondeurCoupe.py est VRAIMENT isolé)
-    ALLOWED_DENOMINATORS = {2, 4, 8, 16, 32, 64}
-    def parser_fraction(input_str): # Version simplifiée si isolé
-        if not isinstance(input_str, str):
-            try: return float(input_str)
-            except (ValueError, TypeError): raise ValueError("L'entrée doit être une chaîne ou un nombre.")
-        original_input = input_str
-        input_str = input_str.replace(',', '.').replace('-', ' ').strip()
-        if not input_str: raise ValueError("L'entrée ne peut être vide.")
-        parts = input_str.split()
-        total_value = 0.0
-        try:
-            if len(parts) == 1:
-                part1 = parts[0]
-                if '/' in part1:
-                    num_str, den_str = part1.split('/'); num, den = float(num_str), int(den_str)
-                    if den == 0: raise ZeroDivisionError("Dénominateur zéro."); 
-                    if den not in ALLOWED_DENOMINATORS: raise ValueError(f"Dénominateur {den} non permis.")
-                    total_value = num / den
-                else: total_value = float(part1)
-            elif len(parts) == 2:
-                integer_part_str, fraction_part_str = parts[0], parts[1]
-                total_value = float(integer_part_str)
-                if '/' in fraction_part_str:
-                    num_str, den_str = fraction_part_str.split('/'); num, den = float(num_str), int(den_str)
-                    if den == 0: raise ZeroDivisionError("Dénominateur zéro.")
-                    if den not in ALLOWED_DENOMINATORS: raise ValueError(f"Dénominateur {den} non permis.")
-                    total_value += (num / den) if total_value >= 0 else -(num / den)
-                else: raise ValueError("Format fraction invalide.")
-            else: raise ValueError("Format invalide (trop de parties).")
-            return total_value
-        except ValueError as e: raise ValueError(f"Format invalide pour '{original_input}': {e}")
-        except ZeroDivisionError as e: raise ValueError(f"Format invalide pour '{original_input}': {e}")
-        except Exception as e: raise ValueError(f"Erreur parsing '{original_input}': {e}")
-
-    def validate_generic_fraction_format(value_str, field_name="Ce champ", can_be_empty=False, parent_window=None):
-        # Fallback validation si isolé
-        if not value_str.strip():
-            if can_be_empty: return True
-            if parent_window: messagebox.showerror("Erreur Format", f"{field_name} ne peut être vide.", parent=parent_window)
-            return False
-        try:
-            parser_fraction(value_str)
-            return True
-        except ValueError as e:
-            if parent_window: messagebox.showerror(f"Erreur Format ({field_name})", str(e), parent=parent_window)
-            return False
+except ImportError as exc:
+    raise ImportError("Impossible d'importer core.coupe / utils.formatting / core.validation : lancer ProfondeurCoupe.py depuis le dossier Calcul_escalierPy") from exc
 
 class ProfondeurCoupeApp:
     def __init__(self, master):
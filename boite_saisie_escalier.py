@@ -1,16 +1,20 @@
 import tkinter as tk
 from tkinter import ttk
-import math
+
+from core.view_model import StairViewModel
+from gui.liaison_tk import LiaisonTk
 
 class ChampAvecFleches(ttk.Frame):
     """Widget personnalisé avec Entry et boutons +/- pour contrôler des valeurs numériques."""
     
-    def __init__(self, parent, var, step=1, largeur=8, unite="", minval=None, maxval=None, **kwargs):
+    def __init__(self, parent, var, step=1, largeur=8, unite="", minval=None, maxval=None, commande=None, **kwargs):
+        """`commande(sens)`, si fournie, remplace l'ajustement local par ±step."""
         super().__init__(parent, **kwargs)
         self.var = var
         self.step = step
         self.minval = minval
         self.maxval = maxval
+        self.commande = commande
         
         # Bouton de décrémentation avec largeur réduite et sans padding
         ttk.Button(self, text="−", width=2, command=self.decrementer).pack(side="left")
@@ -24,6 +28,9 @@ class ChampAvecFleches(ttk.Frame):
 
     def incrementer(self):
         """Incrémente la valeur selon le pas défini."""
+        if self.commande:
+            self.commande(1)
+            return
         try:
             val = float(self.var.get().replace(',', '.'))
         except ValueError:
@@ -35,6 +42,9 @@ class ChampAvecFleches(ttk.Frame):
 
     def decrementer(self):
         """Décrémente la valeur selon le pas défini."""
+        if self.commande:
+            self.commande(-1)
+            return
         try:
             val = float(self.var.get().replace(',', '.'))
         except ValueError:
@@ -50,14 +60,17 @@ class SaisieEscalierComplete(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent, padding=20)
         
-        # Variables de saisie (utilisant les mêmes noms que votre projet)
-        self.hauteur_totale_var = tk.StringVar(value="108")
-        self.longueur_escalier_var = tk.StringVar(value="")
-        self.nombre_marche_var = tk.StringVar(value="15")
-        self.giron_var = tk.StringVar(value="9.25")
-        self.nombre_contremarche_var = tk.StringVar(value="16")
-        self.hauteur_contremarche_var = tk.StringVar(value="7.5")
-        self.longueur_ouverture_var = tk.StringVar(value="60")
+        # Validation, cascade et calcul : même modèle de vue que la fenêtre principale
+        self.modele = StairViewModel()
+
+        # Variables de saisie (valeurs initiales fournies par le modèle de vue)
+        self.hauteur_totale_var = tk.StringVar()
+        self.longueur_escalier_var = tk.StringVar()
+        self.nombre_marche_var = tk.StringVar()
+        self.giron_var = tk.StringVar()
+        self.nombre_contremarche_var = tk.StringVar()
+        self.hauteur_contremarche_var = tk.StringVar()
+        self.longueur_ouverture_var = tk.StringVar()
         self.hauteur_plafond_var = tk.StringVar(value="96")
         
         # Variables de résultats
@@ -71,19 +84,31 @@ class SaisieEscalierComplete(ttk.Frame):
         # Construction de l'interface
         self._construire_interface()
         
-        # Calcul initial
+        # Calcul initial (le nombre de contremarches est déduit de la hauteur totale)
+        self.modele.saisir("hauteur_totale", "108")
+        self.modele.saisir("profondeur_tremie_ouverture", "60")
         self.recalculer()
 
     def _bind_variables(self):
-        """Lie les variables aux événements de recalcul."""
-        variables = [
-            self.hauteur_totale_var, self.longueur_escalier_var, self.nombre_marche_var,
-            self.giron_var, self.nombre_contremarche_var, self.hauteur_contremarche_var,
-            self.longueur_ouverture_var, self.hauteur_plafond_var
-        ]
-        
-        for var in variables:
-            var.trace_add("write", lambda *args: self.recalculer())
+        """Lie les variables aux champs du modèle de vue."""
+        self.liaison = LiaisonTk(self.modele, {
+            "hauteur_totale": self.hauteur_totale_var,
+            "espace_disponible": self.longueur_escalier_var,
+            "nombre_marches_manuel": self.nombre_marche_var,
+            "giron_souhaite": self.giron_var,
+            "nombre_cm_manuel": self.nombre_contremarche_var,
+            "hauteur_cm_souhaitee": self.hauteur_contremarche_var,
+            "profondeur_tremie_ouverture": self.longueur_ouverture_var,
+            "longueur_totale_res": self.longueur_min_var,
+            "hauteur_reelle_cm_res": self.hauteur_cm_res_var,
+        }, au_changement=self.recalculer)
+
+    def _ajuster(self, nom):
+        """Commande +/- d'un champ ajusté par le modèle de vue."""
+        def commande(sens):
+            self.modele.incrementer(nom, sens)
+            self.recalculer(nom)
+        return commande
 
     def _construire_interface(self):
         """Construit l'interface utilisateur selon les spécifications exactes."""
@@ -114,17 +139,17 @@ class SaisieEscalierComplete(ttk.Frame):
         
         # Première ligne : Nombre de marches et Nombre contremarches
         ttk.Label(frame_b, text="Nombre de Marches", anchor="w").grid(row=0, column=0, sticky="w", padx=3, pady=3)
-        ChampAvecFleches(frame_b, self.nombre_marche_var, step=1, largeur=8, minval=1).grid(row=0, column=1, sticky="w", padx=3, pady=3)
+        ChampAvecFleches(frame_b, self.nombre_marche_var, step=1, largeur=8, minval=1, commande=self._ajuster("nombre_marches_manuel")).grid(row=0, column=1, sticky="w", padx=3, pady=3)
         
         ttk.Label(frame_b, text="Nombre Contremarche", anchor="w").grid(row=0, column=2, sticky="w", padx=3, pady=3)
-        ChampAvecFleches(frame_b, self.nombre_contremarche_var, step=1, largeur=8, minval=1).grid(row=0, column=3, sticky="w", padx=3, pady=3)
+        ChampAvecFleches(frame_b, self.nombre_contremarche_var, step=1, largeur=8, minval=1, commande=self._ajuster("nombre_cm_manuel")).grid(row=0, column=3, sticky="w", padx=3, pady=3)
         
         # Deuxième ligne : Giron et Hauteur contremarche
         ttk.Label(frame_b, text="Giron", anchor="w").grid(row=1, column=0, sticky="w", padx=3, pady=3)
-        ChampAvecFleches(frame_b, self.giron_var, step=0.125, largeur=8).grid(row=1, column=1, sticky="w", padx=3, pady=3)
+        ChampAvecFleches(frame_b, self.giron_var, step=0.125, largeur=8, commande=self._ajuster("giron_souhaite")).grid(row=1, column=1, sticky="w", padx=3, pady=3)
         
         ttk.Label(frame_b, text="Hauteur Contremarche", anchor="w").grid(row=1, column=2, sticky="w", padx=3, pady=3)
-        ChampAvecFleches(frame_b, self.hauteur_contremarche_var, step=0.125, largeur=8).grid(row=1, column=3, sticky="w", padx=3, pady=3)
+        ChampAvecFleches(frame_b, self.hauteur_contremarche_var, step=0.125, largeur=8, commande=self._ajuster("hauteur_cm_souhaitee")).grid(row=1, column=3, sticky="w", padx=3, pady=3)
         
         # SECTION C - Trémis
         frame_c = ttk.LabelFrame(self, text="C - Trémis", padding=10)
@@ -161,33 +186,14 @@ class SaisieEscalierComplete(ttk.Frame):
         ttk.Button(frame_boutons, text="Laser", command=self.action_laser).pack(side="left", padx=10)
         ttk.Button(frame_boutons, text="Appliquer Valeurs Idéales", command=self.appliquer_valeurs_ideales).pack(side="left", padx=10)
 
-    def recalculer(self):
+    def recalculer(self, changed_var_name=None):
         """Recalcule les valeurs basées sur les entrées."""
-        try:
-            # Récupération des valeurs
-            hauteur_totale = float(self.hauteur_totale_var.get() or "0")
-            nombre_marches = int(float(self.nombre_marche_var.get() or "0"))
-            giron = float(self.giron_var.get() or "0")
-            
-            if hauteur_totale > 0 and nombre_marches > 0:
-                # Calculs basiques (adaptez selon votre logique métier)
-                nombre_contremarches = nombre_marches + 1
-                hauteur_cm = hauteur_totale / nombre_contremarches
-                longueur_min = nombre_marches * giron
-                
-                # Mise à jour des résultats
-                self.nombre_contremarche_res_var.set(str(nombre_contremarches))
-                self.hauteur_cm_res_var.set(f"{hauteur_cm:.3f}")
-                self.longueur_min_var.set(f"{longueur_min:.1f}")
-            else:
-                # Réinitialisation si valeurs invalides
-                self.nombre_contremarche_res_var.set("")
-                self.hauteur_cm_res_var.set("")
-                self.longueur_min_var.set("")
-                
-        except (ValueError, ZeroDivisionError):
-            # Gestion des erreurs de calcul
-            pass
+        resultat = self.modele.recalculer(changed_var_name)
+        if resultat is not None and resultat.is_valid:
+            self.nombre_contremarche_res_var.set(str(resultat.nombre_contremarches))
+        else:
+            # Réinitialisation si valeurs invalides (les champs liés sont vidés par le modèle)
+            self.nombre_contremarche_res_var.set("")
 
     def action_laser(self):
         """Action du bouton Laser."""
@@ -195,9 +201,8 @@ class SaisieEscalierComplete(ttk.Frame):
         
     def appliquer_valeurs_ideales(self):
         """Applique des valeurs idéales prédéfinies."""
-        self.giron_var.set("9.25")
-        self.hauteur_contremarche_var.set("7.5")
-        self.nombre_marche_var.set("15")
+        self.modele.appliquer_valeurs_ideales()
+        self.recalculer()
         print("Valeurs idéales appliquées")
 
     def get_donnees(self):
@@ -0,0 +1,128 @@
+# core/archive_dialog.py
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from core.formatting import parser_fraction
+from core.projets import ArchiveProjets
+
+
+class ArchiveDialog(tk.Toplevel):
+    """Recherche dans l'archive des projets ; `result` reçoit le projet choisi (ou None)."""
+
+    COLONNES = (
+        ("nom", "Nom", 180),
+        ("date", "Date", 120),
+        ("hauteur_totale", "Hauteur", 70),
+        ("nombre_cm", "CM", 40),
+        ("giron", "Giron", 60),
+        ("conforme", "Conforme", 70),
+    )
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Archive des projets")
+        self.geometry("640x420")
+        self.transient(parent)
+        self.grab_set()
+
+        self.result = None
+        self.archive = ArchiveProjets()
+
+        # --- Critères de recherche ---
+        criteres = ttk.Frame(self, padding=(10, 10, 10, 0))
+        criteres.pack(fill="x")
+        self.nom_var = tk.StringVar()
+        self.hauteur_min_var = tk.StringVar()
+        self.hauteur_max_var = tk.StringVar()
+        self.nombre_cm_var = tk.StringVar()
+        self.conforme_var = tk.StringVar(value="Tous")
+        for colonne, (libelle, var, largeur) in enumerate((
+            ("Nom", self.nom_var, 16),
+            ("Hauteur min (po)", self.hauteur_min_var, 8),
+            ("Hauteur max (po)", self.hauteur_max_var, 8),
+            ("CM", self.nombre_cm_var, 4),
+        )):
+            ttk.Label(criteres, text=libelle).grid(row=0, column=colonne, sticky="w", padx=2)
+            entry = ttk.Entry(criteres, textvariable=var, width=largeur)
+            entry.grid(row=1, column=colonne, sticky="w", padx=2)
+            entry.bind("<Return>", lambda e: self.chercher())
+        ttk.Label(criteres, text="Conformité").grid(row=0, column=4, sticky="w", padx=2)
+        ttk.Combobox(
+            criteres, textvariable=self.conforme_var, values=("Tous", "Conformes", "Non conformes"),
+            state="readonly", width=12,
+        ).grid(row=1, column=4, padx=2)
+        ttk.Button(criteres, text="Chercher", command=self.chercher).grid(row=1, column=5, padx=(8, 0))
+
+        # --- Liste des projets ---
+        self.liste = ttk.Treeview(self, columns=[nom for nom, _, _ in self.COLONNES], show="headings")
+        for nom, libelle, largeur in self.COLONNES:
+            self.liste.heading(nom, text=libelle)
+            self.liste.column(nom, width=largeur, anchor="w" if nom == "nom" else "center")
+        self.liste.pack(expand=True, fill="both", padx=10, pady=10)
+        self.liste.bind("<Double-1>", lambda e: self.ouvrir())
+
+        # --- Boutons ---
+        button_frame = ttk.Frame(self)
+        button_frame.pack(pady=(0, 10))
+        ttk.Button(button_frame, text="Ouvrir", command=self.ouvrir).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Supprimer", command=self.supprimer).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Fermer", command=self.cancel).pack(side="left", padx=5)
+
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.chercher()
+
+    def _nombre(self, var, conversion=parser_fraction):
+        brut = var.get().strip()
+        return conversion(brut) if brut else None
+
+    def chercher(self):
+        try:
+            criteres = {
+                "nom": self.nom_var.get().strip() or None,
+                "hauteur_min": self._nombre(self.hauteur_min_var),
+                "hauteur_max": self._nombre(self.hauteur_max_var),
+                "nombre_cm": self._nombre(self.nombre_cm_var, int),
+                "conforme": {"Conformes": True, "Non conformes": False}.get(self.conforme_var.get()),
+            }
+        except ValueError as e:
+            messagebox.showerror("Archive", f"Critère invalide : {e}", parent=self)
+            return
+        self.liste.delete(*self.liste.get_children())
+        for ligne in self.archive.chercher(**criteres):
+            self.liste.insert("", "end", iid=str(ligne["id"]), values=(
+                ligne["nom"],
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(ligne["date"])),
+                f"{ligne['hauteur_totale']:.3f}" if ligne["hauteur_totale"] is not None else "",
+                ligne["nombre_cm"] if ligne["nombre_cm"] is not None else "",
+                f"{ligne['giron']:.3f}" if ligne["giron"] is not None else "",
+                {1: "Oui", 0: "Non"}.get(ligne["conforme"], ""),
+            ))
+
+    def _selection(self):
+        selection = self.liste.selection()
+        return int(selection[0]) if selection else None
+
+    def ouvrir(self):
+        ident = self._selection()
+        if ident is None:
+            return
+        try:
+            self.result = self.archive.ouvrir(ident)
+        except (KeyError, ValueError) as e:
+            messagebox.showerror("Archive", f"Impossible d'ouvrir le projet : {e}", parent=self)
+            return
+        self.cancel(garder_resultat=True)
+
+    def supprimer(self):
+        ident = self._selection()
+        if ident is not None and messagebox.askyesno("Archive", "Supprimer ce projet de l'archive ?", parent=self):
+            self.archive.supprimer(ident)
+            self.liste.delete(str(ident))
+
+    def cancel(self, garder_resultat=False):
+        """Ferme la fenêtre (sans projet choisi, sauf après `ouvrir`)."""
+        if not garder_resultat:
+            self.result = None
+        self.archive.fermer()
+        self.destroy()
@@ -0,0 +1,276 @@
+# Fichier: core/batch.py
+
+"""
+Mode batch sans interface : fait passer un fichier de travaux (CSV ou JSONL)
+dans `calculer_escalier_ajuste`, une ligne à la fois, et écrit les résultats au
+fil de l'eau pour garder une mémoire constante sur les gros fichiers.
+
+Usage :
+    python -m core.batch travaux.csv -o resultats.csv
+    python -m core.batch travaux.jsonl -o resultats.jsonl --workers 4
+    python -m core.batch travaux.csv -o resultats.csv --cache
+
+Chaque travail peut fournir les colonnes de COLONNES_ENTREE (les absentes
+prennent les valeurs par défaut des préférences) ; une colonne "id" est
+recopiée telle quelle dans la sortie. Avec --workers N, les lignes sont
+regroupées en paquets répartis sur un pool de processus, et les résultats sont
+réécrits dans l'ordre d'entrée. Avec --cache, les résultats sont lus dans (et
+ajoutés au) cache persistant de core.cache_resultats, partagé entre les
+exécutions et avec le service.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from core import constants
+from core.cache_resultats import FICHIER_CACHE, CacheResultats
+from core.calculations import calculer_escalier_ajuste
+from core.preferences import PREFERENCES
+
+# Colonne du fichier de travaux → argument de calculer_escalier_ajuste
+COLONNES_ENTREE = {
+    "hauteur_totale": "hauteur_totale_escalier_str",
+    "giron": "giron_souhaite_str",
+    "hauteur_cm": "hauteur_cm_souhaitee_str",
+    "nombre_marches": "nombre_marches_manuel_str",
+    "nombre_cm": "nombre_cm_manuel_str",
+    "epaisseur_plancher_sup": "epaisseur_plancher_sup_str",
+    "epaisseur_plancher_inf": "epaisseur_plancher_inf_str",
+    "profondeur_tremie": "profondeur_tremie_ouverture_str",
+    "position_tremie": "position_tremie_ouverture_str",
+    "espace_disponible": "espace_disponible_str",
+}
+
+# Résultats numériques recopiés dans la sortie, dans cet ordre
+COLONNES_RESULTAT = (
+    "hauteur_totale_escalier",
+    "hauteur_reelle_contremarche",
+    "giron_utilise",
+    "nombre_contremarches",
+    "nombre_girons",
+    "longueur_calculee_escalier",
+    "angle_escalier",
+    "longueur_limon_approximative",
+    "min_echappee_calculee",
+    "blondel_value",
+)
+
+COLONNES_SORTIE = ("id", "is_conform") + COLONNES_RESULTAT + ("avertissements",)
+
+# Nombre de travaux par paquet envoyé à un processus
+TAILLE_PAQUET = 256
+
+
+def _format_fichier(chemin, format_force=None):
+    """Retourne 'csv' ou 'jsonl' d'après l'option ou l'extension du fichier."""
+    if format_force:
+        return format_force
+    return "jsonl" if os.path.splitext(chemin)[1].lower() in (".jsonl", ".ndjson", ".json") else "csv"
+
+
+def lire_travaux(flux, format_entree):
+    """
+    Générateur de travaux (dictionnaires de chaînes) lus ligne par ligne. Une
+    ligne JSONL illisible ou qui n'est pas un objet donne {"__erreur__": message}.
+    """
+    if format_entree == "csv":
+        yield from csv.DictReader(flux)
+        return
+    for numero, ligne in enumerate(flux, start=1):
+        if not ligne.strip():
+            continue
+        try:
+            travail = json.loads(ligne)
+        except json.JSONDecodeError as e:
+            travail = {"__erreur__": f"Ligne {numero} JSON invalide : {e}"}
+        else:
+            if not isinstance(travail, dict):
+                travail = {"__erreur__": f"Ligne {numero} : objet JSON attendu"}
+        yield travail
+
+
+def _valeurs_par_defaut(preferences):
+    return {
+        "hauteur_totale": "",
+        "giron": preferences.get("default_tread_width_straight", "9 1/4"),
+        "hauteur_cm": str(constants.HAUTEUR_CM_CONFORT_CIBLE),
+        "nombre_marches": "",
+        "nombre_cm": "",
+        "epaisseur_plancher_sup": preferences.get("default_floor_finish_thickness_upper", "0"),
+        "epaisseur_plancher_inf": preferences.get("default_floor_finish_thickness_lower", "0"),
+        "profondeur_tremie": "",
+        "position_tremie": "",
+        "espace_disponible": "",
+    }
+
+
+def arguments_travail(travail, preferences):
+    """Arguments de calculer_escalier_ajuste (chaînes) pour un travail ; colonnes absentes → défauts."""
+    arguments = {}
+    for colonne, defaut in _valeurs_par_defaut(preferences).items():
+        valeur = travail.get(colonne)
+        arguments[COLONNES_ENTREE[colonne]] = defaut if valeur in (None, "") else str(valeur)
+    return arguments
+
+
+def calculer_travail(travail, preferences, unite="Pouces", cache=None):
+    """StairResult d'un travail (colonnes de COLONNES_ENTREE, "unite" facultative), via `cache` s'il est donné."""
+    arguments = arguments_travail(travail, preferences)
+    unite = travail.get("unite") or unite
+
+    def calculer():
+        return calculer_escalier_ajuste(**arguments, loaded_app_preferences_dict=preferences, unite=unite)
+
+    if cache is None:
+        return calculer()
+    return cache.resultat(arguments, preferences, unite, calculer)
+
+
+def traiter_travail(travail, preferences, unite="Pouces", cache=None):
+    """Calcule un travail et retourne sa ligne de sortie (dictionnaire plat)."""
+    ligne = dict.fromkeys(COLONNES_SORTIE)
+    ligne["id"] = travail.get("id")
+    ligne["is_conform"] = False
+    if "__erreur__" in travail:
+        ligne["avertissements"] = travail["__erreur__"]
+        return ligne
+
+    try:
+        resultat = calculer_travail(travail, preferences, unite, cache)
+    except (ValueError, ArithmeticError) as e:
+        # Un travail en échec est signalé sur sa ligne sans interrompre le lot
+        ligne["avertissements"] = f"Calcul impossible : {e}"
+        return ligne
+    for colonne in COLONNES_RESULTAT:
+        ligne[colonne] = getattr(resultat, colonne)
+    ligne["is_conform"] = resultat.is_conform
+    ligne["avertissements"] = " | ".join(resultat.textes_avertissements(preferences))
+    return ligne
+
+
+# Cache persistant ouvert par processus (chemin → CacheResultats)
+_caches = {}
+
+
+def _traiter_paquet(paquet, preferences, unite, chemin_cache=None):
+    if chemin_cache is None:
+        return [traiter_travail(travail, preferences, unite) for travail in paquet]
+    cache = _caches.get(chemin_cache)
+    if cache is None:
+        cache = _caches[chemin_cache] = CacheResultats(chemin_cache)
+    with cache.ecritures_groupees():
+        return [traiter_travail(travail, preferences, unite, cache) for travail in paquet]
+
+
+class _EcrivainResultats:
+    """Écrit les lignes de sortie au fil de l'eau, en CSV ou en JSONL."""
+
+    def __init__(self, flux, format_sortie):
+        self.flux = flux
+        self.format_sortie = format_sortie
+        if format_sortie == "csv":
+            self._csv = csv.DictWriter(flux, fieldnames=COLONNES_SORTIE)
+            self._csv.writeheader()
+
+    def ecrire(self, lignes):
+        for ligne in lignes:
+            if self.format_sortie == "csv":
+                self._csv.writerow(ligne)
+            else:
+                self.flux.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+        self.flux.flush()
+
+
+def _paquets(travaux, taille):
+    iterateur = iter(travaux)
+    while True:
+        paquet = list(islice(iterateur, taille))
+        if not paquet:
+            return
+        yield paquet
+
+
+def executer_batch(travaux, ecrire, preferences, unite="Pouces", workers=1, taille_paquet=TAILLE_PAQUET, chemin_cache=None):
+    """
+    Traite un itérable de travaux et passe chaque paquet de lignes de sortie
+    à `ecrire`, dans l'ordre d'entrée. Avec workers > 1, au plus 2 × workers
+    paquets sont en vol à la fois, ce qui borne la mémoire.
+
+    Retourne (nombre de travaux, nombre de travaux conformes).
+    """
+    total = conformes = 0
+
+    def consigner(lignes):
+        nonlocal total, conformes
+        total += len(lignes)
+        conformes += sum(1 for ligne in lignes if ligne["is_conform"])
+        ecrire(lignes)
+
+    if workers <= 1:
+        for paquet in _paquets(travaux, taille_paquet):
+            consigner(_traiter_paquet(paquet, preferences, unite, chemin_cache))
+        return total, conformes
+
+    with ProcessPoolExecutor(max_workers=workers) as executeur:
+        en_vol = deque()
+        for paquet in _paquets(travaux, taille_paquet):
+            en_vol.append(executeur.submit(_traiter_paquet, paquet, preferences, unite, chemin_cache))
+            if len(en_vol) >= 2 * workers:
+                consigner(en_vol.popleft().result())
+        while en_vol:
+            consigner(en_vol.popleft().result())
+    return total, conformes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m core.batch",
+        description="Calcule un fichier de travaux d'escalier (CSV ou JSONL) sans interface graphique.",
+    )
+    parser.add_argument("entree", help="Fichier de travaux (.csv ou .jsonl), '-' pour l'entrée standard")
+    parser.add_argument("-o", "--sortie", default="-", help="Fichier de résultats (défaut : sortie standard)")
+    parser.add_argument("--format-entree", choices=("csv", "jsonl"), help="Format d'entrée (défaut : d'après l'extension)")
+    parser.add_argument("--format-sortie", choices=("csv", "jsonl"), help="Format de sortie (défaut : d'après l'extension)")
+    parser.add_argument("--unite", choices=("Pouces", "Centimètres"), default="Pouces",
+                        help="Unité des valeurs sans colonne 'unite' (défaut : Pouces)")
+    parser.add_argument("--workers", type=int, default=1, help="Nombre de processus de calcul (défaut : 1)")
+    parser.add_argument("--taille-paquet", type=int, default=TAILLE_PAQUET, help="Travaux par paquet envoyé à un processus")
+    parser.add_argument("--cache", nargs="?", const=FICHIER_CACHE, metavar="CHEMIN",
+                        help="Utilise le cache persistant des résultats (défaut : data/cache_resultats.sqlite)")
+    args = parser.parse_args(argv)
+
+    format_entree = _format_fichier(args.entree, args.format_entree) if args.entree != "-" else (args.format_entree or "csv")
+    format_sortie = _format_fichier(args.sortie, args.format_sortie) if args.sortie != "-" else (args.format_sortie or "jsonl")
+    preferences = PREFERENCES.instantane()
+
+    flux_entree = sys.stdin if args.entree == "-" else open(args.entree, "r", encoding="utf-8-sig", newline="")
+    flux_sortie = sys.stdout if args.sortie == "-" else open(args.sortie, "w", encoding="utf-8", newline="")
+    try:
+        ecrivain = _EcrivainResultats(flux_sortie, format_sortie)
+        total, conformes = executer_batch(
+            lire_travaux(flux_entree, format_entree),
+            ecrivain.ecrire,
+            preferences,
+            unite=args.unite,
+            workers=max(args.workers, 1),
+            taille_paquet=max(args.taille_paquet, 1),
+            chemin_cache=args.cache,
+        )
+    finally:
+        if flux_entree is not sys.stdin:
+            flux_entree.close()
+        if flux_sortie is not sys.stdout:
+            flux_sortie.close()
+
+    print(f"{total} travaux traités, {conformes} conformes.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
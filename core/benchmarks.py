@@ -0,0 +1,311 @@
+# Fichier: core/benchmarks.py
+
+"""
+Banc de mesure des chemins critiques : moteur, formatage, rapports, laser et
+profondeur de coupe (core.coupe, utilisé par ProfondeurCoupe.py).
+
+Chaque cas appelle une fonction sur un jeu d'entrées tiré avec une graine fixe
+(mêmes entrées d'une exécution à l'autre). Après un passage de chauffe sur tout
+le jeu (caches des fractions remplis, comme en usage réel), chaque appel est
+chronométré ; on rapporte le débit (appels/s) et les percentiles p50/p90/p99.
+
+Usage :
+    python -m core.benchmarks
+    python -m core.benchmarks --sauver                  # enregistre la référence
+    python -m core.benchmarks --comparer --seuil 0.15   # signale les régressions
+    python -m core.benchmarks --filtre parser --duree 0.5
+
+Sans chemin, la référence est data/benchmarks_reference.json. Avec --comparer,
+un cas est en régression si son débit tombe sous (1 - seuil) × la référence ;
+le code de sortie vaut alors 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Callable, List, NamedTuple, Tuple
+
+from core import constants
+from core import coupe
+from core import formatting
+from core import reporting
+from core.calculations import calculer_escalier_ajuste, calculer_hauteur_totale_par_laser
+from core.incremental import MoteurIncremental
+
+GRAINE = 20240611
+TAILLE_JEU = 500
+DUREE_PAR_CAS = 1.0  # secondes de mesure par cas (après la chauffe)
+SEUIL_REGRESSION = 0.15
+FICHIER_REFERENCE = os.path.join(constants.DATA_DIR, "benchmarks_reference.json")
+PERCENTILES = (50, 90, 99)
+
+
+class Cas(NamedTuple):
+    nom: str
+    fonction: Callable
+    arguments: List[Tuple]
+
+
+class Mesure(NamedTuple):
+    nom: str
+    appels: int
+    ops_par_s: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+
+
+# --- Jeux d'entrées (graine fixe) ---
+
+def _mesure(alea, minimum, maximum, seiziemes=True):
+    """Mesure en pouces au 1/16 près, écrite comme à la saisie ("108 3/8")."""
+    valeur = round(alea.uniform(minimum, maximum) * 16) / 16 if seiziemes else alea.uniform(minimum, maximum)
+    return formatting.decimal_to_fraction_str(valeur)
+
+
+def _entrees_realistes(alea, preferences):
+    arguments = []
+    for _ in range(TAILLE_JEU):
+        avec_tremie = alea.random() < 0.7
+        arguments.append((
+            _mesure(alea, 90, 130),
+            _mesure(alea, 9, 11),
+            alea.choice(["7", "7 1/4", "7 1/2", "6 7/8"]),
+            "",
+            "",
+            alea.choice(["1 1/2", "1 3/4", "2"]),
+            alea.choice(["1", "3/4", "0"]),
+            _mesure(alea, 100, 140) if avec_tremie else "",
+            _mesure(alea, 0, 20) if avec_tremie else "",
+            _mesure(alea, 120, 200) if alea.random() < 0.5 else "",
+            preferences,
+        ))
+    return arguments
+
+
+def _entrees_limites(alea, preferences):
+    """Nombres imposés, très grandes hauteurs, centimètres et saisies invalides."""
+    arguments = []
+    for _ in range(TAILLE_JEU):
+        genre = alea.randrange(5)
+        hauteur = _mesure(alea, 90, 130)
+        if genre == 0:  # nombre de contremarches imposé, aux bornes
+            ligne = (hauteur, "9 1/4", "7", "", str(alea.choice([2, 3, 49, 50])), "1 1/2", "1", "", "", "")
+        elif genre == 1:  # nombre de marches imposé
+            ligne = (hauteur, "10", "7", str(alea.randrange(1, 30)), "", "1 1/2", "1", "120", "5", "150")
+        elif genre == 2:  # très grande hauteur, trémie qui couvre tout l'escalier
+            ligne = (_mesure(alea, 400, 600), "9 1/4", "7 7/8", "", "", "1 1/2", "1", "600", "0", "")
+        elif genre == 3:  # saisies en centimètres
+            ligne = (
+                f"{alea.uniform(230, 330):.2f}", f"{alea.uniform(23, 28):.1f}", "17.8", "", "",
+                "3.81", "2.54", f"{alea.uniform(250, 350):.1f}", "", "",
+            )
+            arguments.append(ligne + (preferences, None, "Centimètres"))
+            continue
+        else:  # saisies invalides ou vides
+            ligne = (alea.choice(["abc", "", "12//3", "-"]), "9 1/4", "7", "", "", "1 1/2", "1", "", "", "")
+        arguments.append(ligne + (preferences,))
+    return arguments
+
+
+def _entrees_fractions(alea):
+    textes = []
+    for _ in range(TAILLE_JEU):
+        genre = alea.randrange(4)
+        if genre == 0:
+            textes.append(str(alea.randrange(0, 200)))
+        elif genre == 1:
+            textes.append(f"{alea.uniform(0, 200):.{alea.randrange(1, 4)}f}")
+        elif genre == 2:
+            textes.append(_mesure(alea, 0, 200))
+        else:
+            textes.append(f' {_mesure(alea, 0, 20)}" ')
+    return [(texte,) for texte in textes]
+
+
+def _entrees_laser(alea, preferences):
+    arguments = []
+    for _ in range(TAILLE_JEU):
+        haut = alea.uniform(100, 130)
+        bas = alea.uniform(0, 5)
+        arguments.append((
+            _mesure(alea, 30, 60),
+            _mesure(alea, haut - 0.2, haut + 0.2),
+            _mesure(alea, haut - 0.2, haut + 0.2),
+            _mesure(alea, bas - 0.2, bas + 0.2),
+            _mesure(alea, bas - 0.2, bas + 0.2),
+            preferences,
+        ))
+    return arguments
+
+
+def _entrees_coupe(alea):
+    """Rayon de lame, épaisseur du bois et dépassement P en mm ; environ 10 % hors domaine."""
+    arguments = []
+    for _ in range(TAILLE_JEU):
+        rayon = alea.uniform(80, 95)
+        epaisseur = alea.uniform(19, 45)
+        if alea.random() < 0.1:
+            profondeur = alea.uniform(0, epaisseur)  # P < h : refusé en H90
+        else:
+            profondeur = alea.uniform(epaisseur, min(rayon, 2 * rayon * 0.7071 - epaisseur))
+        arguments.append((rayon, epaisseur, profondeur))
+    return arguments
+
+
+def cas_de_mesure(graine=GRAINE):
+    """Liste des cas mesurés ; toutes les entrées dépendent seulement de `graine`."""
+    from utils import formatting as formatting_utils
+
+    alea = random.Random(graine)
+    preferences = dict(constants.DEFAULT_APP_PREFERENCES)
+    realistes = _entrees_realistes(alea, preferences)
+    moteur = MoteurIncremental()
+
+    def calcul_moteur_conserve(*arguments):
+        return calculer_escalier_ajuste(*arguments, moteur=moteur)
+
+    def _rapport_multiformat(resultat, preferences):
+        # Export multi-format : un seul modèle de rapport, rendu dans chaque format
+        return reporting.rendre_formats(reporting.rapport_complet(resultat), preferences=preferences)
+
+    # Saisie au clavier : seule la hauteur totale change d'un appel à l'autre
+    frappes = [(hauteur,) + realistes[0][1:] for (hauteur, *_reste) in realistes]
+    resultats = [calculer_escalier_ajuste(*arguments) for arguments in realistes[:50]]
+    rapports = [(resultat, preferences) for resultat in resultats if resultat.is_valid]
+    fractions = _entrees_fractions(alea)
+    decimales = [(alea.uniform(0, 200), preferences) for _ in range(TAILLE_JEU)]
+
+    cas = [
+        Cas("calcul.realiste", calculer_escalier_ajuste, realistes),
+        Cas("calcul.limites", calculer_escalier_ajuste, _entrees_limites(alea, preferences)),
+        Cas("calcul.moteur_conserve", calcul_moteur_conserve, frappes),
+        Cas("formatage.parser_fraction.core", formatting.parser_fraction, fractions),
+        Cas("formatage.parser_fraction.utils", formatting_utils.parser_fraction, fractions),
+        Cas("formatage.decimal_to_fraction_str.core", formatting.decimal_to_fraction_str, decimales),
+        Cas("formatage.decimal_to_fraction_str.utils", formatting_utils.decimal_to_fraction_str, decimales),
+        Cas("rapport.texte_trace", reporting.generer_texte_trace, rapports),
+        Cas("rapport.tableau_marches", reporting.generer_tableau_marches, rapports),
+        Cas("rapport.tableau_parametres", reporting.generer_tableau_parametres, rapports),
+        Cas("rapport.complet_4_formats", _rapport_multiformat, rapports),
+        Cas("laser.hauteur_totale", calculer_hauteur_totale_par_laser, _entrees_laser(alea, preferences)),
+    ]
+    coupes = _entrees_coupe(alea)
+    cas.append(Cas("coupe.H90_mm", coupe.calculer_H90_mm, coupes))
+    cas.append(Cas("coupe.H45_mm", coupe.calculer_H45_mm, coupes))
+    return cas
+
+
+# --- Mesure ---
+
+def _percentile(durees_triees, rang):
+    """Percentile au rang le plus proche d'une liste triée."""
+    indice = max(0, min(len(durees_triees) - 1, round(rang / 100 * len(durees_triees)) - 1))
+    return durees_triees[indice]
+
+
+def mesurer(cas, duree=DUREE_PAR_CAS):
+    """Chronomètre chaque appel de `cas.fonction` sur son jeu d'entrées pendant `duree` secondes."""
+    fonction, arguments = cas.fonction, cas.arguments
+    for args in arguments:  # chauffe
+        fonction(*args)
+
+    horloge = time.perf_counter_ns
+    durees = []
+    fin = horloge() + int(duree * 1e9)
+    while horloge() < fin:
+        for args in arguments:
+            debut = horloge()
+            fonction(*args)
+            durees.append(horloge() - debut)
+
+    durees.sort()
+    total_s = sum(durees) / 1e9
+    p50, p90, p99 = (_percentile(durees, rang) / 1000.0 for rang in PERCENTILES)
+    return Mesure(cas.nom, len(durees), len(durees) / total_s if total_s else 0.0, p50, p90, p99)
+
+
+def executer(filtre=None, duree=DUREE_PAR_CAS, graine=GRAINE):
+    mesures = []
+    for cas in cas_de_mesure(graine):
+        if filtre and filtre not in cas.nom:
+            continue
+        mesures.append(mesurer(cas, duree))
+        print(_ligne(mesures[-1]), flush=True)
+    return mesures
+
+
+def _ligne(mesure):
+    return (
+        f"{mesure.nom:<42} {mesure.ops_par_s:>12,.0f} op/s"
+        f"  p50 {mesure.p50_us:>8.2f} µs  p90 {mesure.p90_us:>8.2f} µs  p99 {mesure.p99_us:>8.2f} µs"
+    )
+
+
+# --- Référence ---
+
+def sauver_reference(mesures, chemin=FICHIER_REFERENCE, graine=GRAINE):
+    os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+    contenu = {
+        "graine": graine,
+        "python": platform.python_version(),
+        "plateforme": platform.platform(),
+        "cas": {mesure.nom: mesure._asdict() for mesure in mesures},
+    }
+    with open(chemin, "w", encoding="utf-8") as f:
+        json.dump(contenu, f, indent=4, ensure_ascii=False)
+
+
+def comparer(mesures, chemin=FICHIER_REFERENCE, seuil=SEUIL_REGRESSION):
+    """Retourne la liste des (mesure, débit de référence) en régression de plus de `seuil`."""
+    with open(chemin, "r", encoding="utf-8") as f:
+        reference = json.load(f)["cas"]
+    regressions = []
+    for mesure in mesures:
+        if mesure.nom not in reference:
+            continue
+        debit = reference[mesure.nom]["ops_par_s"]
+        print(f"{mesure.nom:<42} {mesure.ops_par_s / debit - 1:>+8.1%}")
+        if mesure.ops_par_s < (1 - seuil) * debit:
+            regressions.append((mesure, debit))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m core.benchmarks",
+        description="Mesure les chemins critiques et compare à une référence enregistrée.",
+    )
+    parser.add_argument("--filtre", help="ne mesure que les cas dont le nom contient ce texte")
+    parser.add_argument("--duree", type=float, default=DUREE_PAR_CAS, help="secondes de mesure par cas")
+    parser.add_argument("--graine", type=int, default=GRAINE, help="graine des jeux d'entrées")
+    parser.add_argument("--sauver", nargs="?", const=FICHIER_REFERENCE, metavar="CHEMIN",
+                        help="enregistre les mesures comme référence (JSON)")
+    parser.add_argument("--comparer", nargs="?", const=FICHIER_REFERENCE, metavar="CHEMIN",
+                        help="compare les mesures à une référence (JSON)")
+    parser.add_argument("--seuil", type=float, default=SEUIL_REGRESSION,
+                        help="baisse de débit tolérée avant de signaler une régression (0.15 = 15 %%)")
+    args = parser.parse_args(argv)
+
+    mesures = executer(args.filtre, args.duree, args.graine)
+
+    code = 0
+    if args.comparer:
+        print(f"\nComparaison avec {args.comparer} (seuil {args.seuil:.0%}) :")
+        regressions = comparer(mesures, args.comparer, args.seuil)
+        for mesure, debit in regressions:
+            print(f"RÉGRESSION : {mesure.nom} {mesure.ops_par_s:,.0f} op/s < référence {debit:,.0f} op/s",
+                  file=sys.stderr)
+        code = 1 if regressions else 0
+    if args.sauver:
+        sauver_reference(mesures, args.sauver, args.graine)
+        print(f"Référence enregistrée dans {args.sauver}")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
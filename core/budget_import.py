@@ -0,0 +1,116 @@
+# Fichier: core/budget_import.py
+
+"""
+Contrôle du coût d'import à froid du paquet core.
+
+Lance `python -X importtime` dans un interpréteur neuf (plusieurs fois, on garde
+le meilleur essai) et échoue si :
+  - le temps total d'import des modules demandés dépasse le budget ;
+  - un module graphique (tkinter) est importé ;
+  - l'import a créé ou modifié un fichier dans le dossier de l'application.
+
+Usage :
+    python -m core.budget_import
+    python -m core.budget_import --budget-ms 150 --modules core.calculations core.reporting
+
+Le code de sortie vaut 0 si tout est dans le budget, 1 sinon.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from core import constants
+
+# Modules que doit pouvoir importer un traitement sans interface (batch, service)
+MODULES_MOTEUR = (
+    "core.constants",
+    "core.formatting",
+    "core.calculations",
+    "core.reporting",
+    "core.view_model",
+)
+
+# Budget du temps total d'import à froid (ms), NumPy compris
+BUDGET_IMPORT_MS = 250
+
+# Préfixes des modules interdits à l'import du moteur
+MODULES_INTERDITS = ("tkinter", "_tkinter")
+
+
+def mesurer_import(modules=MODULES_MOTEUR):
+    """
+    Importe `modules` dans un interpréteur neuf avec -X importtime.
+    Retourne (temps total en ms, {module: temps propre en µs}).
+    """
+    commande = [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)]
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    sortie = subprocess.run(
+        commande, cwd=constants.APP_DIR, env=env, capture_output=True, text=True, check=True
+    ).stderr
+
+    temps_propres = {}
+    for ligne in sortie.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not ligne.startswith("import time:") or "self [us]" in ligne:
+            continue
+        propre, _cumule, nom = ligne[len("import time:"):].split("|")
+        temps_propres[nom.strip()] = int(propre)
+    return sum(temps_propres.values()) / 1000.0, temps_propres
+
+
+def _etat_fichiers(dossier=constants.APP_DIR):
+    """Chemin → (taille, date de modification) des fichiers de l'application, hors caches."""
+    etat = {}
+    for racine, dossiers, fichiers in os.walk(dossier):
+        dossiers[:] = [d for d in dossiers if d not in ("__pycache__", ".git")]
+        for nom in fichiers:
+            chemin = os.path.join(racine, nom)
+            info = os.stat(chemin)
+            etat[chemin] = (info.st_size, info.st_mtime_ns)
+    return etat
+
+
+def verifier(modules=MODULES_MOTEUR, budget_ms=BUDGET_IMPORT_MS, essais=3):
+    """Retourne (meilleur temps en ms, liste des problèmes ; vide si tout est conforme)."""
+    avant = _etat_fichiers()
+    mesures = [mesurer_import(modules) for _ in range(essais)]
+    apres = _etat_fichiers()
+
+    total_ms, temps_propres = min(mesures, key=lambda mesure: mesure[0])
+    problemes = []
+    if total_ms > budget_ms:
+        lents = sorted(temps_propres.items(), key=lambda item: item[1], reverse=True)[:5]
+        detail = ", ".join(f"{nom} {propre / 1000.0:.1f} ms" for nom, propre in lents)
+        problemes.append(f"Import à froid : {total_ms:.1f} ms > budget {budget_ms} ms ({detail})")
+    interdits = sorted(nom for nom in temps_propres if nom.split(".")[0] in MODULES_INTERDITS)
+    if interdits:
+        problemes.append("Modules graphiques importés : " + ", ".join(interdits))
+    modifies = sorted(chemin for chemin in set(avant) | set(apres) if avant.get(chemin) != apres.get(chemin))
+    if modifies:
+        problemes.append("Fichiers créés ou modifiés à l'import : " + ", ".join(modifies))
+    return total_ms, problemes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m core.budget_import",
+        description="Vérifie le coût et les effets de bord de l'import à froid du moteur.",
+    )
+    parser.add_argument("--modules", nargs="+", default=list(MODULES_MOTEUR), help="modules à importer")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_IMPORT_MS, help="budget total (ms)")
+    parser.add_argument("--essais", type=int, default=3, help="nombre d'imports à froid (meilleur retenu)")
+    args = parser.parse_args(argv)
+
+    total_ms, problemes = verifier(args.modules, args.budget_ms, max(1, args.essais))
+    for probleme in problemes:
+        print("ÉCHEC :", probleme, file=sys.stderr)
+    if problemes:
+        return 1
+    print(f"Import à froid de {', '.join(args.modules)} : {total_ms:.1f} ms (budget {args.budget_ms:g} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+# Fichier: core/cache_resultats.py
+
+"""
+Cache persistant (SQLite, dans data/) des résultats du moteur et des rapports,
+partagé entre les sessions, le mode batch et le service.
+
+La clé d'une entrée est l'empreinte (SHA-256) des entrées parsées, ramenées en
+pouces, et des préférences qui comptent : l'épaisseur de marche pour un
+résultat, toutes les préférences pour un rapport (précision des fractions).
+"9.25", "9 1/4" et "23.495" cm donnent donc la même clé. Chaque entrée porte
+aussi la version des règles : VERSION_PROGRAMME et l'empreinte de toutes les
+constantes numériques de core.constants. Changer une constante réglementaire
+rend les anciennes entrées invisibles ; elles sont supprimées à la prochaine
+ouverture du cache.
+
+Les entrées non utilisées depuis AGE_MAX_JOURS sont supprimées, et quand le
+cache dépasse TAILLE_MAX_OCTETS, les moins récemment utilisées sont retirées.
+
+Usage :
+    with CacheResultats() as cache:
+        resultat = cache.resultat(entrees, preferences, unite, calculer)
+        texte = cache.rapport("trace", entrees, preferences, unite, lambda: generer(...))
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from core import constants
+from core.incremental import parser_entrees
+from core.results import StairResult
+
+FICHIER_CACHE = os.path.join(constants.DATA_DIR, "cache_resultats.sqlite")
+TAILLE_MAX_OCTETS = 64 * 1024 * 1024
+AGE_MAX_JOURS = 180
+# La date d'utilisation d'une entrée lue n'est réécrite qu'une fois par jour au plus
+DELAI_RAFRAICHISSEMENT_S = 24 * 3600
+# Nombre d'écritures entre deux contrôles de la taille du cache
+CONTROLE_TAILLE_TOUTES = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entrees (
+    cle TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    valeur TEXT NOT NULL,
+    taille INTEGER NOT NULL,
+    utilise REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entrees_utilise ON entrees (utilise);
+"""
+
+
+def version_regles():
+    """Version du programme et empreinte des constantes numériques (règles, tolérances, conversions)."""
+    regles = {
+        nom: getattr(constants, nom)
+        for nom in dir(constants)
+        if nom.isupper() and isinstance(getattr(constants, nom), (bool, int, float, tuple))
+    }
+    contenu = json.dumps({"version": constants.VERSION_PROGRAMME, "regles": regles}, sort_keys=True)
+    return f"{constants.VERSION_PROGRAMME}:{hashlib.sha256(contenu.encode('utf-8')).hexdigest()[:16]}"
+
+
+def empreinte(genre, entrees, preferences, unite="Pouces"):
+    """
+    Clé d'une entrée de cache ; `entrees` a les clés des arguments de
+    calculer_escalier_ajuste. Retourne None si une entrée est invalide (rien
+    n'est mis en cache pour une saisie qui ne se parse pas).
+    """
+    try:
+        valeurs = parser_entrees(entrees, preferences, unite)
+    except ValueError:
+        return None
+    contenu = {"genre": genre, "entrees": valeurs}
+    if genre != "resultat":
+        contenu["preferences"] = preferences
+    texte = json.dumps(contenu, sort_keys=True, default=str)
+    return hashlib.sha256(texte.encode("utf-8")).hexdigest()
+
+
+class CacheResultats:
+    def __init__(self, chemin=FICHIER_CACHE, taille_max_octets=TAILLE_MAX_OCTETS, age_max_jours=AGE_MAX_JOURS):
+        self.chemin = chemin
+        self.taille_max_octets = taille_max_octets
+        self.age_max_s = age_max_jours * 24 * 3600
+        self.version = version_regles()
+        self.stats = {"succes": 0, "echecs": 0, "ecritures": 0, "evictions": 0}
+        self._ecritures_depuis_controle = 0
+        self._tampon = None
+
+        os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+        # Autocommit : les lectures ne gardent aucun verrou ; les écritures sont
+        # faites dans des transactions courtes (BEGIN IMMEDIATE), ce qui permet à
+        # plusieurs processus (batch --workers, service) de partager le fichier
+        self._connexion = sqlite3.connect(chemin, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute("PRAGMA synchronous=NORMAL")
+        self._connexion.executescript(_SCHEMA)
+        self.purger()
+
+    # --- Accès bas niveau ---
+
+    def lire(self, cle):
+        ligne = self._connexion.execute(
+            "SELECT valeur, utilise FROM entrees WHERE cle = ? AND version = ?", (cle, self.version)
+        ).fetchone()
+        if ligne is None:
+            self.stats["echecs"] += 1
+            return None
+        self.stats["succes"] += 1
+        maintenant = time.time()
+        if maintenant - ligne[1] > DELAI_RAFRAICHISSEMENT_S:
+            self._connexion.execute("UPDATE entrees SET utilise = ? WHERE cle = ?", (maintenant, cle))
+        return json.loads(ligne[0])
+
+    def ecrire(self, cle, valeur):
+        texte = json.dumps(valeur, ensure_ascii=False)
+        ligne = (cle, self.version, texte, len(cle) + len(texte), time.time())
+        if self._tampon is not None:
+            self._tampon.append(ligne)
+        else:
+            self._inserer([ligne])
+
+    def _inserer(self, lignes):
+        with self._transaction():
+            self._connexion.executemany(
+                "INSERT OR REPLACE INTO entrees (cle, version, valeur, taille, utilise) VALUES (?, ?, ?, ?, ?)", lignes
+            )
+            self.stats["ecritures"] += len(lignes)
+            self._ecritures_depuis_controle += len(lignes)
+            if self._ecritures_depuis_controle >= CONTROLE_TAILLE_TOUTES:
+                self._limiter_taille()
+
+    @contextmanager
+    def _transaction(self):
+        self._connexion.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connexion.execute("ROLLBACK")
+            raise
+        self._connexion.execute("COMMIT")
+
+    @contextmanager
+    def ecritures_groupees(self):
+        """Les écritures faites dans le bloc sont enregistrées ensemble, en une transaction, à sa sortie."""
+        if self._tampon is not None:
+            yield self
+            return
+        self._tampon = []
+        try:
+            yield self
+        finally:
+            tampon, self._tampon = self._tampon, None
+            if tampon:
+                self._inserer(tampon)
+
+    # --- Résultats et rapports ---
+
+    def resultat(self, entrees, preferences, unite, calculer):
+        """StairResult des `entrees` : lu dans le cache, sinon `calculer()` puis enregistré."""
+        cle = empreinte("resultat", entrees, preferences, unite)
+        if cle is None:
+            return calculer()
+        valeurs = self.lire(cle)
+        if valeurs is not None:
+            return StairResult(**valeurs)
+        resultat = calculer()
+        self.ecrire(cle, resultat._asdict())
+        return resultat
+
+    def rapport(self, nom, entrees, preferences, unite, generer):
+        """Texte du rapport `nom` pour les `entrees` : lu dans le cache, sinon `generer()` puis enregistré."""
+        cle = empreinte(f"rapport:{nom}", entrees, preferences, unite)
+        if cle is None:
+            return generer()
+        texte = self.lire(cle)
+        if texte is None:
+            texte = generer()
+            self.ecrire(cle, texte)
+        return texte
+
+    # --- Éviction ---
+
+    def purger(self):
+        """Supprime les entrées d'une autre version des règles et celles trop anciennes, puis limite la taille."""
+        with self._transaction():
+            curseur = self._connexion.execute(
+                "DELETE FROM entrees WHERE version != ? OR utilise < ?", (self.version, time.time() - self.age_max_s)
+            )
+            self.stats["evictions"] += max(curseur.rowcount, 0)
+            self._limiter_taille()
+
+    def _limiter_taille(self):
+        self._ecritures_depuis_controle = 0
+        taille = self._connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM entrees").fetchone()[0]
+        if taille <= self.taille_max_octets:
+            return
+        # On descend à 90 % du maximum pour ne pas refaire l'éviction à chaque écriture
+        a_liberer = taille - int(self.taille_max_octets * 0.9)
+        cles = []
+        for cle, taille_entree in self._connexion.execute("SELECT cle, taille FROM entrees ORDER BY utilise"):
+            cles.append((cle,))
+            a_liberer -= taille_entree
+            if a_liberer <= 0:
+                break
+        self._connexion.executemany("DELETE FROM entrees WHERE cle = ?", cles)
+        self.stats["evictions"] += len(cles)
+
+    def taille(self):
+        """(nombre d'entrées, taille totale en octets)."""
+        return self._connexion.execute("SELECT COUNT(*), COALESCE(SUM(taille), 0) FROM entrees").fetchone()
+
+    def fermer(self):
+        self._connexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
@@ -0,0 +1,166 @@
+# Fichier: core/charge_service.py
+
+"""
+Test de charge du service local (core.service).
+
+N clients simultanés gardent chacun une connexion HTTP/1.1 ouverte et envoient
+des requêtes tirées avec une graine fixe : des calculs (dont une part répétée,
+qui doit sortir du cache), des rapports, des mesures laser, des coupes et
+quelques lots. On rapporte le débit, les percentiles de latence par route et
+les erreurs.
+
+Usage (le service doit tourner, par exemple `python -m core.service`) :
+    python -m core.charge_service --clients 20 --requetes 5000
+    python -m core.charge_service --port 8765 --part-lots 0.01 --taille-lot 500
+
+Le code de sortie vaut 1 si une requête a échoué.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+
+from core.service import HOTE, PORT
+
+GRAINE = 20240611
+
+
+def _travail(alea):
+    return {
+        "hauteur_totale": f"{alea.randrange(90 * 16, 130 * 16) / 16:g}",
+        "giron": alea.choice(["9 1/4", "9 1/2", "10", "10 1/4"]),
+        "hauteur_cm": alea.choice(["7", "7 1/4", "7 1/2"]),
+        "profondeur_tremie": alea.choice(["", "110", "120", "130"]),
+        "position_tremie": alea.choice(["", "0", "6"]),
+        "espace_disponible": alea.choice(["", "150", "180"]),
+    }
+
+
+def generer_requetes(nombre, graine=GRAINE, part_repetee=0.5, part_lots=0.0, taille_lot=200):
+    """Liste de (route, corps) ; `part_repetee` des calculs reprend un travail déjà envoyé."""
+    alea = random.Random(graine)
+    deja_vus = []
+    requetes = []
+    for _ in range(nombre):
+        tirage = alea.random()
+        if tirage < part_lots:
+            requetes.append(("/lot", {"travaux": [_travail(alea) for _ in range(taille_lot)]}))
+        elif tirage < 0.70:
+            if deja_vus and alea.random() < part_repetee:
+                travail = alea.choice(deja_vus)
+            else:
+                travail = _travail(alea)
+                deja_vus.append(travail)
+            requetes.append(("/calcul", travail))
+        elif tirage < 0.80:
+            requetes.append(("/rapport", dict(_travail(alea), rapport=alea.choice(["trace", "marches", "parametres"]))))
+        elif tirage < 0.90:
+            haut, bas = alea.uniform(100, 130), alea.uniform(0, 5)
+            requetes.append(("/laser", {
+                "hls": f"{alea.uniform(30, 60):.3f}",
+                "hg": f"{haut:.3f}", "hd": f"{haut + alea.uniform(-0.2, 0.2):.3f}",
+                "bg": f"{bas:.3f}", "bd": f"{bas + alea.uniform(-0.2, 0.2):.3f}",
+            }))
+        else:
+            epaisseur = alea.uniform(19, 45)
+            requetes.append(("/coupe", {
+                "rayon_mm": 82.55, "epaisseur_mm": epaisseur,
+                "profondeur_mm": alea.uniform(epaisseur, 70), "angle": alea.choice([90, 45]),
+            }))
+    return requetes
+
+
+async def _client(hote, port, file_requetes, latences, erreurs):
+    reader, writer = await asyncio.open_connection(hote, port)
+    try:
+        while True:
+            try:
+                route, corps = file_requetes.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            donnees = json.dumps(corps).encode("utf-8")
+            debut = time.perf_counter()
+            writer.write(
+                f"POST {route} HTTP/1.1\r\nHost: {hote}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(donnees)}\r\n\r\n".encode("latin-1") + donnees
+            )
+            await writer.drain()
+            statut = int((await reader.readline()).split()[1])
+            longueur = 0
+            while True:
+                ligne = await reader.readline()
+                if ligne in (b"\r\n", b""):
+                    break
+                nom, _, valeur = ligne.decode("latin-1").partition(":")
+                if nom.strip().lower() == "content-length":
+                    longueur = int(valeur)
+            reponse = await reader.readexactly(longueur)
+            latences[route].append(time.perf_counter() - debut)
+            if statut != 200:
+                erreurs.append((route, statut, reponse[:200].decode("utf-8", "replace")))
+    finally:
+        writer.close()
+
+
+async def executer_charge(hote, port, requetes, clients):
+    file_requetes = asyncio.Queue()
+    for requete in requetes:
+        file_requetes.put_nowait(requete)
+    latences = defaultdict(list)
+    erreurs = []
+    debut = time.perf_counter()
+    await asyncio.gather(*(_client(hote, port, file_requetes, latences, erreurs) for _ in range(clients)))
+    return time.perf_counter() - debut, latences, erreurs
+
+
+async def _lire_sante(hote, port):
+    reader, writer = await asyncio.open_connection(hote, port)
+    writer.write(f"GET /sante HTTP/1.1\r\nHost: {hote}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    reponse = await reader.read()
+    writer.close()
+    return json.loads(reponse.split(b"\r\n\r\n", 1)[1])
+
+
+def _percentile(valeurs_triees, rang):
+    return valeurs_triees[max(0, min(len(valeurs_triees) - 1, round(rang / 100 * len(valeurs_triees)) - 1))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m core.charge_service",
+        description="Test de charge du service local de calcul d'escalier.",
+    )
+    parser.add_argument("--hote", default=HOTE)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--clients", type=int, default=20, help="connexions simultanées")
+    parser.add_argument("--requetes", type=int, default=5000, help="nombre total de requêtes")
+    parser.add_argument("--part-repetee", type=float, default=0.5, help="part des calculs qui répètent un travail déjà envoyé")
+    parser.add_argument("--part-lots", type=float, default=0.0, help="part des requêtes qui sont des lots (/lot)")
+    parser.add_argument("--taille-lot", type=int, default=200, help="travaux par lot")
+    parser.add_argument("--graine", type=int, default=GRAINE)
+    args = parser.parse_args(argv)
+
+    requetes = generer_requetes(args.requetes, args.graine, args.part_repetee, args.part_lots, args.taille_lot)
+    duree, latences, erreurs = asyncio.run(executer_charge(args.hote, args.port, requetes, max(args.clients, 1)))
+
+    print(f"{len(requetes)} requêtes en {duree:.2f} s avec {args.clients} clients : {len(requetes) / duree:,.0f} req/s")
+    for route in sorted(latences):
+        valeurs = sorted(latences[route])
+        p50, p90, p99 = (_percentile(valeurs, rang) * 1000 for rang in (50, 90, 99))
+        print(f"  {route:<9} n={len(valeurs):<6} p50 {p50:8.2f} ms  p90 {p90:8.2f} ms  p99 {p99:8.2f} ms")
+    print("Cache du service :", asyncio.run(_lire_sante(args.hote, args.port))["cache"])
+    for route, statut, message in erreurs[:10]:
+        print(f"ERREUR {statut} sur {route} : {message}", file=sys.stderr)
+    if erreurs:
+        print(f"{len(erreurs)} requêtes en erreur.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,9 @@ DEBUG_MODE_ACTIVE = False
 # --- Constantes de Conversion d'Unités ---
 POUCE_EN_CM = 2.54
 POUCE_EN_MM = 25.4
+# Grilles entières des repères de traçage (core.grille) : 1/64 po et 0,1 mm
+GRADUATIONS_POUCE = 64
+DIXIEMES_MM_PAR_POUCE = 254
 TOLERANCE_MESURE_LASER = 0.125  # Tolérance de mesure en pouces (1/8")
 
 # --- Constantes Réglementaires et de Confort (en POUCES) ---
@@ -39,6 +42,9 @@ DEFAULT_APP_PREFERENCES = {
     "default_tread_width_straight": "9 1/4",
     "default_floor_finish_thickness_upper": "1 1/2",
     "default_floor_finish_thickness_lower": "1",
+    "default_tread_thickness": "1 1/16",
+    "default_riser_thickness": "3/4",
+    "fraction_precision_denominator": 16,
     "show_debug_info": False
 }
 
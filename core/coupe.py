@@ -0,0 +1,74 @@
+# Fichier: core/coupe.py
+
+"""
+Décalage de lame H90 et H45 d'une scie circulaire (entrées en mm), sans
+interface : utilisé par ProfondeurCoupe.py, le service JSON et les mesures.
+"""
+
+import math
+
+
+def calculer_H90_mm(rayon_lame_mm, epaisseur_bois_mm, profondeur_depassement_P_mm):
+    if profondeur_depassement_P_mm < epaisseur_bois_mm:
+        return {
+            "H_val": None,
+            "message": f"ERREUR_H90: P ({profondeur_depassement_P_mm:.2f}mm) < h ({epaisseur_bois_mm:.2f}mm)."
+        }
+    try:
+        d_dessous = rayon_lame_mm - profondeur_depassement_P_mm
+        d_dessus = rayon_lame_mm - profondeur_depassement_P_mm + epaisseur_bois_mm
+
+        if rayon_lame_mm**2 < d_dessous**2:
+            return {
+                "H_val": None,
+                "message": f"ERREUR_H90: r² < d_dessous² (r={rayon_lame_mm:.2f}, d_inf={d_dessous:.2f}). Vérifiez P."
+            }
+        # Gestion des cas où le terme sous la racine est très proche de zéro ou négatif
+        terme_sqrt_dessous = rayon_lame_mm**2 - d_dessous**2
+        proj_dessous = math.sqrt(max(0, terme_sqrt_dessous))
+
+
+        terme_sqrt_dessus = rayon_lame_mm**2 - d_dessus**2
+        if terme_sqrt_dessus < -1e-9 and not abs(terme_sqrt_dessus) < 1e-9 : # si négatif et pas quasi nul
+             return { "H_val": None, "message": f"ERREUR_H90: r² < d_dessus² (r={rayon_lame_mm:.2f}, d_sup={d_dessus:.2f})." }
+        proj_dessus = math.sqrt(max(0, terme_sqrt_dessus))
+        
+        H90_val = proj_dessous - proj_dessus
+        return {"H_val": H90_val, "message": "Calcul H90 réussi."}
+    except Exception as e:
+        return {"H_val": None, "message": f"ERREUR_H90_INATTENDUE: {e}"}
+
+def calculer_H45_mm(rayon_lame_mm, epaisseur_bois_mm, profondeur_depassement_P_mm):
+    cos_45 = math.cos(math.radians(45))
+    limite_sup_P_mm = (2 * rayon_lame_mm * cos_45) - epaisseur_bois_mm
+
+    if not (-1e-9 <= profondeur_depassement_P_mm <= limite_sup_P_mm + 1e-9): # Tolérance pour comparaison flottants
+        return {
+            "H_val": None,
+            "message": f"ERREUR_H45: P ({profondeur_depassement_P_mm:.2f}mm) hors intervalle [0, {limite_sup_P_mm:.2f}mm]."
+        }
+    try:
+        zc = (rayon_lame_mm * cos_45) - profondeur_depassement_P_mm
+        d_prime_dessous = abs(zc) / cos_45
+        d_prime_dessus = abs(epaisseur_bois_mm - zc) / cos_45
+        
+        terme_sqrt_dessous = rayon_lame_mm**2 - d_prime_dessous**2
+        if terme_sqrt_dessous < -1e-9:
+            return {
+                "H_val": None,
+                "message": f"ERREUR_H45: r² < d'_dessous² (r={rayon_lame_mm:.2f}, d'_inf={d_prime_dessous:.2f})."
+            }
+        proj_dessous_45 = math.sqrt(max(0, terme_sqrt_dessous))
+
+        terme_sqrt_dessus = rayon_lame_mm**2 - d_prime_dessus**2
+        if terme_sqrt_dessus < -1e-9:
+            return {
+                "H_val": None,
+                "message": f"ERREUR_H45: r² < d'_dessus² (r={rayon_lame_mm:.2f}, d'_sup={d_prime_dessus:.2f})."
+            }
+        proj_dessus_45 = math.sqrt(max(0, terme_sqrt_dessus))
+        
+        H45_val = proj_dessous_45 - proj_dessus_45
+        return {"H_val": H45_val, "message": "Calcul H45 réussi."}
+    except Exception as e:
+        return {"H_val": None, "message": f"ERREUR_H45_INATTENDUE: {e}"}
@@ -0,0 +1,127 @@
+# Fichier: core/equivalence.py
+
+"""
+Contrôle d'équivalence entre le moteur par étapes (calculer_escalier_ajuste) et
+le moteur vectorisé (calculer_escalier_vectorise).
+
+Un jeu d'entrées tiré avec une graine fixe (hauteurs, girons, trémies, espaces,
+nombres imposés ou automatiques) est calculé par les deux chemins ; chaque
+ligne doit donner exactement les mêmes nombres, le même masque et la même
+conformité.
+
+Usage :
+    python -m core.equivalence
+    python -m core.equivalence --taille 20000 --graine 7
+
+Le code de sortie vaut 0 si les deux moteurs concordent, 1 sinon.
+"""
+
+import argparse
+import math
+import random
+import sys
+
+from core.calculations import calculer_escalier_ajuste
+from core.incremental import MoteurIncremental
+from core.vectorized import calculer_escalier_vectorise
+
+GRAINE = 20240611
+TAILLE_JEU = 5000
+
+# Colonne du moteur vectorisé → champ du StairResult
+COLONNES_COMPAREES = (
+    "hauteur_reelle_contremarche",
+    "nombre_contremarches",
+    "nombre_girons",
+    "longueur_calculee_escalier",
+    "angle_escalier",
+    "longueur_limon_approximative",
+    "blondel_value",
+    "min_echappee_calculee",
+    "ecart_hauteur",
+    "masque",
+    "is_conform",
+)
+
+
+def jeu_entrees(taille=TAILLE_JEU, graine=GRAINE):
+    """Lignes d'entrée (dictionnaires en pouces) tirées avec une graine fixe."""
+    alea = random.Random(graine)
+    lignes = []
+    for _ in range(taille):
+        hauteur = round(alea.uniform(24, 220) * 16) / 16
+        lignes.append({
+            "hauteur_totale": hauteur,
+            "giron": round(alea.uniform(7.5, 12.5) * 16) / 16,
+            "hauteur_cm_souhaitee": alea.choice((0.0, 0.0, round(alea.uniform(6, 8) * 16) / 16)),
+            # 0 : nombre automatique (solveur)
+            "nombre_contremarches": alea.choice((0, 0, 0, max(2, round(hauteur / alea.uniform(6, 8))))),
+            "epaisseur_plancher_sup": alea.choice((0.0, round(alea.uniform(8, 14) * 16) / 16)),
+            "profondeur_tremie": alea.choice((0.0, round(alea.uniform(30, 140) * 16) / 16)),
+            "position_tremie": alea.choice((0.0, round(alea.uniform(0, 60) * 16) / 16)),
+            "espace_disponible": alea.choice((0.0, round(alea.uniform(60, 260) * 16) / 16)),
+        })
+    return lignes
+
+
+def _identiques(a, b):
+    if isinstance(a, float) or isinstance(b, float):
+        a = math.nan if a is None else float(a)
+        b = math.nan if b is None else float(b)
+        return a == b or (math.isnan(a) and math.isnan(b))
+    return a == b
+
+
+def comparer(lignes, preferences=None):
+    """Liste des écarts (ligne, colonne, valeur scalaire, valeur vectorisée) ; vide si tout concorde."""
+    preferences = preferences or {"default_tread_thickness": "1 1/16"}
+    colonnes = {cle: [ligne[cle] for ligne in lignes] for cle in lignes[0]} if lignes else {}
+    vectorise = calculer_escalier_vectorise(**colonnes)
+
+    moteur = MoteurIncremental()
+    ecarts = []
+    for i, ligne in enumerate(lignes):
+        resultat = calculer_escalier_ajuste(
+            repr(ligne["hauteur_totale"]),
+            repr(ligne["giron"]),
+            repr(ligne["hauteur_cm_souhaitee"]),
+            "",
+            str(ligne["nombre_contremarches"]) if ligne["nombre_contremarches"] > 0 else "",
+            repr(ligne["epaisseur_plancher_sup"]),
+            "0",
+            repr(ligne["profondeur_tremie"]),
+            repr(ligne["position_tremie"]),
+            repr(ligne["espace_disponible"]),
+            preferences,
+            moteur=moteur,
+        )
+        for colonne in COLONNES_COMPAREES:
+            scalaire = getattr(resultat, colonne)
+            valeur = vectorise[colonne][i].item()
+            if not _identiques(scalaire, valeur):
+                ecarts.append((i, colonne, scalaire, valeur))
+    return ecarts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m core.equivalence",
+        description="Vérifie que les moteurs par étapes et vectorisé donnent les mêmes résultats.",
+    )
+    parser.add_argument("--taille", type=int, default=TAILLE_JEU, help="nombre de lignes tirées")
+    parser.add_argument("--graine", type=int, default=GRAINE, help="graine du tirage")
+    args = parser.parse_args(argv)
+
+    lignes = jeu_entrees(max(1, args.taille), args.graine)
+    ecarts = comparer(lignes)
+    for i, colonne, scalaire, valeur in ecarts[:20]:
+        print(f"ÉCART ligne {i} {colonne} : par étapes {scalaire!r}, vectorisé {valeur!r} ({lignes[i]})", file=sys.stderr)
+    if ecarts:
+        print(f"ÉCHEC : {len(ecarts)} écarts sur {len(lignes)} lignes", file=sys.stderr)
+        return 1
+    print(f"{len(lignes)} lignes identiques (graine {args.graine})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+# Fichier: core/export_pdf.py
+
+"""
+Rapport PDF d'un escalier : plan de traçage, tableau des paramètres, tableau
+des marches et élévation, écrit par core.pdf (aucune dépendance, hors ligne).
+
+Les textes sont ceux des onglets de l'interface (core.reporting) en police à
+chasse fixe ; l'élévation reprend les primitives de core.geometrie. En lot,
+les travaux sont regroupés en paquets répartis sur un pool de processus et
+chaque processus écrit directement ses fichiers : un PDF par travail.
+
+Usage :
+    python -m core.export_pdf travaux.csv --dossier rapports --workers 4
+
+    exporter_pdf(resultat, preferences, "escalier.pdf")
+"""
+
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from core import constants, reporting
+from core.batch import TAILLE_PAQUET, _format_fichier, _paquets, calculer_travail, lire_travaux
+from core.export_vectoriel import NomsFichiers
+from core.geometrie import elevation
+from core.pdf import CHASSE_MONO, DocumentPDF
+from core.preferences import PREFERENCES
+
+MARGE_PAGE = 36.0  # points
+TAILLE_TEXTE = 9.0
+INTERLIGNE = 10.5
+TAILLE_TITRE = 13.0
+
+# Style PDF de chaque famille de primitives (mêmes couleurs que l'aperçu et le SVG)
+STYLES_PDF = {
+    "planchers": {"remplissage": "#c5ccd6", "contour": None},
+    "tremie": {"contour": "#274472", "epaisseur": 0.75, "tirets": (4, 3)},
+    "limon": {"remplissage": "#e8dcc4", "contour": "#8a6d3b", "epaisseur": 0.75},
+    "marches": {"couleur": "#274472", "epaisseur": 1.2},
+    "echappee": {"couleur": "#c27c1f", "epaisseur": 0.9, "tirets": (8, 5)},
+}
+
+
+def textes_rapport(resultat, preferences):
+    """(plan de traçage, tableaux des paramètres et des marches) du StairResult."""
+    params = reporting.generer_tableau_parametres(resultat, preferences)
+    marches = reporting.generer_tableau_marches(resultat, preferences)
+    return reporting.generer_texte_trace(resultat, preferences), f"{params}\n\n{marches}"
+
+
+def _lignes_coupees(texte, largeur):
+    for ligne in texte.splitlines():
+        ligne = ligne.rstrip()
+        while len(ligne) > largeur:
+            yield ligne[:largeur]
+            ligne = "  " + ligne[largeur:]
+        yield ligne
+
+
+def _pages_texte(document, titre, texte):
+    """Écrit `texte` en police à chasse fixe, sur autant de pages que nécessaire."""
+    largeur = int((document.largeur - 2 * MARGE_PAGE) / (CHASSE_MONO * TAILLE_TEXTE))
+    haut = document.hauteur - MARGE_PAGE - TAILLE_TITRE
+    par_page = int((haut - MARGE_PAGE - 2 * INTERLIGNE) / INTERLIGNE)
+    lignes = list(_lignes_coupees(texte, largeur))
+    nombre_pages = max(1, -(-len(lignes) // par_page))
+    for numero in range(nombre_pages):
+        with document.page() as page:
+            suite = f" (suite {numero + 1}/{nombre_pages})" if numero else ""
+            page.texte(MARGE_PAGE, haut, titre + suite, TAILLE_TITRE, "titre")
+            page.bloc_texte(MARGE_PAGE, haut - 2 * INTERLIGNE, lignes[numero * par_page:(numero + 1) * par_page],
+                            TAILLE_TEXTE, INTERLIGNE)
+
+
+def _page_elevation(document, elev):
+    """Élévation mise à l'échelle dans la page (y vers le haut, comme en PDF)."""
+    e = elev.etendue
+    haut = document.hauteur - MARGE_PAGE - TAILLE_TITRE
+    largeur_utile = document.largeur - 2 * MARGE_PAGE
+    hauteur_utile = haut - MARGE_PAGE - 2 * INTERLIGNE
+    echelle = min(largeur_utile / max(e.x2 - e.x1, 1e-6), hauteur_utile / max(e.y2 - e.y1, 1e-6))
+    x0 = MARGE_PAGE + (largeur_utile - (e.x2 - e.x1) * echelle) / 2
+    y0 = MARGE_PAGE + (hauteur_utile - (e.y2 - e.y1) * echelle) / 2
+
+    def point(x, y):
+        return x0 + (x - e.x1) * echelle, y0 + (y - e.y1) * echelle
+
+    def rectangle(page, r, style):
+        (x1, y1), (x2, y2) = point(r.x1, r.y1), point(r.x2, r.y2)
+        page.rectangle(x1, y1, x2 - x1, y2 - y1, **style)
+
+    with document.page() as page:
+        page.texte(MARGE_PAGE, haut, f"Élévation — {elev.titre}", TAILLE_TITRE, "titre")
+        page.texte(
+            MARGE_PAGE, haut - 1.5 * INTERLIGNE,
+            f"Échelle 1:{round(72 / echelle)} (cotes en pouces, voir le plan de traçage)", TAILLE_TEXTE - 1,
+        )
+        for r in filter(None, (elev.plancher_inf, *elev.plancher_sup)):
+            rectangle(page, r, STYLES_PDF["planchers"])
+        if elev.tremie:
+            rectangle(page, elev.tremie, STYLES_PDF["tremie"])
+        if elev.limon:
+            page.polygone([point(x, y) for x, y in elev.limon], **STYLES_PDF["limon"])
+        for t in (*elev.contremarches, *elev.girons):
+            page.ligne(*point(t.x1, t.y1), *point(t.x2, t.y2), **STYLES_PDF["marches"])
+        if elev.echappee:
+            t = elev.echappee
+            page.ligne(*point(t.x1, t.y1), *point(t.x2, t.y2), **STYLES_PDF["echappee"])
+
+
+def ecrire_pdf(resultat, preferences, flux, textes=None, format_page="letter"):
+    """
+    Écrit le rapport PDF dans `flux` (fichier binaire). `textes` : (plan,
+    tableaux) déjà générés, par exemple ceux affichés par l'interface.
+    """
+    plan, tableaux = textes or textes_rapport(resultat, preferences)
+    titre = f"Calculateur d'Escalier Pro v{constants.VERSION_PROGRAMME}"
+    with DocumentPDF(flux, format_page, titre=f"{titre} — rapport") as document:
+        _pages_texte(document, f"{titre} — Plan de traçage", plan)
+        _pages_texte(document, f"{titre} — Paramètres et marches", tableaux)
+        elev = elevation(resultat)
+        if elev is not None:
+            _page_elevation(document, elev)
+
+
+def exporter_pdf(resultat, preferences, chemin, textes=None, format_page="letter"):
+    """
+    Écrit le rapport PDF du StairResult dans `chemin`. Retourne False (rien
+    n'est écrit) si le résultat ne permet pas de produire un rapport.
+    """
+    if not (resultat and resultat.nombre_girons is not None):
+        return False
+    with open(chemin, "wb") as f:
+        ecrire_pdf(resultat, preferences, f, textes, format_page)
+    return True
+
+
+def _rendre_paquet(paquet, preferences, unite, dossier, format_page):
+    """Calcule et écrit le PDF de chaque (nom de fichier, travail) du paquet ; retourne (écrits, ignorés)."""
+    ecrits = 0
+    for nom, travail in paquet:
+        if nom is None:
+            continue
+        chemin = os.path.join(dossier, f"{nom}.pdf")
+        ecrits += exporter_pdf(calculer_travail(travail, preferences, unite), preferences, chemin, format_page=format_page)
+    return ecrits, len(paquet) - ecrits
+
+
+def executer_rendu(travaux, dossier, preferences, unite="Pouces", workers=1, taille_paquet=TAILLE_PAQUET,
+                   format_page="letter", noms=None):
+    """
+    Écrit un PDF par travail dans `dossier`. Avec workers > 1, au plus
+    2 × workers paquets sont en vol à la fois, comme core.batch. Les noms de
+    fichier sont attribués ici par `noms` (un NomsFichiers neuf par défaut),
+    dans l'ordre d'entrée, avant la répartition entre processus.
+
+    Retourne (nombre de PDF écrits, nombre de travaux ignorés).
+    """
+    ecrits = ignores = 0
+    noms = noms or NomsFichiers()
+    paquets = _paquets(
+        ((None if "__erreur__" in travail else noms.nom(travail, numero), travail)
+         for numero, travail in enumerate(travaux, start=1)),
+        taille_paquet,
+    )
+
+    def consigner(compte):
+        nonlocal ecrits, ignores
+        ecrits += compte[0]
+        ignores += compte[1]
+
+    if workers <= 1:
+        for paquet in paquets:
+            consigner(_rendre_paquet(paquet, preferences, unite, dossier, format_page))
+        return ecrits, ignores
+
+    with ProcessPoolExecutor(max_workers=workers) as executeur:
+        en_vol = deque()
+        for paquet in paquets:
+            en_vol.append(executeur.submit(_rendre_paquet, paquet, preferences, unite, dossier, format_page))
+            if len(en_vol) >= 2 * workers:
+                consigner(en_vol.popleft().result())
+        while en_vol:
+            consigner(en_vol.popleft().result())
+    return ecrits, ignores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m core.export_pdf",
+        description="Écrit le rapport PDF de chaque travail d'un fichier (CSV ou JSONL).",
+    )
+    parser.add_argument("entree", help="Fichier de travaux (.csv ou .jsonl), '-' pour l'entrée standard")
+    parser.add_argument("--dossier", default="rapports", help="Dossier de sortie (défaut : rapports)")
+    parser.add_argument("--format-entree", choices=("csv", "jsonl"), help="Format d'entrée (défaut : d'après l'extension)")
+    parser.add_argument("--unite", choices=("Pouces", "Centimètres"), default="Pouces",
+                        help="Unité des valeurs sans colonne 'unite' (défaut : Pouces)")
+    parser.add_argument("--page", choices=("letter", "a4"), default="letter", help="Format de page (défaut : letter)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Nombre de processus de rendu (défaut : nombre de processeurs)")
+    parser.add_argument("--taille-paquet", type=int, default=64, help="Travaux par paquet envoyé à un processus")
+    args = parser.parse_args(argv)
+
+    preferences = PREFERENCES.instantane()
+    noms = NomsFichiers()
+    os.makedirs(args.dossier, exist_ok=True)
+    format_entree = _format_fichier(args.entree, args.format_entree) if args.entree != "-" else (args.format_entree or "csv")
+    flux_entree = sys.stdin if args.entree == "-" else open(args.entree, "r", encoding="utf-8-sig", newline="")
+    try:
+        ecrits, ignores = executer_rendu(
+            lire_travaux(flux_entree, format_entree),
+            args.dossier,
+            preferences,
+            unite=args.unite,
+            workers=max(args.workers, 1),
+            taille_paquet=max(args.taille_paquet, 1),
+            format_page=args.page,
+            noms=noms,
+        )
+    finally:
+        if flux_entree is not sys.stdin:
+            flux_entree.close()
+    print(f"{ecrits} rapports PDF écrits dans {args.dossier}, {ignores} travaux sans rapport.", file=sys.stderr)
+    if noms.renommes:
+        print(f"{noms.renommes} noms de fichier déjà pris : numéro de ligne ajouté.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+# Fichier: core/export_vectoriel.py
+
+"""
+Export de l'élévation d'un escalier en SVG et en DXF, sans Tk.
+
+Les primitives viennent de core.geometrie (les mêmes que l'aperçu Tk) et sont
+écrites au fil de l'eau dans un flux texte : aucun document complet n'est
+construit en mémoire. En lot, chaque travail est lu, calculé, dessiné puis
+écrit dans son propre fichier avant de passer au suivant.
+
+Usage :
+    python -m core.export_vectoriel travaux.csv --dossier dessins
+    python -m core.export_vectoriel travaux.jsonl --dossier dessins --format dxf --format svg
+
+    with open("escalier.svg", "w", encoding="utf-8") as f:
+        ecrire_svg(elevation(resultat), f)
+"""
+
+import argparse
+import os
+import re
+import sys
+from xml.sax.saxutils import escape
+
+from core.batch import _format_fichier, calculer_travail, lire_travaux
+from core.geometrie import elevation
+from core.preferences import PREFERENCES
+
+FORMATS = ("svg", "dxf")
+# Taille d'affichage du SVG (les coordonnées restent en pouces dans le viewBox)
+PIXELS_PAR_POUCE = 4
+MARGE_DESSIN = 6.0  # pouces autour de l'étendue
+HAUTEUR_TEXTE = 3.0  # pouces
+
+# Style de chaque famille de primitives : couche DXF, couleur DXF (ACI) et style SVG
+STYLES = {
+    "planchers": ("PLANCHERS", 8, 'fill="#c5ccd6" stroke="none"'),
+    "tremie": ("TREMIE", 1, 'fill="none" stroke="#274472" stroke-width="0.25" stroke-dasharray="2 2"'),
+    "limon": ("LIMON", 3, 'fill="#e8dcc4" stroke="#8a6d3b" stroke-width="0.25"'),
+    "marches": ("MARCHES", 5, 'fill="none" stroke="#274472" stroke-width="0.4" stroke-linecap="round"'),
+    "echappee": ("ECHAPPEE", 2, 'fill="none" stroke="#c27c1f" stroke-width="0.3" stroke-dasharray="6 4"'),
+    "titre": ("TEXTE", 7, 'fill="#1f2933" font-family="Arial" font-weight="bold"'),
+}
+
+
+def _f(valeur):
+    return f"{valeur:.4f}".rstrip("0").rstrip(".")
+
+
+# --- SVG ---
+
+def ecrire_svg(elev, flux, pixels_par_pouce=PIXELS_PAR_POUCE):
+    """Écrit l'élévation en SVG dans `flux` (coordonnées en pouces, y vers le bas en sortie)."""
+    e = elev.etendue
+    x0, y0 = e.x1 - MARGE_DESSIN, e.y1 - MARGE_DESSIN
+    largeur, hauteur = e.x2 - e.x1 + 2 * MARGE_DESSIN, e.y2 - e.y1 + 2 * MARGE_DESSIN + 2 * HAUTEUR_TEXTE
+    haut = y0 + hauteur  # y (vers le haut) du bord supérieur du dessin
+
+    def y(valeur):
+        return _f(haut - valeur)
+
+    flux.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    flux.write(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_f(largeur * pixels_par_pouce)}" '
+        f'height="{_f(hauteur * pixels_par_pouce)}" viewBox="{_f(x0)} 0 {_f(largeur)} {_f(hauteur)}">\n'
+    )
+    flux.write(f"<title>{escape(elev.titre)}</title>\n")
+
+    flux.write(f'<g id="planchers" {STYLES["planchers"][2]}>\n')
+    for r in filter(None, (elev.plancher_inf, *elev.plancher_sup)):
+        flux.write(f'<rect x="{_f(r.x1)}" y="{y(r.y2)}" width="{_f(r.x2 - r.x1)}" height="{_f(r.y2 - r.y1)}"/>\n')
+    flux.write("</g>\n")
+    if elev.tremie:
+        r = elev.tremie
+        flux.write(
+            f'<rect id="tremie" {STYLES["tremie"][2]} x="{_f(r.x1)}" y="{y(r.y2)}" '
+            f'width="{_f(r.x2 - r.x1)}" height="{_f(r.y2 - r.y1)}"/>\n'
+        )
+    if elev.limon:
+        points = " ".join(f"{_f(px)},{y(py)}" for px, py in elev.limon)
+        flux.write(f'<polygon id="limon" {STYLES["limon"][2]} points="{points}"/>\n')
+
+    flux.write(f'<g id="marches" {STYLES["marches"][2]}>\n')
+    for t in (*elev.contremarches, *elev.girons):
+        flux.write(f'<line x1="{_f(t.x1)}" y1="{y(t.y1)}" x2="{_f(t.x2)}" y2="{y(t.y2)}"/>\n')
+    flux.write("</g>\n")
+    if elev.echappee:
+        t = elev.echappee
+        flux.write(f'<line id="echappee" {STYLES["echappee"][2]} x1="{_f(t.x1)}" y1="{y(t.y1)}" x2="{_f(t.x2)}" y2="{y(t.y2)}"/>\n')
+
+    flux.write(
+        f'<text {STYLES["titre"][2]} x="{_f(x0 + largeur / 2)}" y="{_f(1.5 * HAUTEUR_TEXTE)}" '
+        f'font-size="{_f(HAUTEUR_TEXTE)}" text-anchor="middle">{escape(elev.titre)}</text>\n'
+    )
+    flux.write("</svg>\n")
+
+
+# --- DXF (ASCII, R12 : lu par tous les logiciels de DAO) ---
+
+def _groupes(flux, *paires):
+    flux.write("".join(f"{code}\n{valeur}\n" for code, valeur in paires))
+
+
+def _ligne_dxf(flux, famille, x1, y1, x2, y2):
+    couche, couleur, _ = STYLES[famille]
+    _groupes(flux, (0, "LINE"), (8, couche), (62, couleur),
+             (10, _f(x1)), (20, _f(y1)), (30, 0), (11, _f(x2)), (21, _f(y2)), (31, 0))
+
+
+def _contour_dxf(flux, famille, points):
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        _ligne_dxf(flux, famille, x1, y1, x2, y2)
+
+
+def _rectangle_dxf(flux, famille, r):
+    _contour_dxf(flux, famille, [(r.x1, r.y1), (r.x2, r.y1), (r.x2, r.y2), (r.x1, r.y2)])
+
+
+def ecrire_dxf(elev, flux):
+    """Écrit l'élévation en DXF dans `flux` (unités : pouces, y vers le haut)."""
+    e = elev.etendue
+    _groupes(flux, (0, "SECTION"), (2, "HEADER"), (9, "$ACADVER"), (1, "AC1009"), (9, "$INSUNITS"), (70, 1),
+             (9, "$EXTMIN"), (10, _f(e.x1)), (20, _f(e.y1)), (9, "$EXTMAX"), (10, _f(e.x2)), (20, _f(e.y2)),
+             (0, "ENDSEC"), (0, "SECTION"), (2, "ENTITIES"))
+    for r in filter(None, (elev.plancher_inf, *elev.plancher_sup)):
+        _rectangle_dxf(flux, "planchers", r)
+    if elev.tremie:
+        _rectangle_dxf(flux, "tremie", elev.tremie)
+    if elev.limon:
+        _contour_dxf(flux, "limon", list(elev.limon))
+    for t in (*elev.contremarches, *elev.girons):
+        _ligne_dxf(flux, "marches", *t)
+    if elev.echappee:
+        _ligne_dxf(flux, "echappee", *elev.echappee)
+    couche, couleur, _ = STYLES["titre"]
+    _groupes(flux, (0, "TEXT"), (8, couche), (62, couleur), (10, _f(e.x1)), (20, _f(e.y2 + HAUTEUR_TEXTE)), (30, 0),
+             (40, _f(HAUTEUR_TEXTE)), (1, elev.titre))
+    _groupes(flux, (0, "ENDSEC"), (0, "EOF"))
+
+
+ECRIVAINS = {"svg": ecrire_svg, "dxf": ecrire_dxf}
+
+
+def exporter(resultat, chemin, format_sortie=None):
+    """
+    Écrit l'élévation du StairResult dans `chemin` (format d'après l'extension
+    si `format_sortie` n'est pas donné). Retourne False si le résultat ne
+    permet pas de dessiner (rien n'est écrit).
+    """
+    elev = elevation(resultat)
+    if elev is None:
+        return False
+    format_sortie = format_sortie or os.path.splitext(chemin)[1].lstrip(".").lower()
+    if format_sortie not in ECRIVAINS:
+        raise ValueError(f"Format inconnu : {format_sortie} (attendu : {', '.join(FORMATS)})")
+    with open(chemin, "w", encoding="utf-8", newline="\n") as f:
+        ECRIVAINS[format_sortie](elev, f)
+    return True
+
+
+def _nom_fichier(travail, numero):
+    ident = re.sub(r"[^\w.-]+", "_", str(travail.get("id") or "")).strip("._")
+    return ident or f"travail_{numero:05d}"
+
+
+class NomsFichiers:
+    """
+    Noms de fichiers des travaux d'un lot : l'id nettoyé, suffixé du numéro de
+    ligne quand il est déjà pris ("A/1" et "A 1", ids répétés, casse seule
+    différente comme sous Windows) pour qu'aucun travail n'écrase le fichier
+    d'un autre.
+    """
+
+    def __init__(self):
+        self._pris = set()
+        self.renommes = 0
+
+    def nom(self, travail, numero):
+        base = nom = _nom_fichier(travail, numero)
+        suffixe = 1
+        while nom.casefold() in self._pris:
+            nom = f"{base}_{numero:05d}" if suffixe == 1 else f"{base}_{numero:05d}_{suffixe}"
+            suffixe += 1
+        if nom != base:
+            self.renommes += 1
+        self._pris.add(nom.casefold())
+        return nom
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m core.export_vectoriel",
+        description="Dessine l'élévation de chaque travail d'un fichier (CSV ou JSONL) en SVG et/ou DXF.",
+    )
+    parser.add_argument("entree", help="Fichier de travaux (.csv ou .jsonl), '-' pour l'entrée standard")
+    parser.add_argument("--dossier", default="dessins", help="Dossier de sortie (défaut : dessins)")
+    parser.add_argument("--format", dest="formats", action="append", choices=FORMATS,
+                        help="Format de sortie, répétable (défaut : svg)")
+    parser.add_argument("--format-entree", choices=("csv", "jsonl"), help="Format d'entrée (défaut : d'après l'extension)")
+    parser.add_argument("--unite", choices=("Pouces", "Centimètres"), default="Pouces",
+                        help="Unité des valeurs sans colonne 'unite' (défaut : Pouces)")
+    args = parser.parse_args(argv)
+
+    formats = args.formats or ["svg"]
+    preferences = PREFERENCES.instantane()
+    os.makedirs(args.dossier, exist_ok=True)
+    format_entree = _format_fichier(args.entree, args.format_entree) if args.entree != "-" else (args.format_entree or "csv")
+    flux_entree = sys.stdin if args.entree == "-" else open(args.entree, "r", encoding="utf-8-sig", newline="")
+    dessines = ignores = 0
+    noms = NomsFichiers()
+    try:
+        for numero, travail in enumerate(lire_travaux(flux_entree, format_entree), start=1):
+            elev = None if "__erreur__" in travail else elevation(calculer_travail(travail, preferences, args.unite))
+            if elev is None:
+                ignores += 1
+                continue
+            nom = noms.nom(travail, numero)
+            for format_sortie in formats:
+                with open(os.path.join(args.dossier, f"{nom}.{format_sortie}"), "w", encoding="utf-8", newline="\n") as f:
+                    ECRIVAINS[format_sortie](elev, f)
+            dessines += 1
+    finally:
+        if flux_entree is not sys.stdin:
+            flux_entree.close()
+    print(f"{dessines} élévations écrites dans {args.dossier}, {ignores} travaux sans dessin.", file=sys.stderr)
+    if noms.renommes:
+        print(f"{noms.renommes} noms de fichier déjà pris : numéro de ligne ajouté.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,111 @@
 # core/formatting.py
-from fractions import Fraction
+import math
+import re
+from functools import lru_cache
 
-def parser_fraction(value: str) -> float:
+from core.preferences import CLES_FORMATAGE, PREFERENCES
+
+# Nombre maximal de chaînes formatées gardées en cache (éviction LRU)
+TAILLE_CACHE_FRACTIONS = 4096
+
+# Les 64 soixante-quatrièmes, réduits : SOIXANTE_QUATRIEMES[k] == "k/64" simplifié.
+# Un numérateur n sur un dénominateur d (puissance de 2 ≤ 64) se lit à l'indice n * 64 // d.
+SOIXANTE_QUATRIEMES = tuple(
+    f"{k // math.gcd(k, 64)}/{64 // math.gcd(k, 64)}" if k else "0/1" for k in range(64)
+)
+
+
+def fraction_reduite(numerateur, denominateur):
+    """Chaîne 'n/d' réduite pour 0 ≤ n < d, d puissance de 2 ≤ 64 (lecture de table)."""
+    return SOIXANTE_QUATRIEMES[numerateur * 64 // denominateur]
+
+# Mesure impériale ou décimale : signe, entier/décimal (point ou virgule), puis
+# fraction optionnelle séparée par un espace ou un trait d'union ("7 1/4", "7-1/4"),
+# ou fraction seule ("3/4"). Guillemets et parenthèses sont retirés avant l'analyse.
+_NOMBRE = r"(?:\d+(?:[.,]\d*)?|[.,]\d+)(?:[eE][-+]?\d+)?"
+_MOTIF_MESURE = re.compile(
+    rf"""\s*(?P<signe>[-+])?\s*
+    (?:
+        (?P<entier>{_NOMBRE})
+        (?:(?:\s+|\s*-\s*)(?P<num>{_NOMBRE})\s*/\s*(?P<den>{_NOMBRE}))?
+      | (?P<num_seul>{_NOMBRE})\s*/\s*(?P<den_seul>{_NOMBRE})
+    )\s*""",
+    re.VERBOSE,
+)
+_CARACTERES_IGNORES = str.maketrans("", "", "\"'″”“()")
+
+# Nombre maximal de chaînes analysées gardées en cache (éviction LRU)
+TAILLE_CACHE_MESURES = 2048
+
+
+def _nombre(texte):
+    return float(texte.replace(",", "."))
+
+
+def _message_format_invalide(value):
+    return f"Format de valeur '{value}' invalide. Attendu: '10', '9.5', '9 1/4', '9-1/4' ou '1/2'."
+
+
+@lru_cache(maxsize=TAILLE_CACHE_MESURES)
+def _analyser_mesure(value):
+    correspondance = _MOTIF_MESURE.fullmatch(value.translate(_CARACTERES_IGNORES))
+    if correspondance is None:
+        raise ValueError(_message_format_invalide(value))
+    entier, num, den = correspondance.group("entier", "num", "den")
+    if entier is None:
+        entier, num, den = "0", correspondance.group("num_seul"), correspondance.group("den_seul")
+    total = _nombre(entier)
+    if num is not None:
+        denominateur = _nombre(den)
+        if denominateur == 0:
+            raise ValueError("Le dénominateur ne peut pas être zéro.")
+        total += _nombre(num) / denominateur
+    # Exposant démesuré ("1e400") : infini ou NaN, refusé comme une saisie invalide
+    if not math.isfinite(total):
+        raise ValueError(_message_format_invalide(value))
+    return -total if correspondance.group("signe") == "-" else total
+
+
+def parser_fraction(value) -> float:
     """
-    Convertit une chaîne de type '7 1/4' ou '2.5' en float (pouces).
+    Convertit une chaîne de type '7 1/4', '7-1/4', '-2 1/2', '2,5' ou '3/4"' en float (pouces).
+    Les nombres sont retournés tels quels ; une chaîne vide ou invalide, ou une
+    valeur infinie ou NaN ("1e400"), lève ValueError.
+    Les chaînes déjà analysées sont servies par un cache LRU.
     """
-    value = value.strip()
-    if " " in value:  # ex: "7 1/4"
-        whole, frac = value.split()
-        return float(whole) + float(Fraction(frac))
-    elif "/" in value:  # ex: "1/2"
-        return float(Fraction(value))
-    else:
-        return float(value)
+    if not isinstance(value, str):
+        try:
+            nombre = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Valeur '{value}' non numérique.") from None
+        if not math.isfinite(nombre):
+            raise ValueError(f"Valeur '{value}' non numérique.")
+        return nombre
+    return _analyser_mesure(value)
+
+
+def parser_fractions(valeurs, valeur_invalide=math.nan):
+    """
+    Analyse en bloc une colonne de mesures (import de fichiers) et retourne un
+    tableau NumPy de float64. Chaque chaîne distincte n'est analysée qu'une fois ;
+    les valeurs vides ou invalides valent `valeur_invalide`.
+    """
+    import numpy as np
+
+    deja_vues = {}
+    resultat = np.empty(len(valeurs), dtype=np.float64)
+    for index, valeur in enumerate(valeurs):
+        try:
+            resultat[index] = deja_vues[valeur]
+        except KeyError:
+            try:
+                nombre = parser_fraction(valeur)
+            except ValueError:
+                nombre = valeur_invalide
+            deja_vues[valeur] = resultat[index] = nombre
+        except TypeError:  # valeur non hachable
+            resultat[index] = valeur_invalide
+    return resultat
 
 def decimal_to_fraction_str(value: float, preferences=None) -> str:
     """
@@ -21,18 +114,104 @@ def decimal_to_fraction_str(value: float, preferences=None) -> str:
     """
     if value is None:
         return ""
+    return _format_seiziemes(value)
 
-    precision = 16
-    frac = Fraction(round(value * precision), precision)
-    is_negative = frac < 0
-    frac = abs(frac)
 
-    whole, remainder = divmod(frac.numerator, frac.denominator)
-    if whole and remainder:
-        result = f"{whole} {remainder}/{frac.denominator}"
+@lru_cache(maxsize=TAILLE_CACHE_FRACTIONS)
+def _format_seiziemes(value):
+    seiziemes = round(value * 16)
+    whole, numerateur = divmod(abs(seiziemes), 16)
+    if whole and numerateur:
+        result = f"{whole} {fraction_reduite(numerateur, 16)}"
     elif whole:
         result = str(whole)
     else:
-        result = f"{remainder}/{frac.denominator}"
+        result = fraction_reduite(numerateur, 16)
+    return f"-{result}" if seiziemes < 0 else result
+
 
-    return f"-{result}" if is_negative and result else result
+def vider_cache_fractions():
+    """Vide les caches de fractions formatées (core et utils) et de mesures analysées."""
+    _format_seiziemes.cache_clear()
+    _format_fraction_limite.cache_clear()
+    _analyser_mesure.cache_clear()
+
+
+# Changer la précision des fractions vide les chaînes déjà formatées
+PREFERENCES.abonner(lambda instantane, modifiees: vider_cache_fractions(), CLES_FORMATAGE)
+
+
+# --- Formatage à dénominateur limité (sémantique de utils.formatting) ---
+
+def _approximation_par_boucle(fraction_part_decimal, available_denominators):
+    """Recherche dénominateur par dénominateur (cas d'égalité entre deux graduations)."""
+    best_numerator = 0
+    best_denominator = 1
+    min_diff = fraction_part_decimal
+    for denominator in available_denominators:
+        numerator = round(fraction_part_decimal * denominator)
+        if numerator > denominator:
+            numerator = denominator
+        current_diff = abs(fraction_part_decimal - (numerator / denominator))
+        if current_diff < min_diff - 1e-9:
+            min_diff = current_diff
+            best_numerator = numerator
+            best_denominator = denominator
+            if min_diff < 1e-9:
+                break
+        elif abs(current_diff - min_diff) < 1e-9:
+            if denominator < best_denominator:
+                best_numerator = numerator
+                best_denominator = denominator
+    return best_numerator, best_denominator
+
+
+@lru_cache(maxsize=TAILLE_CACHE_FRACTIONS)
+def _format_fraction_limite(decimal_val, available_denominators):
+    """
+    Fraction au plus proche sur la graduation du plus grand dénominateur autorisé.
+
+    Les dénominateurs étant des puissances de 2 emboîtées, le meilleur
+    candidat est l'arrondi sur la graduation la plus fine ; seules les valeurs
+    (quasi) à mi-chemin de deux graduations repassent par la boucle d'origine,
+    qui départage en faveur du plus petit dénominateur.
+    """
+    if -0.0001 < decimal_val < 0.0001:
+        return "0"
+
+    whole = int(math.floor(abs(decimal_val)))
+    fraction_part_decimal = abs(decimal_val) - whole
+    if fraction_part_decimal == 0:
+        return str(int(decimal_val))
+
+    denominateur = available_denominators[-1]
+    demi_graduations = round(fraction_part_decimal * 2 * denominateur)
+    if demi_graduations % 2 and abs(fraction_part_decimal - demi_graduations / (2 * denominateur)) < 1e-8:
+        numerateur, denominateur = _approximation_par_boucle(fraction_part_decimal, available_denominators)
+    else:
+        numerateur = round(fraction_part_decimal * denominateur)
+
+    if numerateur == 0:
+        fraction_str = ""
+    elif numerateur == denominateur:
+        whole += 1
+        fraction_str = ""
+    else:
+        fraction_str = fraction_reduite(numerateur, denominateur)
+
+    if whole == 0:
+        if fraction_str:
+            return f"-{fraction_str}" if decimal_val < 0 else fraction_str
+        return "0"
+    if fraction_str:
+        return f"-{whole} {fraction_str}" if decimal_val < 0 else f"{whole} {fraction_str}"
+    return str(int(decimal_val))
+
+
+def decimal_to_fraction_str_limite(decimal_val, denominator_limit, allowed_denominators=(2, 4, 8, 16, 32, 64)):
+    """
+    Fraction impériale limitée aux dénominateurs autorisés ≤ denominator_limit
+    (16 si aucun ne convient). Résultat mis en cache par (valeur, dénominateurs).
+    """
+    available_denominators = tuple(d for d in sorted(allowed_denominators) if d <= denominator_limit) or (16,)
+    return _format_fraction_limite(decimal_val, available_denominators)
@@ -0,0 +1,123 @@
+# Fichier: core/geometrie.py
+
+"""
+Géométrie de l'élévation d'un escalier droit, sans aucune dépendance graphique.
+
+`elevation(resultat)` traduit un StairResult en primitives (traits, rectangles,
+polygone) exprimées en pouces, y vers le haut. L'origine est le pied de la
+première contremarche, sur le plancher inférieur fini ; le nez de la première
+marche (origine des positions de trémie) est donc en x = 0. Les mêmes
+primitives sont dessinées par l'aperçu Tk et écrites en SVG ou DXF par
+core.export_vectoriel.
+"""
+
+import math
+from typing import NamedTuple, Optional, Tuple
+
+from core import constants
+
+# Limon dessiné : largeur de la pièce (2 x 12 nominal) et débord au-dessus de la ligne de foulée
+LARGEUR_LIMON = 11.25
+DEBORD_LIMON = 1.5
+# Longueur de plancher dessinée de part et d'autre de l'escalier
+MARGE_PLANCHER = 12.0
+
+
+class Trait(NamedTuple):
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+
+
+class Rectangle(NamedTuple):
+    """Rectangle aligné sur les axes, x1 ≤ x2 et y1 ≤ y2."""
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+
+
+class Elevation(NamedTuple):
+    contremarches: Tuple[Trait, ...]
+    girons: Tuple[Trait, ...]
+    plancher_inf: Optional[Rectangle]
+    plancher_sup: Tuple[Rectangle, ...]      # une ou deux parties (interrompu par la trémie)
+    tremie: Optional[Rectangle]
+    echappee: Optional[Trait]                # ligne de foulée relevée de la hauteur libre minimale
+    limon: Tuple[Tuple[float, float], ...]   # contour fermé (vide si non dessinable)
+    etendue: Rectangle                       # boîte englobante de toutes les primitives
+    titre: str
+
+
+def elevation(res):
+    """Primitives de l'élévation du StairResult `res`, ou None si le résultat ne suffit pas à dessiner."""
+    giron = (res.giron_utilise or 0) if res else 0
+    h_cm = (res.hauteur_reelle_contremarche or 0) if res else 0
+    nombre_cm = (res.nombre_contremarches or 0) if res else 0
+    if nombre_cm <= 0 or giron <= 0 or h_cm <= 0:
+        return None
+    nombre_girons = res.nombre_girons if res.nombre_girons is not None else nombre_cm - 1
+    nombre_girons = min(max(nombre_girons, 0), nombre_cm - 1)
+
+    contremarches = tuple(
+        Trait(i * giron, i * h_cm, i * giron, (i + 1) * h_cm) for i in range(nombre_cm)
+    )
+    girons = tuple(
+        Trait(i * giron, (i + 1) * h_cm, (i + 1) * giron, (i + 1) * h_cm) for i in range(nombre_girons)
+    )
+    total_h = nombre_cm * h_cm
+    x_haut = (nombre_cm - 1) * giron  # face de la dernière contremarche, au bord du plancher supérieur
+
+    ep_sup = res.epaisseur_plancher_sup or 0.0
+    ep_inf = res.epaisseur_plancher_inf or 0.0
+    prof, pos = res.profondeur_tremie or 0.0, res.position_tremie or 0.0
+    gauche, droite = -giron - MARGE_PLANCHER, x_haut + MARGE_PLANCHER
+
+    plancher_inf = Rectangle(gauche, -ep_inf, droite, 0.0) if ep_inf > 0 else None
+    tremie = None
+    if ep_sup > 0 or prof > 0:
+        dessous = total_h - ep_sup
+        if prof > 0 and pos >= 0:
+            tremie = Rectangle(pos, dessous, pos + prof, total_h)
+            plancher_sup = (Rectangle(gauche, dessous, pos, total_h), Rectangle(pos + prof, dessous, max(droite, pos + prof), total_h))
+        else:
+            plancher_sup = (Rectangle(gauche, dessous, droite, total_h),)
+    else:
+        plancher_sup = ()
+
+    echappee = None
+    if prof > 0:
+        releve = constants.HAUTEUR_LIBRE_MIN_REGLEMENTAIRE
+        echappee = Trait(0.0, h_cm + releve, x_haut, total_h + releve)
+
+    limon = _limon(giron, h_cm, x_haut)
+
+    xs = [gauche, droite] + [x for x, _ in limon]
+    ys = [-ep_inf, total_h] + [y for _, y in limon]
+    if echappee:
+        ys.append(echappee.y2)
+    if tremie:
+        xs.append(tremie.x2)
+    etendue = Rectangle(min(xs), min(ys), max(xs), max(ys))
+    return Elevation(
+        contremarches, girons, plancher_inf, plancher_sup, tremie, echappee, limon, etendue,
+        f"Escalier: {nombre_girons} marches",
+    )
+
+
+def _limon(giron, h_cm, x_haut):
+    """
+    Contour du limon : bande de LARGEUR_LIMON parallèle à la ligne de foulée,
+    débordant de DEBORD_LIMON au-dessus des nez, coupée de niveau sur le
+    plancher inférieur et d'aplomb contre le plancher supérieur.
+    """
+    pente = h_cm / giron
+    secante = math.hypot(h_cm, giron) / giron  # décalage perpendiculaire → décalage vertical
+    haut = h_cm + DEBORD_LIMON * secante        # ligne haute en x = 0
+    bas = haut - LARGEUR_LIMON * secante        # ligne basse en x = 0
+    x_pied_haut, x_pied_bas = -haut / pente, -bas / pente
+    y_tete_haut, y_tete_bas = haut + pente * x_haut, bas + pente * x_haut
+    if y_tete_bas <= 0:
+        return ()
+    return ((x_pied_haut, 0.0), (x_pied_bas, 0.0), (x_haut, y_tete_bas), (x_haut, y_tete_haut))
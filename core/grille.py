@@ -0,0 +1,110 @@
+# Fichier: core/grille.py
+
+"""
+Repères de traçage cumulés sur une grille entière.
+
+Additionner une hauteur de contremarche flottante puis arrondir chaque ligne
+fait dériver les repères : le dernier ne tombe pas sur la hauteur mesurée.
+Ici, chaque total (hauteur totale, course totale, hypoténuse totale) est
+arrondi une seule fois sur la grille (1/64 po ou 0,1 mm), puis réparti entre
+les contremarches à la manière de Bresenham : les pas diffèrent d'au plus une
+graduation, chaque repère est un entier exact et le dernier vaut le total.
+
+    reperes = disposition(resultat)                                       # 1/64 po
+    reperes_mm = disposition(resultat, constants.DIXIEMES_MM_PAR_POUCE)   # 0,1 mm
+    texte_pouces(reperes[-1].hauteur), texte_mm(reperes_mm[-1].hauteur)
+"""
+
+import math
+from functools import lru_cache
+from typing import NamedTuple
+
+from core import constants
+from core.formatting import TAILLE_CACHE_FRACTIONS, fraction_reduite
+
+
+class Repere(NamedTuple):
+    """Repères cumulés jusqu'à la contremarche `numero`, en graduations de la grille."""
+    numero: int
+    hauteur: int     # perche d'étage : dessus de la contremarche depuis le plancher inférieur
+    course: int      # limon : girons parcourus après cette contremarche
+    hypotenuse: int  # longueur cumulée sur la ligne de foulée
+
+
+def vers_grille(valeur_pouces, graduations=constants.GRADUATIONS_POUCE):
+    """Valeur en pouces → nombre entier de graduations (1/64 po par défaut, 254 pour 0,1 mm)."""
+    return round(valeur_pouces * graduations)
+
+
+def repartir(total, parts):
+    """
+    Repères cumulés 1..parts d'un `total` entier réparti en `parts` pas entiers
+    (Bresenham) : chaque repère est l'arrondi de k × total / parts et le dernier
+    vaut exactement `total`.
+    """
+    pas, reste = divmod(total, parts)
+    cumul = erreur = 0
+    for _ in range(parts):
+        cumul += pas
+        erreur += reste
+        if 2 * erreur >= parts:
+            cumul += 1
+            erreur -= parts
+        yield cumul
+
+
+def milieux(total, parts):
+    """
+    Repères au milieu de chacun des `parts` pas : les rangs impairs de
+    repartir(total, 2 × parts), calculés directement (même arrondi).
+    """
+    return [((4 * rang + 2) * total + 2 * parts) // (4 * parts) for rang in range(parts)]
+
+
+def disposition(resultat, graduations=constants.GRADUATIONS_POUCE):
+    """
+    Perche d'étage, repères de limon et hypoténuses cumulées d'un StairResult,
+    en une passe entière : liste de Repere (une par contremarche, vide si les
+    données manquent).
+    """
+    nombre_cm = resultat.nombre_contremarches or 0
+    h_reel = resultat.hauteur_reelle_contremarche or 0
+    giron = resultat.giron_utilise or 0
+    if nombre_cm <= 0 or h_reel <= 0 or giron <= 0:
+        return []
+    nombre_girons = resultat.nombre_girons
+    if nombre_girons is None:
+        nombre_girons = nombre_cm - 1
+    nombre_girons = min(max(nombre_girons, 0), nombre_cm)
+    hauteur_totale = resultat.hauteur_totale_escalier or h_reel * nombre_cm
+
+    course_totale = vers_grille(giron * nombre_girons, graduations)
+    courses = list(repartir(course_totale, nombre_girons)) if nombre_girons else []
+    # La dernière contremarche arrive au plancher : pas de giron après elle
+    courses += [course_totale] * (nombre_cm - nombre_girons)
+    return list(map(
+        Repere,
+        range(1, nombre_cm + 1),
+        repartir(vers_grille(hauteur_totale, graduations), nombre_cm),
+        courses,
+        repartir(vers_grille(math.hypot(h_reel, giron) * nombre_cm, graduations), nombre_cm),
+    ))
+
+
+@lru_cache(maxsize=TAILLE_CACHE_FRACTIONS)
+def texte_pouces(valeur, graduations=constants.GRADUATIONS_POUCE):
+    """Graduations (puissance de 2 ≤ 64 par pouce) → fraction réduite, ex. 6913 → '108 1/64'."""
+    signe = "-" if valeur < 0 else ""
+    entier, reste = divmod(abs(valeur), graduations)
+    if not reste:
+        return f"{signe}{entier}"
+    fraction = fraction_reduite(reste, graduations)
+    return f"{signe}{entier} {fraction}" if entier else f"{signe}{fraction}"
+
+
+@lru_cache(maxsize=TAILLE_CACHE_FRACTIONS)
+def texte_mm(dixiemes):
+    """Dixièmes de millimètre → texte, ex. 27432 → '2743.2'."""
+    signe = "-" if dixiemes < 0 else ""
+    entier, reste = divmod(abs(dixiemes), 10)
+    return f"{signe}{entier}.{reste}"
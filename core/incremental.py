@@ -0,0 +1,322 @@
+# Fichier: core/incremental.py
+
+"""
+Moteur de calcul par étapes, avec cache, pour le calcul interactif d'un escalier.
+
+Le calcul est découpé en étapes aux entrées et sorties explicites (ETAPES) :
+parsing, nombre de contremarches, hauteur de CM, giron, géométrie, Blondel,
+échappée, longueur disponible et angle. Chaque étape garde ses dernières
+entrées et sorties : quand un seul champ change, seules les étapes dont une
+entrée a réellement changé sont réexécutées, les autres sont réutilisées.
+
+Les étapes s'appuient sur les fonctions de `core.vectorized` appliquées à des
+colonnes d'une ligne, ce qui donne exactement les mêmes valeurs que le calcul
+par lot (les opérations NumPy sur scalaires peuvent différer au dernier bit).
+"""
+
+import math
+from collections import Counter
+from time import perf_counter
+from typing import Callable, NamedTuple, Tuple, Union
+
+import numpy as np
+
+from core import constants
+from core import vectorized
+from core.formatting import parser_fraction
+from core.instrumentation import CHRONO
+from core.results import StairResult
+from core.stair_logic import HAUTEUR_TOTALE_MAX, resoudre_escalier
+
+# Argument de calculer_escalier_ajuste → valeur parsée, dans l'ordre de parsing
+CHAMPS_ENTREE = {
+    "hauteur_totale_escalier_str": "hauteur_totale",
+    "giron_souhaite_str": "giron",
+    "hauteur_cm_souhaitee_str": "hauteur_cm_souhaitee",
+    "epaisseur_plancher_sup_str": "epaisseur_plancher_sup",
+    "epaisseur_plancher_inf_str": "epaisseur_plancher_inf",
+    "profondeur_tremie_ouverture_str": "profondeur_tremie",
+    "position_tremie_ouverture_str": "position_tremie",
+    "espace_disponible_str": "espace_disponible",
+    "nombre_marches_manuel_str": "nombre_marches_manuel",
+    "nombre_cm_manuel_str": "nombre_cm_manuel",
+}
+
+# Champs facultatifs : une chaîne vide vaut 0
+_CHAMPS_FACULTATIFS = ("profondeur_tremie", "position_tremie", "espace_disponible")
+_CHAMPS_ENTIERS = ("nombre_marches_manuel", "nombre_cm_manuel")
+
+# Variable Tk de l'interface → valeur parsée correspondante
+VARIABLES_INTERFACE = {
+    "hauteur_totale_var": "hauteur_totale",
+    "giron_souhaite_var": "giron",
+    "hauteur_cm_souhaitee_var": "hauteur_cm_souhaitee",
+    "epaisseur_plancher_sup_var": "epaisseur_plancher_sup",
+    "epaisseur_plancher_inf_var": "epaisseur_plancher_inf",
+    "profondeur_tremie_ouverture_var": "profondeur_tremie",
+    "position_tremie_var": "position_tremie",
+    "espace_disponible_var": "espace_disponible",
+    "nombre_marches_manuel_var": "nombre_marches_manuel",
+    "nombre_cm_manuel_var": "nombre_cm_manuel",
+}
+
+
+def parser_champ(champ, brut, unite="Pouces"):
+    """
+    Valeur d'un champ saisi, en pouces (ou entier pour les nombres imposés,
+    None s'ils sont vides). Lève ValueError si la chaîne est invalide.
+    """
+    if champ in _CHAMPS_ENTIERS:
+        return int(brut) if brut.strip() else None
+    if champ in _CHAMPS_FACULTATIFS and not brut.strip():
+        return 0.0
+    valeur = parser_fraction(brut)
+    if unite == "Centimètres":
+        valeur = valeur / constants.POUCE_EN_CM
+    return valeur
+
+
+def parser_entrees(entrees, preferences, unite="Pouces"):
+    """
+    Valeurs parsées (en pouces) de toutes les entrées de calculer_escalier_ajuste,
+    épaisseur de marche des préférences comprise. Lève ValueError au premier champ invalide.
+    """
+    valeurs = {champ: parser_champ(champ, entrees[argument], unite) for argument, champ in CHAMPS_ENTREE.items()}
+    valeurs["epaisseur_marche"] = parser_champ(
+        "epaisseur_marche", preferences.get("default_tread_thickness", "1 1/16"), unite
+    )
+    return valeurs
+
+
+class Etape(NamedTuple):
+    """Étape du calcul : noms des valeurs lues et produites, et fonction de calcul."""
+    nom: str
+    entrees: Union[Tuple[str, ...], Callable]
+    sorties: Tuple[str, ...]
+    fonction: Callable
+
+
+def _ligne(*valeurs):
+    """Colonnes float64 d'une seule ligne, pour appeler les fonctions de `core.vectorized`."""
+    return [np.array([valeur], dtype=np.float64) for valeur in valeurs]
+
+
+def _entrees_contremarches(valeurs):
+    # Un nombre manuel court-circuite le solveur : l'espace et la trémie n'interviennent plus
+    if valeurs["nombre_cm_manuel"] is not None or valeurs["nombre_marches_manuel"] is not None:
+        return ("nombre_cm_manuel", "nombre_marches_manuel")
+    return (
+        "nombre_cm_manuel", "nombre_marches_manuel", "hauteur_totale", "giron", "hauteur_cm_souhaitee",
+        "espace_disponible", "profondeur_tremie", "position_tremie", "epaisseur_plancher_sup",
+    )
+
+
+def _contremarches(nombre_cm_manuel, nombre_marches_manuel, hauteur_totale=None, giron=None,
+                   hauteur_cm_souhaitee=None, espace_disponible=0.0, profondeur_tremie=0.0,
+                   position_tremie=0.0, epaisseur_plancher_sup=0.0):
+    """Priorité au nombre manuel (au moins 2 CM), sinon solveur analytique à giron imposé."""
+    if nombre_cm_manuel is not None:
+        return (max(nombre_cm_manuel, 2),)
+    if nombre_marches_manuel is not None:
+        return (max(nombre_marches_manuel + 1, 2),)
+    return (resoudre_escalier(
+        hauteur_totale,
+        espace_disponible=espace_disponible,
+        profondeur_tremie=profondeur_tremie,
+        position_tremie=position_tremie,
+        epaisseur_plancher_sup=epaisseur_plancher_sup,
+        hauteur_cm_cible=hauteur_cm_souhaitee if hauteur_cm_souhaitee > 0 else constants.HAUTEUR_CM_CONFORT_CIBLE,
+        giron_impose=giron,
+    )["nombre_contremarches"],)
+
+
+def _hauteur_cm(hauteur_totale, nombre_contremarches):
+    (hauteur,) = _ligne(hauteur_totale)
+    n = np.array([nombre_contremarches], dtype=np.int64)
+    h = hauteur / n
+    ecart = hauteur - h * n
+    bits = int(vectorized._verifier_hauteur_cm(h)[0])
+    if abs(ecart[0]) > vectorized.TOLERANCE_ECART_HAUTEUR:
+        bits |= vectorized.HAUTEUR_TOTALE_ECART
+    return float(h[0]), nombre_contremarches - 1, float(ecart[0]), bits
+
+
+def _giron(giron):
+    return (int(vectorized._verifier_giron(*_ligne(giron))[0]),)
+
+
+def _geometrie(hauteur_totale, giron, nombre_girons):
+    colonnes = vectorized._geometrie(*_ligne(hauteur_totale, giron), np.array([nombre_girons], dtype=np.int64))
+    return tuple(float(colonne[0]) for colonne in colonnes)
+
+
+def _blondel(hauteur_reelle_contremarche, giron):
+    blondel, bits = vectorized._verifier_blondel(*_ligne(hauteur_reelle_contremarche, giron))
+    return float(blondel[0]), int(bits[0])
+
+
+def _echappee(*arguments):
+    echappee, bits = vectorized._echappee(*_ligne(*arguments))
+    echappee = float(echappee[0])
+    return (None if math.isnan(echappee) else echappee), int(bits[0])
+
+
+def _longueur(longueur, espace_disponible):
+    return (int(vectorized._verifier_longueur(*_ligne(longueur, espace_disponible))[0]),)
+
+
+def _angle(angle):
+    return (int(vectorized._verifier_angle(*_ligne(angle))[0]),)
+
+
+ETAPES = (
+    Etape("contremarches", _entrees_contremarches, ("nombre_contremarches",), _contremarches),
+    Etape("hauteur_cm", ("hauteur_totale", "nombre_contremarches"),
+          ("hauteur_reelle_contremarche", "nombre_girons", "ecart_hauteur", "bits_hauteur_cm"), _hauteur_cm),
+    Etape("giron", ("giron",), ("bits_giron",), _giron),
+    Etape("geometrie", ("hauteur_totale", "giron", "nombre_girons"),
+          ("longueur_calculee_escalier", "angle_escalier", "longueur_limon_approximative"), _geometrie),
+    Etape("blondel", ("hauteur_reelle_contremarche", "giron"), ("blondel_value", "bits_blondel"), _blondel),
+    Etape("echappee",
+          ("hauteur_totale", "hauteur_reelle_contremarche", "giron", "nombre_contremarches",
+           "epaisseur_plancher_sup", "profondeur_tremie", "position_tremie"),
+          ("min_echappee_calculee", "bits_echappee"), _echappee),
+    Etape("longueur", ("longueur_calculee_escalier", "espace_disponible"), ("bits_longueur",), _longueur),
+    Etape("angle", ("angle_escalier",), ("bits_angle",), _angle),
+)
+
+_BITS = ("bits_hauteur_cm", "bits_giron", "bits_blondel", "bits_echappee", "bits_longueur", "bits_angle")
+
+
+class MoteurIncremental:
+    """
+    Calcul d'escalier qui réutilise les étapes dont les entrées n'ont pas changé.
+
+    Une instance est faite pour durer (une par fenêtre) : elle garde les chaînes
+    déjà parsées et les entrées/sorties de chaque étape. `derniere_execution`
+    liste les étapes recalculées au dernier appel ; `stats` compte par étape
+    les exécutions et les réutilisations.
+    """
+
+    def __init__(self):
+        self._parsing = {}
+        self._etapes = {}
+        self.derniere_execution = ()
+        self.stats = {"executees": Counter(), "reutilisees": Counter()}
+
+    def vider_cache(self):
+        self._parsing.clear()
+        self._etapes.clear()
+
+    def _parser(self, champ, brut, unite):
+        """Valeur parsée d'un champ (ou l'exception ValueError), réutilisée si la chaîne n'a pas changé."""
+        cle = (brut, unite)
+        cache = self._parsing.get(champ)
+        if cache is not None and cache[0] == cle:
+            return cache[1]
+        try:
+            valeur = parser_champ(champ, brut, unite)
+        except ValueError as e:
+            valeur = e
+        self._parsing[champ] = (cle, valeur)
+        return valeur
+
+    def calculer(self, entrees, preferences, unite="Pouces", changed_var_name=None):
+        """
+        Calcule un escalier à partir des chaînes saisies (clés de CHAMPS_ENTREE)
+        et retourne un `StairResult`, comme `calculer_escalier_ajuste`.
+
+        `changed_var_name` (variable Tk ou nom de champ) sert à étiqueter
+        l'exécution : l'invalidation elle-même se fait en comparant les entrées
+        de chaque étape, ce qui reste juste quand plusieurs champs ont changé.
+
+        Si `core.instrumentation.CHRONO` est actif, la durée du parsing, de
+        chaque étape exécutée et de la construction du résultat est enregistrée.
+        """
+        if not CHRONO.actif:
+            return self._calculer(entrees, preferences, unite, changed_var_name, False)
+        debut = perf_counter()
+        resultat = self._calculer(entrees, preferences, unite, changed_var_name, True)
+        CHRONO.enregistrer("calcul.total", perf_counter() - debut)
+        return resultat
+
+    def _calculer(self, entrees, preferences, unite, changed_var_name, mesurer):
+        debut = perf_counter() if mesurer else 0.0
+        valeurs = {}
+        brutes = dict(entrees)
+        brutes["epaisseur_marche"] = preferences.get("default_tread_thickness", "1 1/16")
+        for argument, champ in (*CHAMPS_ENTREE.items(), ("epaisseur_marche", "epaisseur_marche")):
+            valeurs[champ] = self._parser(champ, brutes[argument], unite)
+        for champ, valeur in valeurs.items():
+            if isinstance(valeur, ValueError):
+                self.derniere_execution = ()
+                # Les messages du parseur finissent déjà par un point
+                return StairResult(erreur=f"Erreur de format pour une entrée: {str(valeur).rstrip('.')}. Veuillez utiliser des nombres ou des fractions valides (ex: '10', '9 1/4', '3/4').")
+
+        epaisseurs = {
+            "epaisseur_marche": valeurs["epaisseur_marche"],
+            "epaisseur_plancher_sup": valeurs["epaisseur_plancher_sup"],
+            "epaisseur_plancher_inf": valeurs["epaisseur_plancher_inf"],
+        }
+        # Vérifications minimales pour éviter les divisions par zéro ou calculs absurdes
+        if valeurs["hauteur_totale"] <= 0:
+            self.derniere_execution = ()
+            return StairResult(**epaisseurs, erreur="La hauteur totale de l'escalier doit être supérieure à zéro.")
+        if valeurs["hauteur_totale"] > HAUTEUR_TOTALE_MAX:
+            self.derniere_execution = ()
+            return StairResult(
+                **epaisseurs, erreur=f"La hauteur totale de l'escalier ne peut pas dépasser {HAUTEUR_TOTALE_MAX:g} pouces."
+            )
+        if valeurs["giron"] <= 0:
+            self.derniere_execution = ()
+            return StairResult(**epaisseurs, erreur="Le giron souhaité doit être supérieur à zéro.")
+        if mesurer:
+            CHRONO.enregistrer("calcul.parsing", perf_counter() - debut)
+
+        executees = []
+        for etape in ETAPES:
+            noms = etape.entrees(valeurs) if callable(etape.entrees) else etape.entrees
+            arguments = tuple(valeurs[nom] for nom in noms)
+            cache = self._etapes.get(etape.nom)
+            if cache is not None and cache[0] == (noms, arguments):
+                sorties = cache[1]
+                self.stats["reutilisees"][etape.nom] += 1
+            else:
+                debut = perf_counter() if mesurer else 0.0
+                sorties = etape.fonction(*arguments)
+                if mesurer:
+                    CHRONO.enregistrer("calcul." + etape.nom, perf_counter() - debut)
+                self._etapes[etape.nom] = ((noms, arguments), sorties)
+                self.stats["executees"][etape.nom] += 1
+                executees.append(etape.nom)
+            valeurs.update(zip(etape.sorties, sorties))
+        self.derniere_execution = tuple(executees)
+
+        if constants.DEBUG_MODE_ACTIVE:
+            print(f"DEBUG - {changed_var_name or 'calcul'} : étapes recalculées {self.derniere_execution}")
+
+        debut = perf_counter() if mesurer else 0.0
+        masque = 0
+        for bits in _BITS:
+            masque |= valeurs[bits]
+        resultat = StairResult(
+            hauteur_totale_escalier=valeurs["hauteur_totale"],
+            hauteur_reelle_contremarche=valeurs["hauteur_reelle_contremarche"],
+            giron_utilise=valeurs["giron"],
+            nombre_contremarches=int(valeurs["nombre_contremarches"]),
+            nombre_girons=int(valeurs["nombre_girons"]),
+            longueur_calculee_escalier=valeurs["longueur_calculee_escalier"],
+            angle_escalier=valeurs["angle_escalier"],
+            longueur_limon_approximative=valeurs["longueur_limon_approximative"],
+            min_echappee_calculee=valeurs["min_echappee_calculee"],
+            blondel_value=valeurs["blondel_value"],
+            ecart_hauteur=valeurs["ecart_hauteur"],
+            espace_disponible=valeurs["espace_disponible"],
+            profondeur_tremie=valeurs["profondeur_tremie"],
+            position_tremie=valeurs["position_tremie"],
+            masque=masque,
+            **epaisseurs,
+        )
+        if mesurer:
+            CHRONO.enregistrer("calcul.resultat", perf_counter() - debut)
+        return resultat
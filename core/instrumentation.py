@@ -0,0 +1,113 @@
+# Fichier: core/instrumentation.py
+
+"""
+Mesure optionnelle du temps passé dans chaque étape d'un recalcul.
+
+`CHRONO` est l'instance partagée par le moteur, le modèle de vue et
+l'interface. Désactivée (par défaut), elle ne coûte qu'un test d'attribut par
+point de mesure : le code instrumenté s'écrit
+
+    mesurer = CHRONO.actif
+    debut = perf_counter() if mesurer else 0.0
+    ...
+    if mesurer:
+        CHRONO.enregistrer("calcul.parsing", perf_counter() - debut)
+
+Activée, elle garde pour chaque nom les TAILLE_FENETRE dernières durées ;
+`resume()` en tire moyenne, percentiles et un histogramme par puissances de 2
+(en µs), `exporter_json()` les écrit en JSON. La variable d'environnement
+ESCALIER_INSTRUMENTATION=1 l'active dès le démarrage.
+
+Noms utilisés : "calcul.parsing", "calcul.<étape>" (étapes de
+core.incremental.ETAPES réellement exécutées), "calcul.resultat",
+"calcul.total", "modele.messages", "modele.recalculer", puis côté interface
+"interface.resultats", "interface.apercu", "interface.rapports" et
+"interface.total".
+"""
+
+import json
+import os
+from collections import deque
+
+TAILLE_FENETRE = 1000
+# Bornes supérieures des classes de l'histogramme, en µs (la dernière classe est ouverte)
+BORNES_HISTOGRAMME_US = tuple(2 ** i for i in range(17))  # 1 µs … 65 ms
+
+
+class Instrumentation:
+    def __init__(self, taille=TAILLE_FENETRE, actif=False):
+        self.actif = actif
+        self.taille = taille
+        self._durees = {}
+
+    def activer(self, actif=True):
+        self.actif = actif
+
+    def vider(self):
+        self._durees.clear()
+
+    def enregistrer(self, nom, duree_s):
+        """Ajoute une durée (en secondes) à la fenêtre glissante de `nom`."""
+        fenetre = self._durees.get(nom)
+        if fenetre is None:
+            fenetre = self._durees[nom] = deque(maxlen=self.taille)
+        fenetre.append(duree_s)
+
+    def noms(self):
+        return tuple(self._durees)
+
+    def resume(self):
+        """Nom → statistiques (en µs) des durées de la fenêtre courante."""
+        resume = {}
+        for nom, fenetre in self._durees.items():
+            durees = sorted(duree * 1e6 for duree in fenetre)
+            if not durees:
+                continue
+
+            def percentile(rang):
+                return durees[max(0, min(len(durees) - 1, round(rang / 100 * len(durees)) - 1))]
+
+            resume[nom] = {
+                "n": len(durees),
+                "moyenne_us": sum(durees) / len(durees),
+                "p50_us": percentile(50),
+                "p90_us": percentile(90),
+                "p99_us": percentile(99),
+                "max_us": durees[-1],
+                "histogramme": _histogramme(durees),
+            }
+        return resume
+
+    def exporter_json(self, chemin=None):
+        """Retourne le résumé en JSON ; l'écrit aussi dans `chemin` s'il est donné."""
+        texte = json.dumps(self.resume(), indent=4, ensure_ascii=False)
+        if chemin:
+            with open(chemin, "w", encoding="utf-8") as f:
+                f.write(texte)
+        return texte
+
+    def texte(self, noms=None):
+        """Résumé court, une ligne par nom (pour un affichage en surimpression)."""
+        resume = self.resume()
+        lignes = []
+        for nom in noms or sorted(resume):
+            if nom in resume:
+                stats = resume[nom]
+                lignes.append(f"{nom:<22} p50 {stats['p50_us']:8.1f} µs  p99 {stats['p99_us']:8.1f} µs  n={stats['n']}")
+        return "\n".join(lignes)
+
+
+def _histogramme(durees_us):
+    """Nombre de durées par classe "≤ borne µs" (plus une classe "> dernière borne")."""
+    comptes = dict.fromkeys([f"<={borne}" for borne in BORNES_HISTOGRAMME_US] + [f">{BORNES_HISTOGRAMME_US[-1]}"], 0)
+    for duree in durees_us:
+        for borne in BORNES_HISTOGRAMME_US:
+            if duree <= borne:
+                comptes[f"<={borne}"] += 1
+                break
+        else:
+            comptes[f">{BORNES_HISTOGRAMME_US[-1]}"] += 1
+    return {classe: compte for classe, compte in comptes.items() if compte}
+
+
+CHRONO = Instrumentation(actif=os.environ.get("ESCALIER_INSTRUMENTATION") == "1")
@@ -0,0 +1,193 @@
+# Fichier: core/pdf.py
+
+"""
+Écriture de documents PDF minimaux, sans dépendance (bibliothèque standard).
+
+Polices de base du format (Courier, Helvetica-Bold : rien à embarquer),
+encodage WinAnsi pour les accents, contenus de page compressés (zlib). Chaque
+page est écrite dans le fichier dès qu'elle est terminée : seule la table des
+positions des objets reste en mémoire.
+
+    with open("rapport.pdf", "wb") as f, DocumentPDF(f, titre="Escalier") as doc:
+        with doc.page() as page:
+            page.texte(50, 750, "Plan de traçage")
+            page.ligne(50, 740, 300, 740)
+"""
+
+import codecs
+import time
+import zlib
+from functools import lru_cache
+
+# Taille des pages en points (1/72 po)
+FORMATS_PAGE = {"letter": (612.0, 792.0), "a4": (595.28, 841.89)}
+# Police → nom de la police de base PDF ; chasse de Courier en fraction de la taille
+POLICES = {"mono": "Courier", "titre": "Helvetica-Bold"}
+CHASSE_MONO = 0.6
+
+# Caractères hors WinAnsi remplacés par un équivalent lisible (les autres par "?")
+_SUBSTITUTIONS = {"≈": "~", "✓": "v", "✗": "x", "→": "->", "≤": "<=", "≥": ">=", "√": "V"}
+
+
+def _substituer(erreur):
+    remplacement = "".join(_SUBSTITUTIONS.get(c, "?") for c in erreur.object[erreur.start:erreur.end])
+    return remplacement, erreur.end
+
+
+codecs.register_error("pdf_winansi", _substituer)
+
+
+def _nombre(valeur):
+    return f"{valeur:.2f}".rstrip("0").rstrip(".")
+
+
+def _chaine(texte):
+    """Texte → chaîne littérale PDF encodée en WinAnsi (cp1252)."""
+    octets = texte.encode("cp1252", "pdf_winansi")
+    return b"(" + octets.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+@lru_cache(maxsize=64)
+def _couleur(couleur):
+    """'#rrggbb' ou (r, g, b) entre 0 et 1 → composantes PDF."""
+    if isinstance(couleur, str):
+        couleur = tuple(int(couleur[i:i + 2], 16) / 255 for i in (1, 3, 5))
+    return " ".join(_nombre(c) for c in couleur)
+
+
+class PagePDF:
+    """Contenu d'une page ; coordonnées en points, origine en bas à gauche."""
+
+    def __init__(self, largeur, hauteur):
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self._operations = []
+
+    def texte(self, x, y, texte, taille=9, police="mono", couleur=None):
+        couleur = f"{_couleur(couleur)} rg " if couleur else ""
+        self._operations.append(
+            f"BT {couleur}/{police} {_nombre(taille)} Tf {_nombre(x)} {_nombre(y)} Td ".encode("ascii")
+            + _chaine(texte) + b" Tj ET"
+        )
+
+    def bloc_texte(self, x, y, lignes, taille=9, interligne=None, police="mono"):
+        """Lignes successives depuis (x, y) en un seul objet texte (une ligne vide saute une ligne)."""
+        interligne = interligne or 1.2 * taille
+        self._operations.append(
+            f"BT /{police} {_nombre(taille)} Tf {_nombre(interligne)} TL {_nombre(x)} {_nombre(y)} Td\n".encode("ascii")
+            + b"\n".join(_chaine(ligne) + b" Tj T*" if ligne else b"T*" for ligne in lignes)
+            + b"\nET"
+        )
+
+    def _trace(self, chemin, remplissage=None, contour="#000000", epaisseur=1.0, tirets=None):
+        etat = [f"{_nombre(epaisseur)} w", f"[{' '.join(_nombre(t) for t in tirets or ())}] 0 d"]
+        if remplissage:
+            etat.append(f"{_couleur(remplissage)} rg")
+        if contour:
+            etat.append(f"{_couleur(contour)} RG")
+        peinture = "B" if remplissage and contour else "f" if remplissage else "S"
+        self._operations.append(f"q {' '.join(etat)} {chemin} {peinture} Q".encode("ascii"))
+
+    def ligne(self, x1, y1, x2, y2, couleur="#000000", epaisseur=1.0, tirets=None):
+        self._trace(f"{_nombre(x1)} {_nombre(y1)} m {_nombre(x2)} {_nombre(y2)} l", None, couleur, epaisseur, tirets)
+
+    def rectangle(self, x, y, largeur, hauteur, remplissage=None, contour="#000000", epaisseur=1.0, tirets=None):
+        chemin = f"{_nombre(x)} {_nombre(y)} {_nombre(largeur)} {_nombre(hauteur)} re"
+        self._trace(chemin, remplissage, contour, epaisseur, tirets)
+
+    def polygone(self, points, remplissage=None, contour="#000000", epaisseur=1.0, tirets=None):
+        (x0, y0), *suite = points
+        chemin = f"{_nombre(x0)} {_nombre(y0)} m " + " ".join(f"{_nombre(x)} {_nombre(y)} l" for x, y in suite) + " h"
+        self._trace(chemin, remplissage, contour, epaisseur, tirets)
+
+    def contenu(self):
+        return b"\n".join(self._operations)
+
+
+class DocumentPDF:
+    # Objets réservés ; les pages et leurs contenus sont numérotés à partir de _PREMIER_LIBRE
+    _CATALOGUE, _PAGES, _INFO = 1, 2, 3
+    _PREMIER_LIBRE = 4 + len(POLICES)
+
+    def __init__(self, flux, format_page="letter", titre=""):
+        """`flux` : fichier ouvert en écriture binaire."""
+        self.flux = flux
+        self.largeur, self.hauteur = FORMATS_PAGE[format_page]
+        self.titre = titre
+        self._position = 0
+        self._decalages = {}
+        self._pages = []
+        self._prochain = self._PREMIER_LIBRE
+        self._ecrire(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _ecrire(self, octets):
+        self.flux.write(octets)
+        self._position += len(octets)
+
+    def _objet(self, numero, corps):
+        self._decalages[numero] = self._position
+        self._ecrire(f"{numero} 0 obj\n".encode("ascii") + corps + b"\nendobj\n")
+
+    def _nouveau_numero(self):
+        numero, self._prochain = self._prochain, self._prochain + 1
+        return numero
+
+    def ajouter_page(self, page):
+        """Écrit la page terminée (contenu compressé puis objet page)."""
+        donnees = zlib.compress(page.contenu(), 6)
+        numero_contenu = self._nouveau_numero()
+        self._objet(
+            numero_contenu,
+            f"<< /Length {len(donnees)} /Filter /FlateDecode >>\nstream\n".encode("ascii") + donnees + b"\nendstream",
+        )
+        numero_page = self._nouveau_numero()
+        self._objet(numero_page, (
+            f"<< /Type /Page /Parent {self._PAGES} 0 R /MediaBox [0 0 {_nombre(page.largeur)} {_nombre(page.hauteur)}] "
+            f"/Contents {numero_contenu} 0 R >>"
+        ).encode("ascii"))
+        self._pages.append(numero_page)
+
+    def page(self):
+        """Gestionnaire de contexte : la page est ajoutée au document à la sortie du bloc."""
+        return _ContextePage(self)
+
+    def fermer(self):
+        polices = " ".join(f"/{nom} {4 + i} 0 R" for i, nom in enumerate(POLICES))
+        for i, police in enumerate(POLICES.values()):
+            self._objet(4 + i, f"<< /Type /Font /Subtype /Type1 /BaseFont /{police} /Encoding /WinAnsiEncoding >>".encode("ascii"))
+        kids = " ".join(f"{numero} 0 R" for numero in self._pages)
+        self._objet(self._PAGES, (
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self._pages)} /Resources << /Font << {polices} >> >> >>"
+        ).encode("ascii"))
+        self._objet(self._CATALOGUE, f"<< /Type /Catalog /Pages {self._PAGES} 0 R >>".encode("ascii"))
+        date = time.strftime("D:%Y%m%d%H%M%S")
+        self._objet(self._INFO, b"<< /Title " + _chaine(self.titre) + f" /Producer (Calculateur Escalier) /CreationDate ({date}) >>".encode("ascii"))
+
+        debut_xref = self._position
+        lignes = [f"xref\n0 {self._prochain}\n", "0000000000 65535 f \n"]
+        lignes += [f"{self._decalages[numero]:010d} 00000 n \n" for numero in range(1, self._prochain)]
+        lignes.append(
+            f"trailer\n<< /Size {self._prochain} /Root {self._CATALOGUE} 0 R /Info {self._INFO} 0 R >>\n"
+            f"startxref\n{debut_xref}\n%%EOF\n"
+        )
+        self._ecrire("".join(lignes).encode("ascii"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_exc, *exc):
+        if type_exc is None:
+            self.fermer()
+
+
+class _ContextePage:
+    def __init__(self, document):
+        self.document = document
+        self.page = PagePDF(document.largeur, document.hauteur)
+
+    def __enter__(self):
+        return self.page
+
+    def __exit__(self, type_exc, *exc):
+        if type_exc is None:
+            self.document.ajouter_page(self.page)
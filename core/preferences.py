@@ -0,0 +1,145 @@
+# Fichier: core/preferences.py
+
+"""
+Magasin unique des préférences de l'application (data/preferences.json).
+
+Le fichier n'est lu qu'une fois, puis relu seulement quand sa date de
+modification ou sa taille change (par exemple s'il est enregistré par
+l'interface pendant que le service tourne). Le moteur et les rapports
+reçoivent un instantané immuable : un dictionnaire en lecture seule, qui
+passe tel quel en JSON et dans les pools de processus. L'écriture est
+atomique (fichier temporaire dans le même dossier, puis os.replace) : un
+lecteur ne voit jamais un fichier à moitié écrit.
+
+Les abonnés sont prévenus à chaque changement effectif, avec l'ensemble des
+clés modifiées ; un abonné peut se limiter aux clés dont il dépend :
+
+    PREFERENCES.abonner(lambda instantane, cles: vider_cache_fractions(), CLES_FORMATAGE)
+    preferences = PREFERENCES.instantane()
+    PREFERENCES.modifier(default_tread_thickness="1 1/8")
+"""
+
+import json
+import os
+import tempfile
+
+from core import constants
+
+# Préférences dont dépendent les résultats (épaisseur de marche du moteur,
+# valeurs par défaut des travaux du mode batch et du service)
+CLES_RESULTATS = frozenset({
+    "default_tread_thickness",
+    "default_tread_width_straight",
+    "default_floor_finish_thickness_upper",
+    "default_floor_finish_thickness_lower",
+})
+# Préférences dont dépend seulement la mise en forme des fractions
+CLES_FORMATAGE = frozenset({"fraction_precision_denominator"})
+
+_ABSENT = object()
+
+
+class Preferences(dict):
+    """Instantané en lecture seule ; `copy()` retourne un dictionnaire modifiable."""
+
+    def _lecture_seule(self, *args, **kwargs):
+        raise TypeError("Préférences en lecture seule : utiliser PREFERENCES.modifier() ou copy()")
+
+    __setitem__ = __delitem__ = __ior__ = _lecture_seule
+    clear = pop = popitem = setdefault = update = _lecture_seule
+
+    def copy(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return Preferences, (dict(self),)
+
+
+class MagasinPreferences:
+    def __init__(self, chemin=constants.DEFAULTS_FILE):
+        self.chemin = chemin
+        self._instantane = None
+        self._signature = None
+        self._abonnes = []
+
+    def _signature_fichier(self):
+        try:
+            etat = os.stat(self.chemin)
+        except FileNotFoundError:
+            return None
+        return etat.st_mtime_ns, etat.st_size
+
+    def _lire(self):
+        """Valeurs par défaut complétées par le contenu du fichier (s'il est lisible)."""
+        preferences = dict(constants.DEFAULT_APP_PREFERENCES)
+        try:
+            with open(self.chemin, "r", encoding="utf-8") as f:
+                contenu = json.load(f)
+        except FileNotFoundError:
+            return preferences
+        except (OSError, ValueError) as e:
+            print(f"Erreur: Le fichier de préférences '{self.chemin}' est illisible ({e}). Utilisation des préférences par défaut.")
+            return preferences
+        if isinstance(contenu, dict):
+            preferences.update(contenu)
+        return preferences
+
+    def instantane(self):
+        """Préférences courantes ; le fichier n'est relu que s'il a changé depuis la dernière lecture."""
+        signature = self._signature_fichier()
+        if self._instantane is None or signature != self._signature:
+            self._signature = signature
+            self._publier(self._lire())
+        return self._instantane
+
+    def enregistrer(self, preferences):
+        """Écrit toutes les préférences (complétées par les valeurs par défaut) de façon atomique."""
+        contenu = dict(constants.DEFAULT_APP_PREFERENCES)
+        contenu.update(preferences)
+        dossier = os.path.dirname(self.chemin) or "."
+        os.makedirs(dossier, exist_ok=True)
+        descripteur, temporaire = tempfile.mkstemp(prefix=".preferences-", suffix=".tmp", dir=dossier)
+        try:
+            with os.fdopen(descripteur, "w", encoding="utf-8") as f:
+                json.dump(contenu, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporaire, self.chemin)
+        except BaseException:
+            if os.path.exists(temporaire):
+                os.remove(temporaire)
+            raise
+        self._signature = self._signature_fichier()
+        self._publier(contenu)
+        return self._instantane
+
+    def modifier(self, **changements):
+        """Enregistre les préférences courantes avec `changements` appliqués."""
+        return self.enregistrer({**self.instantane(), **changements})
+
+    def abonner(self, rappel, cles=None):
+        """
+        Appelle rappel(instantane, cles_modifiees) à chaque changement ; si
+        `cles` est donné, seulement quand l'une d'elles change.
+        """
+        self._abonnes.append((rappel, frozenset(cles) if cles is not None else None))
+
+    def desabonner(self, rappel):
+        self._abonnes = [(r, cles) for r, cles in self._abonnes if r != rappel]
+
+    def _publier(self, preferences):
+        anciennes, self._instantane = self._instantane, Preferences(preferences)
+        if anciennes is None:
+            return
+        modifiees = frozenset(
+            cle for cle in anciennes.keys() | self._instantane.keys()
+            if anciennes.get(cle, _ABSENT) != self._instantane.get(cle, _ABSENT)
+        )
+        if not modifiees:
+            return
+        for rappel, cles in list(self._abonnes):
+            if cles is None or cles & modifiees:
+                rappel(self._instantane, modifiees)
+
+
+PREFERENCES = MagasinPreferences()
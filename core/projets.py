@@ -0,0 +1,211 @@
+# Fichier: core/projets.py
+
+"""
+Projets d'escalier : enregistrement, ouverture et archive indexée.
+
+Un projet contient les champs saisis, les champs affichés, un instantané des
+préférences et le résultat calculé (StairResult). Il est écrit dans un format
+compact et versionné : l'en-tête ENTETE_PROJET, le numéro de format sur un
+octet, puis le JSON compressé (zlib). À l'ouverture, les champs et le résultat
+sont restaurés tels quels : rien n'est reparsé ni recalculé avant la
+prochaine modification.
+
+L'archive (SQLite, data/projets.sqlite) garde chaque projet avec des colonnes
+indexées sur les dimensions clés (hauteur totale, nombre de contremarches,
+giron, conformité, date) : la recherche ne lit que l'index, et seul le projet
+ouvert est décompressé.
+
+Usage :
+    projet = projet_depuis_modele(modele, "Escalier sous-sol")
+    with ArchiveProjets() as archive:
+        ident = archive.enregistrer(projet)
+        lignes = archive.chercher(hauteur_min=100, hauteur_max=110, conforme=True)
+        appliquer_au_modele(archive.ouvrir(ident), modele)
+"""
+
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+from core import constants
+from core.results import StairResult
+
+FORMAT_PROJET = 1
+ENTETE_PROJET = b"ESCP"
+EXTENSION_PROJET = ".escalier"
+FICHIER_ARCHIVE = os.path.join(constants.DATA_DIR, "projets.sqlite")
+
+# Colonnes renvoyées par ArchiveProjets.chercher (sans le contenu du projet)
+COLONNES_INDEX = ("id", "nom", "date", "hauteur_totale", "nombre_cm", "giron", "conforme")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projets (
+    id INTEGER PRIMARY KEY,
+    nom TEXT NOT NULL,
+    date REAL NOT NULL,
+    hauteur_totale REAL,
+    nombre_cm INTEGER,
+    giron REAL,
+    conforme INTEGER,
+    donnees BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS projets_hauteur ON projets (hauteur_totale);
+CREATE INDEX IF NOT EXISTS projets_nombre_cm ON projets (nombre_cm);
+CREATE INDEX IF NOT EXISTS projets_giron ON projets (giron);
+CREATE INDEX IF NOT EXISTS projets_conforme ON projets (conforme, date);
+CREATE INDEX IF NOT EXISTS projets_date ON projets (date);
+"""
+
+
+# --- Projet ↔ modèle de vue ---
+
+def projet_depuis_modele(modele, nom=""):
+    """Projet (dictionnaire) à partir de l'état d'un StairViewModel."""
+    etat = modele.etat()
+    resultat = modele.resultat
+    return {
+        "format": FORMAT_PROJET,
+        "programme": constants.VERSION_PROGRAMME,
+        "nom": nom,
+        "date": time.time(),
+        "unite": etat["unite"],
+        "preferences": dict(modele.preferences),
+        "saisies": etat["saisies"],
+        "affichage": etat["affichage"],
+        "resultat": resultat._asdict() if resultat is not None else None,
+    }
+
+
+def resultat_projet(projet):
+    """StairResult enregistré dans le projet (None s'il n'y en a pas)."""
+    valeurs = projet.get("resultat")
+    return StairResult(**valeurs) if valeurs else None
+
+
+def appliquer_au_modele(projet, modele):
+    """Restaure le projet dans un StairViewModel, sans recalcul."""
+    modele.restaurer(
+        projet["unite"], projet["saisies"], projet["affichage"], resultat_projet(projet), projet.get("preferences"),
+    )
+
+
+# --- Format compact ---
+
+def encoder(projet):
+    texte = json.dumps(projet, ensure_ascii=False, separators=(",", ":"))
+    return ENTETE_PROJET + bytes([FORMAT_PROJET]) + zlib.compress(texte.encode("utf-8"), 6)
+
+
+def decoder(donnees):
+    """Projet à partir de son format compact ; lève ValueError si le contenu n'est pas reconnu."""
+    if len(donnees) <= len(ENTETE_PROJET) or donnees[:len(ENTETE_PROJET)] != ENTETE_PROJET:
+        raise ValueError("Ce fichier n'est pas un projet d'escalier.")
+    version = donnees[len(ENTETE_PROJET)]
+    if version > FORMAT_PROJET:
+        raise ValueError(f"Format de projet {version} non pris en charge (version {FORMAT_PROJET} au plus).")
+    try:
+        return json.loads(zlib.decompress(donnees[len(ENTETE_PROJET) + 1:]).decode("utf-8"))
+    except (zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Projet illisible : {e}") from e
+
+
+def ecrire_projet(projet, chemin):
+    with open(chemin, "wb") as f:
+        f.write(encoder(projet))
+
+
+def lire_projet(chemin):
+    with open(chemin, "rb") as f:
+        return decoder(f.read())
+
+
+# --- Archive indexée ---
+
+def _index(projet):
+    """Valeurs des colonnes indexées d'un projet."""
+    resultat = resultat_projet(projet)
+    if resultat is None or not resultat.is_valid:
+        return None, None, None, None
+    return (
+        resultat.hauteur_totale_escalier,
+        resultat.nombre_contremarches,
+        resultat.giron_utilise,
+        int(resultat.is_conform),
+    )
+
+
+class ArchiveProjets:
+    def __init__(self, chemin=FICHIER_ARCHIVE):
+        self.chemin = chemin
+        os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+        self._connexion = sqlite3.connect(chemin, timeout=30)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.executescript(_SCHEMA)
+
+    def enregistrer(self, projet, ident=None):
+        """Ajoute le projet (ou remplace le projet `ident`) et retourne son identifiant."""
+        valeurs = (projet.get("nom") or "", projet.get("date") or time.time(), *_index(projet), encoder(projet))
+        with self._connexion:
+            if ident is None:
+                curseur = self._connexion.execute(
+                    "INSERT INTO projets (nom, date, hauteur_totale, nombre_cm, giron, conforme, donnees)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)", valeurs,
+                )
+                return curseur.lastrowid
+            self._connexion.execute(
+                "UPDATE projets SET nom = ?, date = ?, hauteur_totale = ?, nombre_cm = ?, giron = ?, conforme = ?,"
+                " donnees = ? WHERE id = ?", valeurs + (ident,),
+            )
+            return ident
+
+    def ouvrir(self, ident):
+        ligne = self._connexion.execute("SELECT donnees FROM projets WHERE id = ?", (ident,)).fetchone()
+        if ligne is None:
+            raise KeyError(f"Projet {ident} introuvable dans l'archive")
+        return decoder(ligne[0])
+
+    def supprimer(self, ident):
+        with self._connexion:
+            self._connexion.execute("DELETE FROM projets WHERE id = ?", (ident,))
+
+    def chercher(self, nom=None, hauteur_min=None, hauteur_max=None, nombre_cm=None,
+                 giron_min=None, giron_max=None, conforme=None, depuis=None, jusqu_a=None, limite=200):
+        """
+        Projets correspondant à tous les critères donnés, du plus récent au plus
+        ancien : liste de dictionnaires aux clés COLONNES_INDEX (contenu non lu).
+        `nom` cherche une sous-chaîne ; `depuis` et `jusqu_a` sont des horodatages.
+        """
+        conditions, parametres = [], []
+        for condition, valeur in (
+            ("nom LIKE ?", f"%{nom}%" if nom else None),
+            ("hauteur_totale >= ?", hauteur_min),
+            ("hauteur_totale <= ?", hauteur_max),
+            ("nombre_cm = ?", nombre_cm),
+            ("giron >= ?", giron_min),
+            ("giron <= ?", giron_max),
+            ("conforme = ?", None if conforme is None else int(conforme)),
+            ("date >= ?", depuis),
+            ("date <= ?", jusqu_a),
+        ):
+            if valeur is not None:
+                conditions.append(condition)
+                parametres.append(valeur)
+        requete = f"SELECT {', '.join(COLONNES_INDEX)} FROM projets"
+        if conditions:
+            requete += " WHERE " + " AND ".join(conditions)
+        requete += " ORDER BY date DESC LIMIT ?"
+        return [dict(zip(COLONNES_INDEX, ligne)) for ligne in self._connexion.execute(requete, (*parametres, limite))]
+
+    def __len__(self):
+        return self._connexion.execute("SELECT COUNT(*) FROM projets").fetchone()[0]
+
+    def fermer(self):
+        self._connexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
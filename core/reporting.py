@@ -1,192 +1,562 @@
-﻿import math
+﻿"""
+Rapports d'un escalier : plan de traçage, paramètres de référence et
+hypoténuses cumulées.
+
+Chaque rapport est calculé une seule fois en un modèle structuré (Rapport →
+sections → blocs de lignes aux valeurs typées : Longueur en pouces, repère
+exact de core.grille, tolérance...), puis rendu par des fonctions légères en
+texte à chasse fixe (onglets de l'interface, PDF), Markdown, HTML ou CSV. Un
+export multi-format rend le même modèle dans chaque format :
+
+    rapport = rapport_complet(resultat)
+    textes = rendre_formats(rapport, ("markdown", "html", "csv"), preferences)
+
+Les fractions sont mises en forme au rendu, par `format_fraction(valeur,
+preferences)` : core.formatting par défaut, utils.formatting pour l'interface
+historique (utils.reporting).
+"""
+import io
+import math
+from functools import lru_cache, wraps
+from itertools import repeat
+from typing import NamedTuple, Optional, Tuple
+
 from core import constants
-from core.formatting import decimal_to_fraction_str
+from core.formatting import TAILLE_CACHE_FRACTIONS, decimal_to_fraction_str
+from core.grille import disposition, milieux, texte_mm, texte_pouces, vers_grille
+from core.results import StairResult
+
+# Nombre de modèles de rapport gardés en cache par type de rapport (éviction LRU)
+TAILLE_CACHE_RAPPORTS = 256
+LARGEUR_TEXTE = 76
+LARGEUR_LIBELLE = 30
+COLONNES_CSV = ("section", "ligne", "colonne", "texte", "pouces", "mm")
+
+
+# --- Valeurs typées ---
+
+class Longueur(NamedTuple):
+    """Mesure décimale en pouces : fraction impériale et équivalent en mm au rendu."""
+    pouces: Optional[float]
+
+
+class Tolerance(NamedTuple):
+    """Écart admis (±), en pouces."""
+    pouces: float
+
+
+class Graduations(NamedTuple):
+    """Colonne de repères exacts de core.grille : entiers de graduations, 1/64 po (64) ou 0,1 mm (254)."""
+    valeurs: Tuple[int, ...]
+    par_pouce: int = constants.GRADUATIONS_POUCE
+
+
+class Cote(NamedTuple):
+    """Repère exact donné dans les deux unités."""
+    soixante_quatriemes: int
+    dixiemes_mm: int
+
+
+# --- Blocs, sections, rapport ---
+
+class Mesures(NamedTuple):
+    lignes: Tuple[Tuple[str, object], ...]  # (libellé, valeur)
+
+
+class Colonne(NamedTuple):
+    titre: str
+    valeurs: object  # tuple homogène de textes (ou de valeurs typées), ou Graduations
+
+
+class Tableau(NamedTuple):
+    """Tableau rangé par colonnes : une colonne de repères se met en forme d'un seul map."""
+    colonnes: Tuple[Colonne, ...]
+
+
+class Liste(NamedTuple):
+    elements: Tuple[Tuple[object, ...], ...]  # fragments : texte ou valeur typée
+    numerotee: bool = True
+
+
+class Texte(NamedTuple):
+    lignes: Tuple[str, ...]
 
 
+class Section(NamedTuple):
+    titre: str  # vide : pas d'en-tête de section
+    blocs: tuple
 
-def generer_texte_trace(resultats_calcul, app_preferences):
-    if not resultats_calcul or 'hauteur_reelle_contremarche' not in resultats_calcul:
-        return "Aucun résultat de calcul disponible pour générer le tracé."
+
+class Rapport(NamedTuple):
+    nom: str
+    titre: str
+    sections: Tuple[Section, ...] = ()
+    message: str = ""  # rapport impossible : seul ce message est rendu
+    pied: str = ""
+
+
+def _en_cache(construire):
+    """
+    Le modèle ne dépend que du StairResult (immuable et hachable) : il est
+    construit une fois par résultat, puis rendu autant de fois que nécessaire
+    (onglets, PDF, service, chaque format d'un export).
+    """
+    construire_en_cache = lru_cache(maxsize=TAILLE_CACHE_RAPPORTS)(construire)
+
+    @wraps(construire)
+    def rapport(resultats_calcul):
+        """Accepte un StairResult (ou l'ancien dictionnaire de résultats)."""
+        return construire_en_cache(StairResult.from_dict(resultats_calcul or {}))
+
+    rapport.cache_clear = construire_en_cache.cache_clear
+    return rapport
+
+
+# --- Construction ---
+
+@_en_cache
+def rapport_trace(r):
+    """Plan de traçage du limon."""
+    titre = "PLAN DE TRAÇAGE DU LIMON"
+    if not r.is_valid:
+        return Rapport("trace", titre, message="Aucun résultat de calcul disponible pour générer le tracé.")
 
     try:
-        h_reel = resultats_calcul['hauteur_reelle_contremarche'] or 0
-        giron = resultats_calcul.get('giron_utilise', 0) or 0
-        kwargs = resultats_calcul.get('kwargs', {})
-        ep_marche = kwargs.get('epaisseur_marche', 0) or 0
-        ep_plancher_sup = kwargs.get('epaisseur_plancher_sup', 0) or 0
-        nombre_cm = resultats_calcul.get('nombre_contremarches', 0) or 0
-        nombre_girons = resultats_calcul.get('nombre_girons')
+        h_reel = r.hauteur_reelle_contremarche or 0
+        giron = r.giron_utilise or 0
+        ep_marche = r.epaisseur_marche or 0
+        nombre_cm = r.nombre_contremarches or 0
+        nombre_girons = r.nombre_girons
         if nombre_girons in (None, 0) and nombre_cm:
             nombre_girons = max(nombre_cm - 1, 0)
-        longueur_totale = resultats_calcul.get('longueur_calculee_escalier', 0) or 0
-        blondel_value = resultats_calcul.get('blondel_value')
-
-        def df(value):
-            return decimal_to_fraction_str(value, app_preferences) if value not in (None, 0) else "N/A"
-
-        def df_mm(value):
-            return f"{value * constants.POUCE_EN_MM:.1f}" if value not in (None, 0) else "N/A"
-
-        def mesure(label, valeur):
-            if valeur in (None, 0):
-                return f"  {label:<30}: N/A"
-            return f"  {label:<30}: {df(valeur):>8}  (≈ {df_mm(valeur)} mm)"
-
-        def info(label, valeur):
-            return f"  {label:<30}: {valeur if valeur not in (None, 0) else 'N/A'}"
-
-        h_cm_bas = max(h_reel - ep_marche, 0)
-        largeur_document = 76
-        ligne_entete = "=" * largeur_document
-        ligne_section = "-" * largeur_document
-
-        hypot_unitaire = math.sqrt((h_reel ** 2) + (giron ** 2)) if h_reel and giron else 0
-        diagonale_lines = [
-            "SECTION DIAGONALE — HYPOTÉNUSES",
-            ligne_section,
-        ]
-        if hypot_unitaire:
-            diagonale_lines.append(
-                f"  Hypoténuse unitaire : {df(hypot_unitaire)}  (≈ {df_mm(hypot_unitaire)} mm)")
-            diagonale_lines.append("  ---------------------------------------------------------------")
-            diagonale_lines.append("  | CM # | Longueur cumulée (po) | Longueur cumulée (mm) |")
-            diagonale_lines.append("  ---------------------------------------------------------------")
-            cumul = hypot_unitaire
-            total_cm = max(int(nombre_cm), 1)
-            for idx in range(1, total_cm + 1):
-                diagonale_lines.append(
-                    f"  | CM {idx:>2} | {df(cumul):>21} | {df_mm(cumul):>21} |")
-                cumul += hypot_unitaire
-            diagonale_lines.append("  ---------------------------------------------------------------")
+        h_cm_bas = Longueur(max(h_reel - ep_marche, 0))
+        h_cm, g = Longueur(h_reel), Longueur(giron)
+
+        # Repères cumulés exacts sur la grille entière (1/64 po et 0,1 mm) : le
+        # dernier repère tombe sur la hauteur totale, sans dérive d'arrondi
+        mm = constants.DIXIEMES_MM_PAR_POUCE
+        reperes = disposition(r)
+        if reperes:
+            numeros, hauteurs, courses, hypotenuses = zip(*reperes)
+            _, hauteurs_mm, courses_mm, hypotenuses_mm = zip(*disposition(r, mm))
+            cm = Colonne("CM #", tuple(f"CM {numero:>2}" for numero in numeros))
+            perche = (
+                Tableau((
+                    cm,
+                    Colonne("Hauteur cumulée (po)", Graduations(hauteurs)),
+                    Colonne("(mm)", Graduations(hauteurs_mm, mm)),
+                    Colonne("Course cumulée (po)", Graduations(courses)),
+                    Colonne("(mm)", Graduations(courses_mm, mm)),
+                )),
+                Mesures((("Dernier repère (haut. totale)", Cote(hauteurs[-1], hauteurs_mm[-1])),)),
+            )
+            diagonale = (
+                Mesures((("Hypoténuse unitaire", Longueur(math.hypot(h_reel, giron))),)),
+                Tableau((
+                    cm,
+                    Colonne("Longueur cumulée (po)", Graduations(hypotenuses)),
+                    Colonne("Longueur cumulée (mm)", Graduations(hypotenuses_mm, mm)),
+                )),
+            )
         else:
-            diagonale_lines.append("  Hypoténuse non calculable (données insuffisantes)")
-        diagonale_lines.append("")
-
-        report_lines = [
-            ligne_entete,
-            "PLAN DE TRAÇAGE DU LIMON".center(largeur_document),
-            ligne_entete,
-            "",
-            "PARAMÈTRES PRINCIPAUX",
-            ligne_section,
-            info("Nombre de contremarches", nombre_cm),
-            info("Nombre de girons", nombre_girons),
-            mesure("Hauteur réelle contremarche", h_reel),
-            mesure("Giron utilisé", giron),
-            mesure("Épaisseur de marche", ep_marche),
-            mesure("Épaisseur plancher supérieur", ep_plancher_sup),
-            mesure("Longueur développée", longueur_totale),
-            mesure("Valeur Blondel (2H+G)", blondel_value),
-            "",
-        ] + diagonale_lines + [
-            "POINTS DE CONTRÔLE",
-            ligne_section,
-            mesure("Contremarche départ (bas)", h_cm_bas),
-            mesure("Contremarche arrivée (haut)", h_reel),
-            info("Tolérance hauteur successive", f"± {df(constants.HAUTEUR_CM_TOLERANCE_SUCCESSIVE)}"),
-            "",
-            "TRAÇAGE SUR LIMON GAUCHE (vue face)",
-            ligne_section,
-            "  1. Positionner le limon avec la face mur accessible.",
-            "  2. Aligner votre gabarit sur la marche d'arrivée (haut).",
-            f"  3. Reporter la première contremarche: {df(h_reel)}.",
-            f"  4. Alterner giron ({df(giron)}) et contremarche ({df(h_reel)}) pour chaque marche.",
-            f"  5. Ajuster la dernière contremarche en bas: {df(h_cm_bas)} (retirer l'épaisseur de marche).",
-            "",
-            "TRAÇAGE SUR LIMON DROIT (vue face)",
-            ligne_section,
-            "  1. Démarrer le traçage par le bas du limon.",
-            f"  2. Première contremarche (bas): {df(h_cm_bas)}.",
-            f"  3. Alterner giron ({df(giron)}) et contremarche ({df(h_reel)}).",
-            f"  4. Vérifier la dernière contremarche en haut: {df(h_reel)}.",
-            "",
-            "RAPPELS AVANT DÉCOUPE",
-            ligne_section,
-            "  - Vérifier les cotes réelles sur chantier avant découpe finale.",
-            "  - Contrôler l'équerrage du limon sur deux marches successives.",
-            "  - Identifier clairement les faces mur / extérieur sur la pièce.",
-            "",
-            "Révision générée automatiquement par le Calculateur Escalier.",
-            ligne_entete
-        ]
-
-        return "\n".join(report_lines)
+            perche = (Texte(("Repères non calculables (données insuffisantes)",)),)
+            diagonale = (Texte(("Hypoténuse non calculable (données insuffisantes)",)),)
+
+        sections = (
+            Section("PARAMÈTRES PRINCIPAUX", (Mesures((
+                ("Nombre de contremarches", nombre_cm),
+                ("Nombre de girons", nombre_girons),
+                ("Hauteur réelle contremarche", h_cm),
+                ("Giron utilisé", g),
+                ("Épaisseur de marche", Longueur(ep_marche)),
+                ("Épaisseur plancher supérieur", Longueur(r.epaisseur_plancher_sup)),
+                ("Longueur développée", Longueur(r.longueur_calculee_escalier)),
+                ("Valeur Blondel (2H+G)", Longueur(r.blondel_value)),
+            )),)),
+            Section("PERCHE D'ÉTAGE ET REPÈRES SUR LIMON (1/64 po, 0.1 mm)", perche),
+            Section("SECTION DIAGONALE — HYPOTÉNUSES", diagonale),
+            Section("POINTS DE CONTRÔLE", (Mesures((
+                ("Contremarche départ (bas)", h_cm_bas),
+                ("Contremarche arrivée (haut)", h_cm),
+                ("Tolérance hauteur successive", Tolerance(constants.HAUTEUR_CM_TOLERANCE_SUCCESSIVE)),
+            )),)),
+            Section("TRAÇAGE SUR LIMON GAUCHE (vue face)", (Liste((
+                ("Positionner le limon avec la face mur accessible.",),
+                ("Aligner votre gabarit sur la marche d'arrivée (haut).",),
+                ("Reporter la première contremarche: ", h_cm, "."),
+                ("Alterner giron (", g, ") et contremarche (", h_cm, ") pour chaque marche."),
+                ("Ajuster la dernière contremarche en bas: ", h_cm_bas, " (retirer l'épaisseur de marche)."),
+            )),)),
+            Section("TRAÇAGE SUR LIMON DROIT (vue face)", (Liste((
+                ("Démarrer le traçage par le bas du limon.",),
+                ("Première contremarche (bas): ", h_cm_bas, "."),
+                ("Alterner giron (", g, ") et contremarche (", h_cm, ")."),
+                ("Vérifier la dernière contremarche en haut: ", h_cm, "."),
+            )),)),
+            Section("RAPPELS AVANT DÉCOUPE", (Liste((
+                ("Vérifier les cotes réelles sur chantier avant découpe finale.",),
+                ("Contrôler l'équerrage du limon sur deux marches successives.",),
+                ("Identifier clairement les faces mur / extérieur sur la pièce.",),
+            ), numerotee=False),)),
+        )
+        return Rapport("trace", titre, sections, pied="Révision générée automatiquement par le Calculateur Escalier.")
 
     except (KeyError, TypeError, ValueError) as e:
-        return f"Erreur : Donnée manquante ou invalide pour générer le rapport. ({e})"
+        return Rapport("trace", titre, message=f"Erreur : Donnée manquante ou invalide pour générer le rapport. ({e})")
+
+
+@_en_cache
+def rapport_marches(r):
+    """Hypoténuse cumulée au milieu de chaque contremarche, sur la grille entière."""
+    titre = "TABLEAU 1 : HYPOTÉNUSE CUMULÉE"
+    hauteur_cm = r.hauteur_reelle_contremarche or 0
+    giron = r.giron_utilise or 0
+    nombre_cm = max(int(r.nombre_contremarches or 0), 0)
+    if hauteur_cm <= 0 or giron <= 0 or nombre_cm <= 0:
+        return Rapport("marches", titre, message="Données insuffisantes pour générer le tableau d'hypoténuse cumulée.")
+
+    hypotenuse_totale = math.hypot(hauteur_cm, giron) * nombre_cm
+    mm = constants.DIXIEMES_MM_PAR_POUCE
+    libelles = ["Contremarche 1 (pied)"] + [f"Contremarche {numero}" for numero in range(2, nombre_cm + 1)]
+    if nombre_cm > 1:
+        libelles[-1] += " (tête)"
+
+    return Rapport("marches", titre, (Section("", (
+        Texte((
+            "Chaque valeur correspond à la somme cumulative de l'hypoténuse calculée pour chaque contremarche.",
+            "La première ligne (Contremarche pied) correspond à la moitié de l'hypoténuse unitaire.",
+        )),
+        Tableau((
+            Colonne("Contremarche", tuple(libelles)),
+            Colonne("Hypoténuse cumulée (po)", Graduations(tuple(milieux(vers_grille(hypotenuse_totale), nombre_cm)))),
+            Colonne("Hypoténuse cumulée (mm)", Graduations(tuple(milieux(vers_grille(hypotenuse_totale, mm), nombre_cm)), mm)),
+        )),
+    )),))
+
+
+@_en_cache
+def rapport_parametres(r):
+    """Valeurs de référence utilisées par le calcul."""
+    titre = "TABLEAU 2 : PARAMÈTRES DE RÉFÉRENCE"
+    hauteur_cm = r.hauteur_reelle_contremarche or 0
+    giron = r.giron_utilise or 0
+    nombre_contremarches = r.nombre_contremarches or 0
+    if (r.hauteur_totale_escalier or 0) <= 0 or giron <= 0 or hauteur_cm <= 0:
+        return Rapport("parametres", titre, message="Données insuffisantes pour générer le tableau des paramètres de référence.")
+
+    nombre_girons = r.nombre_girons or max(nombre_contremarches - 1, 0)
+    return Rapport("parametres", titre, (Section("", (Mesures((
+        ("Nombre de contremarches", nombre_contremarches),
+        ("Hauteur réelle contremarche", Longueur(hauteur_cm)),
+        ("Giron utilisé", Longueur(giron)),
+        ("Longueur totale escalier", Longueur(nombre_girons * giron)),
+        ("Hypoténuse unitaire", Longueur(math.hypot(hauteur_cm, giron))),
+    )),)),))
+
+
+RAPPORTS = {"trace": rapport_trace, "parametres": rapport_parametres, "marches": rapport_marches}
+
+
+def rapport_complet(resultats_calcul, noms=tuple(RAPPORTS)):
+    """Les rapports `noms` réunis en un seul (une section par partie), pour les exports multi-formats."""
+    r = StairResult.from_dict(resultats_calcul or {})
+    if not r.is_valid:
+        return Rapport("complet", "RAPPORT D'ESCALIER", message="Aucun résultat de calcul disponible.")
+    sections = []
+    for nom in noms:
+        partie = RAPPORTS[nom](r)
+        if partie.message:
+            sections.append(Section(partie.titre, (Texte((partie.message,)),)))
+        else:
+            sections += [s._replace(titre=s.titre or partie.titre) for s in partie.sections]
+    return Rapport("complet", "RAPPORT D'ESCALIER", tuple(sections), pied=f"Calculateur d'Escalier Pro v{constants.VERSION_PROGRAMME}")
+
+
+# --- Mise en forme des valeurs ---
+
+@lru_cache(maxsize=TAILLE_CACHE_FRACTIONS)
+def _texte_mm_pouces(pouces):
+    """Pouces décimaux → millimètres au dixième, ex. 7.2 → '182.9'."""
+    return f"{pouces * constants.POUCE_EN_MM:.1f}"
 
-def generer_tableau_marches(resultats_calcul, app_preferences):
-    hauteur_cm = resultats_calcul.get("hauteur_reelle_contremarche", 0)
-    giron = resultats_calcul.get("giron_utilise", 0)
-    nombre_contremarches = resultats_calcul.get("nombre_contremarches", 0)
 
-    if hauteur_cm <= 0 or giron <= 0 or nombre_contremarches <= 0:
-        return "Données insuffisantes pour générer le tableau d'hypoténuse cumulée."
+class _Formateur:
+    def __init__(self, preferences, format_fraction):
+        self.preferences = preferences
+        self.format_fraction = format_fraction
 
-    import math
-    hypotenuse_unitaire = math.sqrt(hauteur_cm**2 + giron**2)
+    def fraction(self, pouces):
+        return self.format_fraction(pouces, self.preferences)
 
-    def df(val):
-        return decimal_to_fraction_str(val, app_preferences) if val is not None else "N/A"
+    def texte(self, valeur):
+        """Valeur dans une phrase ou une cellule."""
+        if isinstance(valeur, Longueur):
+            return self.fraction(valeur.pouces) if valeur.pouces else "N/A"
+        if isinstance(valeur, Cote):
+            return f"{texte_pouces(valeur.soixante_quatriemes)} ({texte_mm(valeur.dixiemes_mm)} mm)"
+        if isinstance(valeur, Tolerance):
+            return f"± {self.fraction(valeur.pouces)}"
+        return "N/A" if valeur in (None, 0) else str(valeur)
 
-    def df_mm(val):
-        return round(val * constants.POUCE_EN_MM) if val is not None else "N/A"
+    def mesure(self, valeur, largeur=0):
+        """Valeur d'une ligne de mesures : fraction puis équivalent en mm."""
+        espace = "  " if largeur else " "
+        if isinstance(valeur, Longueur) and valeur.pouces:
+            return f"{self.format_fraction(valeur.pouces, self.preferences):>{largeur}}{espace}(≈ {_texte_mm_pouces(valeur.pouces)} mm)"
+        if isinstance(valeur, Cote):
+            return f"{texte_pouces(valeur.soixante_quatriemes):>{largeur}}{espace}({texte_mm(valeur.dixiemes_mm)} mm)"
+        return self.texte(valeur)
 
-    nombre_cm = max(int(nombre_contremarches), 0)
+    def colonne(self, valeurs):
+        """Textes d'une colonne de tableau."""
+        if isinstance(valeurs, Graduations):
+            if valeurs.par_pouce == constants.DIXIEMES_MM_PAR_POUCE:
+                return list(map(texte_mm, valeurs.valeurs))
+            return list(map(texte_pouces, valeurs.valeurs, repeat(valeurs.par_pouce)))
+        if _a_gauche(valeurs):
+            return list(valeurs)
+        return list(map(self.texte, valeurs))
 
-    tableau_lines = [
-        "=== TABLEAU 1: HYPOTÉNUSE CUMULÉE ===",
-        "",
-        "Chaque valeur correspond à la somme cumulative de l'hypoténuse calculée pour chaque contremarche.",
-        "La première ligne (Contremarche pied) correspond à la moitié de l'hypoténuse unitaire.",
-        "",
-        "| **Contremarche** | **Hypoténuse cumulée (pouces)** | **Hypoténuse cumulée (mm)** |",
-        "|-----------------|----------------------------------|------------------------------|"
+    def phrase(self, fragments):
+        return "".join(f if isinstance(f, str) else self.texte(f) for f in fragments)
+
+
+def _nombres(valeur):
+    """(pouces, mm) d'une valeur typée pour le CSV ; vides si elle n'est pas une longueur."""
+    if isinstance(valeur, (Longueur, Tolerance)) and valeur.pouces is not None:
+        pouces = valeur.pouces
+    elif isinstance(valeur, Cote):
+        return valeur.soixante_quatriemes / constants.GRADUATIONS_POUCE, valeur.dixiemes_mm / 10
+    else:
+        return "", ""
+    return round(pouces, 6), round(pouces * constants.POUCE_EN_MM, 1)
+
+
+def _nombres_colonne(valeurs):
+    if isinstance(valeurs, Graduations):
+        return [(round(v / valeurs.par_pouce, 6), round(v * constants.POUCE_EN_MM / valeurs.par_pouce, 1)) for v in valeurs.valeurs]
+    return list(map(_nombres, valeurs))
+
+
+def _a_gauche(valeurs):
+    """Colonne de textes (alignée à gauche) plutôt que de valeurs (alignées à droite) ; les colonnes sont homogènes."""
+    return not isinstance(valeurs, Graduations) and (not valeurs or isinstance(valeurs[0], str))
+
+
+# --- Rendu texte à chasse fixe ---
+
+def _texte_tableau(bloc, f):
+    # Un gabarit de ligne par tableau, appliqué à toutes les lignes d'un seul map
+    entetes, formats, colonnes = [], [], []
+    for colonne in bloc.colonnes:
+        textes = f.colonne(colonne.valeurs)
+        largeur = max(len(colonne.titre), max(map(len, textes), default=0))
+        gauche = _a_gauche(colonne.valeurs)
+        entetes.append(colonne.titre.ljust(largeur) if gauche else colonne.titre.center(largeur))
+        formats.append(f"{{:{'<' if gauche else '>'}{largeur}}}")
+        colonnes.append(textes)
+    separateur = "  " + "-" * (sum(map(len, entetes)) + 3 * len(entetes) + 1)
+    gabarit = "  | " + " | ".join(formats) + " |"
+    return [separateur, gabarit.format(*entetes), separateur, *map(gabarit.format, *colonnes), separateur]
+
+
+_BLOCS_TEXTE = {
+    Mesures: lambda bloc, f: [f"  {libelle:<{LARGEUR_LIBELLE}}: {f.mesure(valeur, 8)}" for libelle, valeur in bloc.lignes],
+    Tableau: _texte_tableau,
+    Liste: lambda bloc, f: [
+        f"  {f'{i}.' if bloc.numerotee else '-'} {f.phrase(e)}" for i, e in enumerate(bloc.elements, 1)
+    ],
+    Texte: lambda bloc, f: [f"  {ligne}" for ligne in bloc.lignes],
+}
+
+
+def rendre_texte(rapport, preferences=None, format_fraction=decimal_to_fraction_str):
+    """Texte à chasse fixe (onglets de l'interface, PDF)."""
+    if rapport.message:
+        return rapport.message
+    f = _Formateur(preferences, format_fraction)
+    regle = "=" * LARGEUR_TEXTE
+    lignes = [regle, rapport.titre.center(LARGEUR_TEXTE), regle, ""]
+    for section in rapport.sections:
+        if section.titre:
+            lignes += [section.titre, "-" * LARGEUR_TEXTE]
+        for bloc in section.blocs:
+            lignes += _BLOCS_TEXTE[type(bloc)](bloc, f)
+        lignes.append("")
+    if rapport.pied:
+        lignes.append(rapport.pied)
+    lignes.append(regle)
+    return "\n".join(lignes)
+
+
+# --- Rendu Markdown ---
+
+def _md(texte):
+    return texte.replace("|", "\\|")
+
+
+def _markdown_tableau(bloc, f):
+    alignements = ["---" if _a_gauche(c.valeurs) else "---:" for c in bloc.colonnes]
+    colonnes = [map(_md, f.colonne(c.valeurs)) for c in bloc.colonnes]
+    return (
+        ["| " + " | ".join(f"**{_md(c.titre)}**" for c in bloc.colonnes) + " |", "|" + "|".join(alignements) + "|"]
+        + ["| " + " | ".join(cellules) + " |" for cellules in zip(*colonnes)]
+    )
+
+
+_BLOCS_MARKDOWN = {
+    Mesures: lambda bloc, f: [f"- **{libelle}** : {f.mesure(valeur)}" for libelle, valeur in bloc.lignes],
+    Tableau: _markdown_tableau,
+    Liste: lambda bloc, f: [f"{f'{i}.' if bloc.numerotee else '-'} {f.phrase(e)}" for i, e in enumerate(bloc.elements, 1)],
+    Texte: lambda bloc, f: ["  \n".join(bloc.lignes)],
+}
+
+
+def rendre_markdown(rapport, preferences=None, format_fraction=decimal_to_fraction_str):
+    if rapport.message:
+        return rapport.message
+    f = _Formateur(preferences, format_fraction)
+    lignes = [f"# {rapport.titre}", ""]
+    for section in rapport.sections:
+        if section.titre:
+            lignes += [f"## {section.titre}", ""]
+        for bloc in section.blocs:
+            lignes += _BLOCS_MARKDOWN[type(bloc)](bloc, f) + [""]
+    if rapport.pied:
+        lignes += [f"_{rapport.pied}_", ""]
+    return "\n".join(lignes)
+
+
+# --- Rendu HTML ---
+
+def _html(texte):
+    """Échappement d'un texte HTML (sans importer le module html, pour garder l'import léger)."""
+    return texte.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+_STYLE_HTML = (
+    "body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin:.5em 0}"
+    "th,td{border:1px solid #c5ccd6;padding:2px 8px}td.n{text-align:right}th{background:#eef1f5}"
+)
+
+
+def _html_tableau(bloc, f):
+    entete = "".join(f"<th>{_html(c.titre)}</th>" for c in bloc.colonnes)
+    colonnes = [
+        [f"<td>{_html(t)}</td>" if _a_gauche(c.valeurs) else f'<td class="n">{_html(t)}</td>' for t in f.colonne(c.valeurs)]
+        for c in bloc.colonnes
     ]
+    lignes = "".join("<tr>" + "".join(cellules) + "</tr>" for cellules in zip(*colonnes))
+    return f"<table><thead><tr>{entete}</tr></thead><tbody>{lignes}</tbody></table>"
+
+
+_BLOCS_HTML = {
+    Mesures: lambda bloc, f: "<table>" + "".join(
+        f'<tr><th>{_html(libelle)}</th><td class="n">{_html(f.mesure(valeur))}</td></tr>' for libelle, valeur in bloc.lignes
+    ) + "</table>",
+    Tableau: _html_tableau,
+    Liste: lambda bloc, f: ("<ol>" if bloc.numerotee else "<ul>") + "".join(
+        f"<li>{_html(f.phrase(e))}</li>" for e in bloc.elements
+    ) + ("</ol>" if bloc.numerotee else "</ul>"),
+    Texte: lambda bloc, f: "<p>" + "<br>".join(_html(ligne) for ligne in bloc.lignes) + "</p>",
+}
 
-    marche_pied_cum = hypotenuse_unitaire / 2
-    tableau_lines.append(f"| Contremarche 1 (pied) | {df(marche_pied_cum)} | {df_mm(marche_pied_cum)} |")
-
-    for cm_index in range(2, nombre_cm + 1):
-        hypotenuse_cumulee = marche_pied_cum + (cm_index - 1) * hypotenuse_unitaire
-        label = f"Contremarche {cm_index}"
-        if cm_index == nombre_cm:
-            label += " (tête)"
-        tableau_lines.append(f"| {label} | {df(hypotenuse_cumulee)} | {df_mm(hypotenuse_cumulee)} |")
-
-    return "\n".join(tableau_lines)
-def generer_tableau_parametres(resultats_calcul, app_preferences):
-    hauteur_totale = resultats_calcul.get("hauteur_totale_escalier", 0)
-    giron = resultats_calcul.get("giron_utilise", 0)
-    hauteur_cm = resultats_calcul.get("hauteur_reelle_contremarche", 0)
-    nombre_contremarches = resultats_calcul.get("nombre_contremarches", 0)
-    nombre_girons = resultats_calcul.get("nombre_girons", 0)
-
-    if hauteur_totale <= 0 or giron <= 0 or hauteur_cm <= 0:
-        return "Données insuffisantes pour générer le tableau des paramètres de référence."
-
-    import math
-    hypotenuse_unitaire = math.sqrt(hauteur_cm**2 + giron**2)
-
-    def df(val):
-        return decimal_to_fraction_str(val, app_preferences) if val is not None else "N/A"
-
-    def df_mm(val):
-        return round(val * constants.POUCE_EN_MM) if val is not None else "N/A"
-
-    stride = giron
-    hcm = hauteur_cm
-    nombre_girons_effectif = nombre_girons if nombre_girons else max(nombre_contremarches - 1, 0)
-    longueur_totale = nombre_girons_effectif * stride
-    tableau_lines = [
-        "=== TABLEAU 2: PARAMÈTRES DE RÉFÉRENCE ===",
-        "",
-        f"Nombre de contremarches : {nombre_contremarches}",
-        f"Hauteur réelle contremarche : {df(hcm)} (≈ {df_mm(hcm)} mm)",
-        f"Giron utilisé : {df(stride)} (≈ {df_mm(stride)} mm)",
-        f"Longueur totale escalier : {df(longueur_totale)}",
-        f"Hypoténuse unitaire : {df(hypotenuse_unitaire)} (≈ {df_mm(hypotenuse_unitaire)} mm)",
+
+def rendre_html(rapport, preferences=None, format_fraction=decimal_to_fraction_str):
+    """Document HTML autonome (styles en ligne, aucune ressource externe)."""
+    titre = _html(rapport.titre)
+    morceaux = [
+        f'<!DOCTYPE html>\n<html lang="fr">\n<head><meta charset="utf-8"><title>{titre}</title>'
+        f"<style>{_STYLE_HTML}</style></head>\n<body>\n<h1>{titre}</h1>"
     ]
+    if rapport.message:
+        morceaux.append(f"<p>{_html(rapport.message)}</p>")
+    else:
+        f = _Formateur(preferences, format_fraction)
+        for section in rapport.sections:
+            if section.titre:
+                morceaux.append(f"<h2>{_html(section.titre)}</h2>")
+            morceaux += [_BLOCS_HTML[type(bloc)](bloc, f) for bloc in section.blocs]
+        if rapport.pied:
+            morceaux.append(f"<p><em>{_html(rapport.pied)}</em></p>")
+    morceaux.append("</body>\n</html>\n")
+    return "\n".join(morceaux)
+
+
+# --- Rendu CSV (une ligne par valeur, nombres bruts en pouces et en mm) ---
+
+def _lignes_csv(section, bloc, f):
+    if isinstance(bloc, Mesures):
+        for libelle, valeur in bloc.lignes:
+            yield (section, libelle, "", f.texte(valeur)) + _nombres(valeur)
+    elif isinstance(bloc, Tableau):
+        premiere, *autres = bloc.colonnes
+        libelles = f.colonne(premiere.valeurs)
+        for colonne in autres:
+            for libelle, texte, nombres in zip(libelles, f.colonne(colonne.valeurs), _nombres_colonne(colonne.valeurs)):
+                yield (section, libelle, colonne.titre, texte) + nombres
+    elif isinstance(bloc, Liste):
+        for numero, element in enumerate(bloc.elements, 1):
+            yield section, numero, "", f.phrase(element), "", ""
+    else:
+        for ligne in bloc.lignes:
+            yield section, "", "", ligne, "", ""
+
+
+def rendre_csv(rapport, preferences=None, format_fraction=decimal_to_fraction_str):
+    import csv
+
+    flux = io.StringIO()
+    ecrivain = csv.writer(flux, lineterminator="\n")
+    ecrivain.writerow(COLONNES_CSV)
+    if rapport.message:
+        ecrivain.writerow((rapport.titre, "", "", rapport.message, "", ""))
+    else:
+        f = _Formateur(preferences, format_fraction)
+        for section in rapport.sections:
+            for bloc in section.blocs:
+                ecrivain.writerows(_lignes_csv(section.titre or rapport.titre, bloc, f))
+    return flux.getvalue()
+
+
+# Format → (fonction de rendu, extension de fichier)
+FORMATS = {
+    "texte": (rendre_texte, ".txt"),
+    "markdown": (rendre_markdown, ".md"),
+    "html": (rendre_html, ".html"),
+    "csv": (rendre_csv, ".csv"),
+}
+
+
+def rendre_formats(rapport, formats=tuple(FORMATS), preferences=None, format_fraction=decimal_to_fraction_str):
+    """Le même rapport (calculé une fois) rendu dans chaque format : {format: texte}."""
+    return {nom: FORMATS[nom][0](rapport, preferences, format_fraction) for nom in formats}
+
+
+def exporter_rapports(resultats_calcul, preferences, chemin_base, formats=tuple(FORMATS)):
+    """
+    Écrit le rapport complet dans `chemin_base` + extension, pour chaque
+    format, à partir d'un seul calcul. Retourne la liste des fichiers écrits.
+    """
+    chemins = []
+    for nom, texte in rendre_formats(rapport_complet(resultats_calcul), formats, preferences).items():
+        chemin = chemin_base + FORMATS[nom][1]
+        with open(chemin, "w", encoding="utf-8", newline="") as f:
+            f.write(texte)
+        chemins.append(chemin)
+    return chemins
+
+
+# --- Textes des onglets (rendu texte de chaque rapport) ---
+
+def generer_texte_trace(resultats_calcul, app_preferences, format_fraction=decimal_to_fraction_str):
+    """Plan de traçage du limon ; accepte un StairResult (ou l'ancien dictionnaire de résultats)."""
+    return rendre_texte(rapport_trace(resultats_calcul), app_preferences, format_fraction)
+
+
+def generer_tableau_marches(resultats_calcul, app_preferences, format_fraction=decimal_to_fraction_str):
+    return rendre_texte(rapport_marches(resultats_calcul), app_preferences, format_fraction)
 
-    return "\n".join(tableau_lines)
 
+def generer_tableau_parametres(resultats_calcul, app_preferences, format_fraction=decimal_to_fraction_str):
+    return rendre_texte(rapport_parametres(resultats_calcul), app_preferences, format_fraction)
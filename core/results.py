@@ -0,0 +1,311 @@
+# Fichier: core/results.py
+
+"""
+Type de résultat compact retourné par `calculer_escalier_ajuste`.
+
+`StairResult` est un NamedTuple immuable : les valeurs numériques sont des
+champs, et le statut de chaque règle est dérivé à la demande du masque de
+conformité du moteur vectorisé (un seul entier stocké). `as_dict()` reconstruit
+l'ancien dictionnaire `results` pour le code qui l'attend encore.
+
+Les avertissements sont eux aussi dérivés du masque, sous forme
+d'enregistrements `Avertissement` (règle, statut, valeur mesurée, bornes) ;
+le texte français n'est formaté que par `Avertissement.texte`, au moment de
+l'affichage. Un appelant qui ne lit que `is_conform` ne paie aucun formatage.
+"""
+
+from enum import IntEnum
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from core import constants
+from core import vectorized
+from core.formatting import decimal_to_fraction_str
+
+
+class RuleStatus(IntEnum):
+    """Statut d'une règle de conformité."""
+    OK = 0
+    CONFORT_LIMITE = 1
+    NON_CONFORME = 2
+    NON_VERIFIE = 3
+    HORS_ZONE = 4
+
+
+# Règle → ((bit du masque, statut), ...) par ordre de priorité
+_BITS_REGLES = {
+    "hauteur_cm": ((vectorized.HAUTEUR_CM_NON_CONFORME, RuleStatus.NON_CONFORME),
+                   (vectorized.HAUTEUR_CM_CONFORT_LIMITE, RuleStatus.CONFORT_LIMITE)),
+    "giron": ((vectorized.GIRON_NON_CONFORME, RuleStatus.NON_CONFORME),
+              (vectorized.GIRON_CONFORT_LIMITE, RuleStatus.CONFORT_LIMITE)),
+    "blondel": ((vectorized.BLONDEL_NON_CONFORME, RuleStatus.NON_CONFORME),),
+    "echappee": ((vectorized.ECHAPPEE_DONNEES_INCOMPLETES, RuleStatus.NON_VERIFIE),
+                 (vectorized.ECHAPPEE_HORS_ZONE, RuleStatus.HORS_ZONE),
+                 (vectorized.ECHAPPEE_NON_CONFORME, RuleStatus.NON_CONFORME)),
+    "longueur_disponible": ((vectorized.LONGUEUR_ESPACE_NON_RENSEIGNE, RuleStatus.NON_VERIFIE),
+                            (vectorized.LONGUEUR_DEPASSE_ESPACE, RuleStatus.NON_CONFORME)),
+    "angle": ((vectorized.ANGLE_TRES_RAIDE, RuleStatus.NON_CONFORME),
+              (vectorized.ANGLE_CONFORT_LIMITE, RuleStatus.CONFORT_LIMITE)),
+    "hauteur_totale_ecart": ((vectorized.HAUTEUR_TOTALE_ECART, RuleStatus.CONFORT_LIMITE),),
+}
+
+# Libellés affichés pour chaque statut (ceux de l'interface et des rapports)
+_MESSAGES_REGLES = {
+    "hauteur_cm": {RuleStatus.OK: "OPTIMAL", RuleStatus.CONFORT_LIMITE: "Confort Limité",
+                   RuleStatus.NON_CONFORME: "NON CONFORME"},
+    "giron": {RuleStatus.OK: "OK", RuleStatus.CONFORT_LIMITE: "Confort Limité",
+              RuleStatus.NON_CONFORME: "NON CONFORME"},
+    "blondel": {RuleStatus.OK: "OK", RuleStatus.NON_CONFORME: "NON CONFORME"},
+    "echappee": {RuleStatus.OK: "OK", RuleStatus.NON_CONFORME: "NON CONFORME",
+                 RuleStatus.NON_VERIFIE: "Données trémie incomplètes",
+                 RuleStatus.HORS_ZONE: "Trémie hors zone ou données manquantes."},
+    "longueur_disponible": {RuleStatus.OK: "OK", RuleStatus.NON_CONFORME: "DÉPASSE ESPACE DISPO",
+                            RuleStatus.NON_VERIFIE: "Espace non renseigné"},
+    "angle": {RuleStatus.OK: "OPTIMAL", RuleStatus.CONFORT_LIMITE: "Confort Limité",
+              RuleStatus.NON_CONFORME: "TRÈS RAIDE"},
+    "hauteur_totale_ecart": {RuleStatus.OK: "Nul"},
+}
+
+REGLES = tuple(_BITS_REGLES)
+REGLE_DONNEES = "donnees"
+
+
+class Avertissement(NamedTuple):
+    """Avertissement structuré ; `texte()` en produit le message français."""
+    regle: str
+    statut: RuleStatus
+    valeur: Optional[float] = None
+    borne_min: Optional[float] = None
+    borne_max: Optional[float] = None
+    reference: Optional[float] = None
+    detail: str = ""
+
+    def texte(self, preferences=None):
+        def df(valeur):
+            return decimal_to_fraction_str(valeur, preferences)
+        return _RENDUS[(self.regle, self.statut)](self, df)
+
+
+_RENDUS = {
+    (REGLE_DONNEES, RuleStatus.NON_CONFORME): lambda a, df: a.detail,
+    ("hauteur_cm", RuleStatus.NON_CONFORME): lambda a, df:
+        f"Hauteur réelle CM ({df(a.valeur)}\") est hors normes ({df(a.borne_min)}\" à {df(a.borne_max)}\").",
+    ("hauteur_cm", RuleStatus.CONFORT_LIMITE): lambda a, df:
+        f"Hauteur réelle CM ({df(a.valeur)}\") a un confort limité (cible: {df(a.reference)}\").",
+    ("giron", RuleStatus.NON_CONFORME): lambda a, df:
+        f"Giron utilisé ({df(a.valeur)}\") est hors normes ({df(a.borne_min)}\" à {df(a.borne_max)}\").",
+    ("giron", RuleStatus.CONFORT_LIMITE): lambda a, df:
+        f"Giron utilisé ({df(a.valeur)}\") a un confort limité (recommandé: >{df(a.borne_min)}\").",
+    ("blondel", RuleStatus.NON_CONFORME): lambda a, df:
+        f"Loi de Blondel ({df(a.valeur)}\") est hors normes ({df(a.borne_min)}\" à {df(a.borne_max)}\").",
+    ("echappee", RuleStatus.NON_CONFORME): lambda a, df:
+        f"Échappée calculée ({df(a.valeur)}\") est inférieure à la norme ({df(a.borne_min)}\").",
+    ("longueur_disponible", RuleStatus.NON_VERIFIE): lambda a, df:
+        "L'espace disponible n'est pas renseigné, la longueur de l'escalier n'est pas vérifiée.",
+    ("longueur_disponible", RuleStatus.NON_CONFORME): lambda a, df:
+        f"Longueur de l'escalier ({df(a.valeur)}\") dépasse l'espace disponible ({df(a.borne_max)}\").",
+    ("angle", RuleStatus.NON_CONFORME): lambda a, df:
+        f"L'angle de l'escalier ({a.valeur:.2f}°) est très raide (recommandé <{a.borne_max}°).",
+    ("angle", RuleStatus.CONFORT_LIMITE): lambda a, df:
+        f"L'angle de l'escalier ({a.valeur:.2f}°) a un confort limité (recommandé <{a.borne_max}°).",
+    ("hauteur_totale_ecart", RuleStatus.CONFORT_LIMITE): lambda a, df:
+        f"La hauteur totale saisie ({df(a.reference)}\") diffère de la hauteur réelle de {df(a.valeur)}\" (Hauteur CM * Nb CM).",
+}
+
+_CHAMPS_NUMERIQUES = (
+    "hauteur_totale_escalier",
+    "hauteur_reelle_contremarche",
+    "giron_utilise",
+    "nombre_contremarches",
+    "nombre_girons",
+    "longueur_calculee_escalier",
+    "angle_escalier",
+    "longueur_limon_approximative",
+    "min_echappee_calculee",
+    "blondel_value",
+)
+_CHAMPS_EPAISSEURS = ("epaisseur_marche", "epaisseur_plancher_sup", "epaisseur_plancher_inf")
+
+# Libellé affiché → statut, pour relire les `*_message` d'un ancien dictionnaire
+_STATUTS_MESSAGES = {
+    regle: {texte: statut for statut, texte in messages.items()} for regle, messages in _MESSAGES_REGLES.items()
+}
+
+
+def _bit(regle, statut):
+    return next((bit for bit, statut_bit in _BITS_REGLES[regle] if statut_bit == statut), 0)
+
+
+def _masque_ancien_dict(resultats, valeurs):
+    """
+    Masque d'un ancien dictionnaire `results` : pour chaque règle, le statut
+    de son libellé `*_message` ; à défaut, le verdict recalculé à partir des
+    valeurs. L'espace disponible et la trémie n'étant pas dans l'ancien
+    dictionnaire, la longueur et l'échappée sans libellé sont « non vérifiées ».
+    """
+    h, g = np.float64(valeurs["hauteur_reelle_contremarche"]), np.float64(valeurs["giron_utilise"])
+    echappee, angle = valeurs["min_echappee_calculee"], valeurs["angle_escalier"]
+    recalcules = {
+        "hauteur_cm": lambda: vectorized._verifier_hauteur_cm(h),
+        "giron": lambda: vectorized._verifier_giron(g),
+        "blondel": lambda: vectorized._verifier_blondel(h, g)[1],
+        "echappee": lambda: (
+            vectorized.ECHAPPEE_DONNEES_INCOMPLETES if echappee is None
+            else _bit("echappee", RuleStatus.NON_CONFORME) if echappee < constants.HAUTEUR_LIBRE_MIN_REGLEMENTAIRE
+            else 0
+        ),
+        "longueur_disponible": lambda: vectorized.LONGUEUR_ESPACE_NON_RENSEIGNE,
+        "angle": lambda: 0 if angle is None else vectorized._verifier_angle(np.float64(angle)),
+        "hauteur_totale_ecart": lambda: 0,
+    }
+    masque = 0
+    for regle in REGLES:
+        message = resultats.get(f"{regle}_message")
+        statut = _STATUTS_MESSAGES[regle].get(message)
+        if statut is None and regle == "hauteur_totale_ecart" and str(message).startswith("Écart"):
+            statut = RuleStatus.CONFORT_LIMITE
+        masque |= _bit(regle, statut) if statut is not None else int(recalcules[regle]())
+    return masque
+
+
+
+class StairResult(NamedTuple):
+    hauteur_totale_escalier: Optional[float] = None
+    hauteur_reelle_contremarche: Optional[float] = None
+    giron_utilise: Optional[float] = None
+    nombre_contremarches: Optional[int] = None
+    nombre_girons: Optional[int] = None
+    longueur_calculee_escalier: Optional[float] = None
+    angle_escalier: Optional[float] = None
+    longueur_limon_approximative: Optional[float] = None
+    min_echappee_calculee: Optional[float] = None
+    blondel_value: Optional[float] = None
+    ecart_hauteur: float = 0.0
+    epaisseur_marche: Optional[float] = None
+    epaisseur_plancher_sup: Optional[float] = None
+    epaisseur_plancher_inf: Optional[float] = None
+    espace_disponible: float = 0.0
+    profondeur_tremie: float = 0.0
+    position_tremie: float = 0.0
+    masque: int = vectorized.DONNEES_INVALIDES
+    erreur: str = ""
+
+    @property
+    def is_conform(self):
+        return (self.masque & vectorized.MASQUE_NON_CONFORME) == 0
+
+    @property
+    def is_valid(self):
+        """Faux si les entrées n'ont pas pu être calculées (format ou valeur invalide)."""
+        return not self.masque & vectorized.DONNEES_INVALIDES
+
+    def statut(self, regle):
+        """Statut (RuleStatus) d'une règle de REGLES."""
+        for bit, statut in _BITS_REGLES[regle]:
+            if self.masque & bit:
+                return statut
+        return RuleStatus.OK
+
+    @property
+    def statuts(self):
+        return {regle: self.statut(regle) for regle in REGLES}
+
+    @property
+    def avertissements(self):
+        """Avertissements structurés (tuple d'Avertissement), sans aucun formatage de texte."""
+        if not self.is_valid:
+            return (Avertissement(REGLE_DONNEES, RuleStatus.NON_CONFORME, detail=self.erreur),)
+        c = constants
+        avertissements = []
+        for regle in REGLES:
+            statut = self.statut(regle)
+            if statut == RuleStatus.OK:
+                continue
+            if regle == "hauteur_cm" and statut == RuleStatus.NON_CONFORME:
+                a = (self.hauteur_reelle_contremarche, c.HAUTEUR_CM_MIN_REGLEMENTAIRE, c.HAUTEUR_CM_MAX_REGLEMENTAIRE, None)
+            elif regle == "hauteur_cm":
+                a = (self.hauteur_reelle_contremarche, None, None, c.HAUTEUR_CM_CONFORT_CIBLE)
+            elif regle == "giron" and statut == RuleStatus.NON_CONFORME:
+                a = (self.giron_utilise, c.GIRON_MIN_REGLEMENTAIRE, c.GIRON_MAX_REGLEMENTAIRE, None)
+            elif regle == "giron":
+                a = (self.giron_utilise, c.GIRON_CONFORT_MIN_RES_STANDARD, None, None)
+            elif regle == "blondel":
+                a = (self.blondel_value, c.BLONDEL_MIN_POUCES, c.BLONDEL_MAX_POUCES, None)
+            elif regle == "echappee":
+                if statut != RuleStatus.NON_CONFORME:
+                    continue  # Trémie absente ou hors zone : statut seul, pas d'avertissement
+                a = (self.min_echappee_calculee, c.HAUTEUR_LIBRE_MIN_REGLEMENTAIRE, None, None)
+            elif regle == "longueur_disponible":
+                a = (self.longueur_calculee_escalier, None, self.espace_disponible or None, None)
+            elif regle == "angle" and statut == RuleStatus.NON_CONFORME:
+                a = (self.angle_escalier, None, c.ANGLE_CONFORT_RAIDE_MAIS_CONFORME_MAX, None)
+            elif regle == "angle":
+                a = (self.angle_escalier, None, c.ANGLE_CONFORT_STANDARD_MAX, None)
+            else:
+                a = (self.ecart_hauteur, None, vectorized.TOLERANCE_ECART_HAUTEUR, self.hauteur_totale_escalier)
+            avertissements.append(Avertissement(regle, statut, *a))
+        return tuple(avertissements)
+
+    def textes_avertissements(self, preferences=None):
+        """Messages français des avertissements (formatés à l'appel)."""
+        return [a.texte(preferences) for a in self.avertissements]
+
+    @property
+    def warnings(self):
+        """
+        Messages français (compatibilité avec l'ancien `warnings`), formatés
+        sans les préférences de l'utilisateur : les appelants qui en ont
+        (interface, lot, service) utilisent `textes_avertissements(preferences)`.
+        """
+        return self.textes_avertissements()
+
+    def message(self, regle):
+        """Libellé court d'une règle, tel qu'affiché dans l'interface."""
+        if not self.is_valid:
+            return ""
+        statut = self.statut(regle)
+        if regle == "hauteur_totale_ecart" and statut != RuleStatus.OK:
+            return f"Écart: {decimal_to_fraction_str(self.ecart_hauteur)}\""
+        return _MESSAGES_REGLES[regle][statut]
+
+    def profil_echappee(self, points=200):
+        """Profil d'échappée (tableaux aux nez et le long de la ligne de foulée), voir vectorized.profil_echappee."""
+        if not self.is_valid:
+            return None
+        return vectorized.profil_echappee(
+            self.hauteur_totale_escalier,
+            self.hauteur_reelle_contremarche,
+            self.giron_utilise,
+            self.nombre_contremarches,
+            self.epaisseur_plancher_sup or 0.0,
+            self.profondeur_tremie or 0.0,
+            self.position_tremie or 0.0,
+            points=points,
+        )
+
+    def as_dict(self):
+        """Vue dictionnaire compatible avec l'ancien `results` de calculer_escalier_ajuste."""
+        resultat = {champ: getattr(self, champ) for champ in _CHAMPS_NUMERIQUES}
+        for regle in REGLES:
+            resultat[f"{regle}_message"] = self.message(regle)
+        resultat["kwargs"] = {
+            champ: getattr(self, champ) for champ in _CHAMPS_EPAISSEURS if getattr(self, champ) is not None
+        }
+        return resultat
+
+    @classmethod
+    def from_dict(cls, resultats):
+        """
+        Construit un StairResult à partir d'un ancien dictionnaire `results` ;
+        le statut des règles est relu de ses libellés `*_message`.
+        """
+        if isinstance(resultats, cls):
+            return resultats
+        kwargs = resultats.get("kwargs") or {}
+        valeurs = {champ: resultats.get(champ) for champ in _CHAMPS_NUMERIQUES}
+        valeurs.update({champ: kwargs.get(champ) for champ in _CHAMPS_EPAISSEURS})
+        valide = all(valeurs[champ] is not None for champ in ("hauteur_reelle_contremarche", "giron_utilise"))
+        if not valide:
+            return cls(**valeurs, masque=vectorized.DONNEES_INVALIDES)
+        return cls(**valeurs, masque=_masque_ancien_dict(resultats, valeurs))
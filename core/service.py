@@ -0,0 +1,340 @@
+# Fichier: core/service.py
+
+"""
+Service HTTP/JSON local (asyncio, sans dépendance) autour du moteur, pour les
+modules CAO et les devis qui ont besoin des résultats sans lancer l'interface.
+
+Usage :
+    python -m core.service --port 8765
+    python -m core.service --port 8765 --cache 4096 --workers 4
+    python -m core.service --cache-disque      # + cache persistant data/cache_resultats.sqlite
+
+Routes (corps et réponses en JSON) :
+    GET  /sante     état du service et statistiques du cache
+    POST /calcul    un travail (colonnes de core.batch.COLONNES_ENTREE, "unite"
+                    et "id" facultatifs) → ligne de résultat, comme core.batch
+    POST /rapport   un travail + "rapport" ("trace", "marches" ou "parametres")
+                    et "format" facultatif ("texte", "markdown", "html" ou "csv")
+                    → {"rapport": ..., "format": ..., "texte": ...}
+    POST /laser     {"hls", "hg", "hd", "bg", "bd", "unite"}
+                    → résultat de calculer_hauteur_totale_par_laser
+    POST /coupe     {"rayon_mm", "epaisseur_mm", "profondeur_mm", "angle": 90 | 45}
+                    → {"H_val", "message"}
+    POST /lot       {"travaux": [travail, ...]} → {"resultats": [ligne, ...]}
+
+Les réponses de /calcul, /rapport, /laser et /coupe sont gardées dans un cache
+LRU borné, indexé sur les entrées normalisées ("9.25" et " 9 1/4" donnent la
+même clé). Avec --cache-disque, les calculs, rapports et lots passent en plus
+par le cache persistant de core.cache_resultats. Les lots sont calculés par
+paquets dans un pool de processus, pour que les gros lots ne bloquent pas les
+autres clients.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from core import constants
+from core import coupe
+from core import reporting
+from core.batch import TAILLE_PAQUET, _traiter_paquet, arguments_travail, calculer_travail, traiter_travail
+from core.cache_resultats import FICHIER_CACHE, CacheResultats
+from core.calculations import calculer_hauteur_totale_par_laser
+from core.formatting import parser_fraction
+from core.preferences import CLES_FORMATAGE, CLES_RESULTATS, PREFERENCES
+
+HOTE = "127.0.0.1"
+PORT = 8765
+TAILLE_CACHE = 4096
+TAILLE_MAX_REQUETE = 16 * 1024 * 1024  # octets
+
+# Champs qui ne sont jamais des mesures (clé de cache : texte tel quel)
+_CHAMPS_TEXTE = {"unite", "rapport", "format", "nombre_marches", "nombre_cm"}
+
+_RAISONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ErreurRequete(Exception):
+    def __init__(self, statut, message):
+        super().__init__(message)
+        self.statut = statut
+
+
+class CacheLRU:
+    """Dictionnaire borné : au-delà de `taille` entrées, la moins récemment utilisée est retirée."""
+
+    def __init__(self, taille=TAILLE_CACHE):
+        self.taille = taille
+        self._entrees = OrderedDict()
+        self.stats = {"succes": 0, "echecs": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, cle):
+        try:
+            valeur = self._entrees[cle]
+        except KeyError:
+            self.stats["echecs"] += 1
+            return None
+        self._entrees.move_to_end(cle)
+        self.stats["succes"] += 1
+        return valeur
+
+    def put(self, cle, valeur):
+        self._entrees[cle] = valeur
+        self._entrees.move_to_end(cle)
+        if len(self._entrees) > self.taille:
+            self._entrees.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def retirer(self, condition):
+        """Retire les entrées dont la clé vérifie `condition`."""
+        cles = [cle for cle in self._entrees if condition(cle)]
+        for cle in cles:
+            del self._entrees[cle]
+        self.stats["invalidations"] += len(cles)
+
+    def __len__(self):
+        return len(self._entrees)
+
+
+def _normaliser(valeur):
+    """Valeur d'entrée → forme canonique : mesure parsée si possible, sinon texte sans espaces superflus."""
+    if isinstance(valeur, (int, float)) and not isinstance(valeur, bool):
+        return float(valeur)
+    texte = " ".join(str(valeur).split())
+    try:
+        return parser_fraction(texte) if texte else ""
+    except ValueError:
+        return texte
+
+
+def cle_cache(route, corps):
+    """Clé de cache d'une requête : la route et ses entrées normalisées (l'"id" n'en fait pas partie)."""
+    return (route,) + tuple(sorted(
+        (champ, " ".join(str(valeur).split()) if champ in _CHAMPS_TEXTE else _normaliser(valeur))
+        for champ, valeur in corps.items()
+        if champ != "id" and valeur is not None
+    ))
+
+
+def _nombre(corps, champ):
+    try:
+        return float(parser_fraction(str(corps[champ])))
+    except KeyError:
+        raise ErreurRequete(400, f"Champ manquant : {champ}")
+    except ValueError as e:
+        raise ErreurRequete(400, f"Valeur invalide pour {champ} : {e}")
+
+
+class ServiceEscalier:
+    def __init__(self, preferences=None, taille_cache=TAILLE_CACHE, workers=None, chemin_cache_disque=None):
+        self._preferences = preferences
+        if preferences is None:
+            PREFERENCES.abonner(self._preferences_modifiees, CLES_RESULTATS | CLES_FORMATAGE)
+        self.cache = CacheLRU(taille_cache)
+        self.chemin_cache_disque = chemin_cache_disque
+        self.cache_disque = CacheResultats(chemin_cache_disque) if chemin_cache_disque else None
+        self.workers = workers
+        self._executeur = None
+        self.requetes = 0
+
+    @property
+    def preferences(self):
+        """Préférences données à la création, sinon celles du magasin (relues si le fichier change)."""
+        return self._preferences if self._preferences is not None else PREFERENCES.instantane()
+
+    def _preferences_modifiees(self, instantane, modifiees):
+        # Les clés du cache LRU ne contiennent pas les préférences : toutes les
+        # routes en dépendent (valeurs, ou fractions des textes et avertissements)
+        self.cache.retirer(lambda cle: cle[0] in ("/calcul", "/rapport", "/laser"))
+
+    # --- Routes ---
+
+    def _calcul(self, corps):
+        ligne = traiter_travail(corps, self.preferences, cache=self.cache_disque)
+        ligne.pop("id", None)
+        return ligne
+
+    def _rapport(self, corps):
+        nom = corps.get("rapport", "trace")
+        if nom not in reporting.RAPPORTS:
+            raise ErreurRequete(400, f"Rapport inconnu : {nom} (attendu : {', '.join(reporting.RAPPORTS)})")
+        format_sortie = corps.get("format", "texte")
+        if format_sortie not in reporting.FORMATS:
+            raise ErreurRequete(400, f"Format inconnu : {format_sortie} (attendu : {', '.join(reporting.FORMATS)})")
+        resultat = calculer_travail(corps, self.preferences, cache=self.cache_disque)
+
+        def generer():
+            rendre = reporting.FORMATS[format_sortie][0]
+            return rendre(reporting.RAPPORTS[nom](resultat), self.preferences)
+
+        if self.cache_disque is None:
+            texte = generer()
+        else:
+            texte = self.cache_disque.rapport(
+                f"{nom}.{format_sortie}", arguments_travail(corps, self.preferences), self.preferences, corps.get("unite") or "Pouces", generer,
+            )
+        return {"rapport": nom, "format": format_sortie, "texte": texte, "erreur": resultat.erreur}
+
+    def _laser(self, corps):
+        mesures = [str(corps.get(champ, "")) for champ in ("hls", "hg", "hd", "bg", "bd")]
+        return calculer_hauteur_totale_par_laser(*mesures, self.preferences, unite=corps.get("unite") or "Pouces")
+
+    def _coupe(self, corps):
+        angle = int(_nombre(corps, "angle")) if "angle" in corps else 90
+        if angle not in (90, 45):
+            raise ErreurRequete(400, "L'angle doit valoir 90 ou 45")
+        fonction = coupe.calculer_H90_mm if angle == 90 else coupe.calculer_H45_mm
+        return fonction(_nombre(corps, "rayon_mm"), _nombre(corps, "epaisseur_mm"), _nombre(corps, "profondeur_mm"))
+
+    async def _lot(self, corps):
+        travaux = corps.get("travaux")
+        if not isinstance(travaux, list) or not all(isinstance(travail, dict) for travail in travaux):
+            raise ErreurRequete(400, "\"travaux\" doit être une liste d'objets")
+        if self._executeur is None:
+            self._executeur = ProcessPoolExecutor(max_workers=self.workers)
+        boucle = asyncio.get_running_loop()
+        paquets = [travaux[i:i + TAILLE_PAQUET] for i in range(0, len(travaux), TAILLE_PAQUET)]
+        lignes = await asyncio.gather(*(
+            boucle.run_in_executor(
+                self._executeur, _traiter_paquet, paquet, self.preferences, "Pouces", self.chemin_cache_disque
+            )
+            for paquet in paquets
+        ))
+        return {"resultats": [ligne for paquet in lignes for ligne in paquet]}
+
+    ROUTES_EN_CACHE = {"/calcul": _calcul, "/rapport": _rapport, "/laser": _laser, "/coupe": _coupe}
+
+    async def repondre(self, methode, chemin, corps_brut):
+        """Traite une requête et retourne (statut HTTP, objet JSON de la réponse)."""
+        self.requetes += 1
+        if chemin == "/sante":
+            return 200, {
+                "statut": "ok",
+                "version": constants.VERSION_PROGRAMME,
+                "requetes": self.requetes,
+                "cache": dict(self.cache.stats, entrees=len(self.cache), taille=self.cache.taille),
+                "cache_disque": self.cache_disque.stats if self.cache_disque is not None else None,
+            }
+        if chemin not in self.ROUTES_EN_CACHE and chemin != "/lot":
+            raise ErreurRequete(404, f"Route inconnue : {chemin}")
+        if methode != "POST":
+            raise ErreurRequete(405, f"{chemin} attend une requête POST")
+        try:
+            corps = json.loads(corps_brut or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ErreurRequete(400, f"JSON invalide : {e}")
+        if not isinstance(corps, dict):
+            raise ErreurRequete(400, "Le corps doit être un objet JSON")
+
+        if chemin == "/lot":
+            return 200, await self._lot(corps)
+
+        # Relit les préférences si le fichier a changé : les abonnés vident le
+        # cache avant la recherche, sinon une réponse périmée serait servie
+        self.preferences
+        cle = cle_cache(chemin, corps)
+        reponse = self.cache.get(cle)
+        if reponse is None:
+            reponse = self.ROUTES_EN_CACHE[chemin](self, corps)
+            self.cache.put(cle, reponse)
+        if "id" in corps:
+            reponse = dict(reponse, id=corps["id"])
+        return 200, reponse
+
+    # --- HTTP ---
+
+    async def _connexion(self, reader, writer):
+        """Une connexion client ; plusieurs requêtes possibles (HTTP/1.1 keep-alive)."""
+        try:
+            while True:
+                ligne = await reader.readline()
+                if not ligne.strip():
+                    break
+                methode, chemin, version = ligne.decode("latin-1").split()
+                entetes = {}
+                while True:
+                    ligne = await reader.readline()
+                    if ligne in (b"\r\n", b"\n", b""):
+                        break
+                    nom, _, valeur = ligne.decode("latin-1").partition(":")
+                    entetes[nom.strip().lower()] = valeur.strip()
+
+                longueur = int(entetes.get("content-length") or 0)
+                if longueur > TAILLE_MAX_REQUETE:
+                    statut, reponse = 413, {"erreur": f"Requête de plus de {TAILLE_MAX_REQUETE} octets"}
+                    garder = False
+                else:
+                    corps = await reader.readexactly(longueur) if longueur else b""
+                    try:
+                        statut, reponse = await self.repondre(methode, chemin.split("?", 1)[0], corps)
+                    except ErreurRequete as e:
+                        statut, reponse = e.statut, {"erreur": str(e)}
+                    except Exception as e:
+                        statut, reponse = 500, {"erreur": f"Erreur inattendue : {e}"}
+                    garder = version == "HTTP/1.1" and entetes.get("connection", "").lower() != "close"
+
+                donnees = json.dumps(reponse, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {statut} {_RAISONS.get(statut, '')}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(donnees)}\r\n"
+                    f"Connection: {'keep-alive' if garder else 'close'}\r\n\r\n".encode("latin-1") + donnees
+                )
+                await writer.drain()
+                if not garder:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def demarrer(self, hote=HOTE, port=PORT):
+        return await asyncio.start_server(self._connexion, hote, port)
+
+    def fermer(self):
+        if self._executeur is not None:
+            self._executeur.shutdown()
+            self._executeur = None
+        if self.cache_disque is not None:
+            self.cache_disque.fermer()
+            self.cache_disque = None
+
+
+async def _servir(service, hote, port):
+    serveur = await service.demarrer(hote, port)
+    adresses = ", ".join(f"{adresse[0]}:{adresse[1]}" for adresse in (s.getsockname() for s in serveur.sockets))
+    print(f"Service escalier à l'écoute sur {adresses} (Ctrl+C pour arrêter)", file=sys.stderr)
+    async with serveur:
+        await serveur.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m core.service",
+        description="Service HTTP/JSON local pour le calcul d'escalier, le laser et la profondeur de coupe.",
+    )
+    parser.add_argument("--hote", default=HOTE, help=f"adresse d'écoute (défaut : {HOTE})")
+    parser.add_argument("--port", type=int, default=PORT, help=f"port d'écoute (défaut : {PORT})")
+    parser.add_argument("--cache", type=int, default=TAILLE_CACHE, help="nombre de réponses gardées en cache")
+    parser.add_argument("--workers", type=int, default=None, help="processus de calcul des lots (défaut : nombre de cœurs)")
+    parser.add_argument("--cache-disque", nargs="?", const=FICHIER_CACHE, metavar="CHEMIN",
+                        help="ajoute le cache persistant des résultats (défaut : data/cache_resultats.sqlite)")
+    args = parser.parse_args(argv)
+
+    service = ServiceEscalier(
+        taille_cache=max(args.cache, 1), workers=args.workers, chemin_cache_disque=args.cache_disque
+    )
+    try:
+        asyncio.run(_servir(service, args.hote, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.fermer()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,301 @@
+import math
+import numpy as np
+from core import constants
+
+# Tolérance d'arrondi des bornes continues avant passage aux entiers
+_EPSILON_BORNE = 1e-9
+# Pas d'arrondi du giron proposé par le solveur (1/16")
+PAS_GIRON = 1 / 16
+# Hauteur totale maximale acceptée par le solveur (pouces, environ 250 m) : au-delà,
+# l'intervalle des n admissibles compterait des millions de valeurs à parcourir
+HAUTEUR_TOTALE_MAX = 10000.0
+TAN_ANGLE_MAX = math.tan(math.radians(constants.ANGLE_CONFORT_RAIDE_MAIS_CONFORME_MAX))
+
+
+def _grande_racine(a, b, c):
+    """Plus grande racine de a·n² + b·n + c (a > 0) ; NaN si le discriminant est négatif."""
+    discriminant = b * b - 4 * a * c
+    return (-b + np.sqrt(np.where(discriminant >= 0, discriminant, np.nan))) / (2 * a)
+
+
+def intervalle_contremarches(hauteur_totale, giron=None, espace_disponible=0.0):
+    """
+    Calcule analytiquement l'intervalle [n_min, n_max] des nombres de contremarches
+    conformes (hauteur de CM, Blondel, angle et longueur disponible).
+
+    Si `giron` est fourni, il est considéré comme imposé ; sinon le giron est libre
+    dans [GIRON_MIN, GIRON_MAX] et les bornes tiennent compte du meilleur giron
+    possible pour chaque n. Accepte des scalaires ou des colonnes NumPy ; un
+    intervalle vide se traduit par n_min > n_max.
+    """
+    h_min, h_max = constants.HAUTEUR_CM_MIN_REGLEMENTAIRE, constants.HAUTEUR_CM_MAX_REGLEMENTAIRE
+    g_min, g_max = constants.GIRON_MIN_REGLEMENTAIRE, constants.GIRON_MAX_REGLEMENTAIRE
+    b_min, b_max = constants.BLONDEL_MIN_POUCES, constants.BLONDEL_MAX_POUCES
+    t = TAN_ANGLE_MAX
+
+    hauteur = np.asarray(hauteur_totale, dtype=np.float64)
+    espace = np.asarray(espace_disponible, dtype=np.float64)
+    espace_renseigne = espace > 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Hauteur de contremarche : H/n dans [h_min, h_max]
+        borne_basse = np.maximum(hauteur / h_max, 2.0)
+        borne_haute = hauteur / h_min
+
+        if giron is None:
+            # Blondel réalisable avec un giron dans [g_min, g_max]
+            borne_basse = np.maximum(borne_basse, 2 * hauteur / (b_max - g_min))
+            if b_min > g_max:
+                borne_haute = np.minimum(borne_haute, 2 * hauteur / (b_min - g_max))
+            # Angle : H / ((n-1)·g) ≤ tan(angle max) avec g ≤ g_max puis g ≤ b_max - 2H/n
+            borne_basse = np.maximum(borne_basse, hauteur / (g_max * t) + 1)
+            # (le trinôme vaut -H en n = 1 : seule la grande racine borne n ≥ 2)
+            racine_angle = _grande_racine(t * b_max, -(t * b_max + 2 * t * hauteur + hauteur), 2 * t * hauteur)
+            borne_basse = np.maximum(borne_basse, racine_angle)
+            # Longueur : (n-1)·max(g_min, b_min - 2H/n) ≤ L (trinôme valant -L en n = 1)
+            racine_longueur = _grande_racine(b_min, -(b_min + 2 * hauteur + espace), 2 * hauteur)
+            borne_haute = np.where(
+                espace_renseigne,
+                np.minimum(np.minimum(borne_haute, racine_longueur), espace / g_min + 1),
+                borne_haute,
+            )
+            # L'angle impose (n-1)·g ≥ H / tan(angle max), indépendamment de n
+            borne_haute = np.where(espace_renseigne & (espace < hauteur / t), -np.inf, borne_haute)
+        else:
+            g = np.asarray(giron, dtype=np.float64)
+            # Blondel : 2H/n dans [b_min - g, b_max - g]
+            borne_basse = np.where(g < b_max, np.maximum(borne_basse, 2 * hauteur / (b_max - g)), np.inf)
+            borne_haute = np.where(g < b_min, np.minimum(borne_haute, 2 * hauteur / (b_min - g)), borne_haute)
+            # Angle : n ≥ H / (g·tan) + 1
+            borne_basse = np.maximum(borne_basse, hauteur / (g * t) + 1)
+            # Longueur : (n-1)·g ≤ L
+            borne_haute = np.where(espace_renseigne, np.minimum(borne_haute, espace / g + 1), borne_haute)
+
+        borne_basse = np.where(np.isnan(borne_basse), np.inf, borne_basse)
+        borne_haute = np.where(np.isnan(borne_haute), -np.inf, borne_haute)
+        n_min = np.ceil(np.minimum(borne_basse - _EPSILON_BORNE, np.iinfo(np.int32).max))
+        n_max = np.floor(np.clip(borne_haute + _EPSILON_BORNE, 0, np.iinfo(np.int32).max))
+    return n_min.astype(np.int64), n_max.astype(np.int64)
+
+
+def _bornes_giron(nombre_contremarches, hauteur_totale, espace_disponible,
+                  profondeur_tremie, position_tremie, epaisseur_plancher_sup):
+    """Intervalle [g_bas, g_haut] des girons conformes pour un nombre de CM donné."""
+    n = nombre_contremarches
+    h = hauteur_totale / n
+    g_bas = max(
+        constants.GIRON_MIN_REGLEMENTAIRE,
+        constants.BLONDEL_MIN_POUCES - 2 * h,
+        hauteur_totale / ((n - 1) * TAN_ANGLE_MAX),
+    )
+    g_haut = min(constants.GIRON_MAX_REGLEMENTAIRE, constants.BLONDEL_MAX_POUCES - 2 * h)
+    if espace_disponible > 0:
+        g_haut = min(g_haut, espace_disponible / (n - 1) - _EPSILON_BORNE)
+
+    # Échappée : seuls les nez d'indice ≤ k peuvent se trouver sous la trémie
+    if profondeur_tremie > 0 and position_tremie >= 0:
+        dessous_plancher = hauteur_totale - epaisseur_plancher_sup
+        k = math.floor((dessous_plancher - constants.HAUTEUR_LIBRE_MIN_REGLEMENTAIRE) / h)
+        if k < n:
+            # Soit le nez k+1 dépasse déjà l'ouverture (k·g > pos + prof),
+            # soit l'escalier entier finit avant la trémie ((n-1)·g < pos)
+            apres = (position_tremie + profondeur_tremie) / k + _EPSILON_BORNE if k >= 1 else math.inf
+            if max(g_bas, apres) <= g_haut:
+                g_bas = max(g_bas, apres)
+            else:
+                g_haut = min(g_haut, position_tremie / (n - 1) - _EPSILON_BORNE)
+    return g_bas, g_haut
+
+
+def _bornes_giron_colonnes(nombre_contremarches, hauteur_totale, espace_disponible,
+                           profondeur_tremie, position_tremie, epaisseur_plancher_sup):
+    """Même calcul que `_bornes_giron`, sur des colonnes NumPy (mêmes opérations flottantes)."""
+    n = nombre_contremarches
+    h = hauteur_totale / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g_bas = np.maximum(
+            np.maximum(constants.GIRON_MIN_REGLEMENTAIRE, constants.BLONDEL_MIN_POUCES - 2 * h),
+            hauteur_totale / ((n - 1) * TAN_ANGLE_MAX),
+        )
+        g_haut = np.minimum(constants.GIRON_MAX_REGLEMENTAIRE, constants.BLONDEL_MAX_POUCES - 2 * h)
+        g_haut = np.where(
+            espace_disponible > 0, np.minimum(g_haut, espace_disponible / (n - 1) - _EPSILON_BORNE), g_haut
+        )
+
+        dessous_plancher = hauteur_totale - epaisseur_plancher_sup
+        k = np.floor((dessous_plancher - constants.HAUTEUR_LIBRE_MIN_REGLEMENTAIRE) / h)
+        tremie = (profondeur_tremie > 0) & (position_tremie >= 0) & (k < n)
+        apres = np.where(k >= 1, (position_tremie + profondeur_tremie) / k + _EPSILON_BORNE, np.inf)
+        au_dela = np.maximum(g_bas, apres) <= g_haut
+        g_bas, g_haut = (
+            np.where(tremie & au_dela, np.maximum(g_bas, apres), g_bas),
+            np.where(tremie & ~au_dela, np.minimum(g_haut, position_tremie / (n - 1) - _EPSILON_BORNE), g_haut),
+        )
+    return g_bas, g_haut
+
+
+def contremarches_giron_impose(
+    hauteur_totale,
+    giron,
+    espace_disponible=0.0,
+    profondeur_tremie=0.0,
+    position_tremie=0.0,
+    epaisseur_plancher_sup=0.0,
+    hauteur_cm_cible=constants.HAUTEUR_CM_CONFORT_CIBLE,
+):
+    """
+    `resoudre_escalier(..., giron_impose=giron)["nombre_contremarches"]` sur des
+    colonnes, pour le moteur vectorisé : même point de départ, même ordre de
+    recherche (n - e avant n + e) et mêmes replis, un écart à la fois pour
+    toutes les lignes encore sans solution. Les deux chemins doivent rester
+    identiques : voir `python -m core.equivalence`. Lève ValueError si une
+    ligne a une hauteur hors de ]0, HAUTEUR_TOTALE_MAX] ou un giron ≤ 0.
+
+    Retourne (nombre_contremarches, conforme), deux colonnes.
+    """
+    hauteur, giron, espace, profondeur, position, epaisseur, cible = (
+        np.atleast_1d(colonne) for colonne in np.broadcast_arrays(*(
+            np.asarray(valeur, dtype=np.float64)
+            for valeur in (hauteur_totale, giron, espace_disponible, profondeur_tremie,
+                           position_tremie, epaisseur_plancher_sup, hauteur_cm_cible)
+        ))
+    )
+    if not ((hauteur > 0) & (hauteur <= HAUTEUR_TOTALE_MAX) & (giron > 0) & (cible > 0)).all():
+        raise ValueError(
+            f"Hauteurs totales attendues dans ]0, {HAUTEUR_TOTALE_MAX:g}] pouces, girons et hauteurs cibles > 0."
+        )
+    n_min, n_max = intervalle_contremarches(hauteur, giron, espace)
+    n_cible = np.maximum(np.rint(hauteur / cible), 2).astype(np.int64)
+    admissible = n_min <= n_max
+    depart = np.where(admissible, np.minimum(np.maximum(n_cible, n_min), n_max), n_cible)
+    largeur = np.where(admissible, n_max - n_min, -1)
+
+    nombre = depart.copy()
+    conforme = np.zeros(depart.shape, dtype=bool)
+    for ecart in range(int(largeur.max(initial=-1)) + 1):
+        if not (~conforme & (largeur >= ecart)).any():
+            break
+        for n in ((depart - ecart, depart + ecart) if ecart else (depart,)):
+            lignes = np.flatnonzero(~conforme & (n_min <= n) & (n <= n_max))
+            if not lignes.size:
+                continue
+            g_bas, g_haut = _bornes_giron_colonnes(
+                n[lignes], hauteur[lignes], espace[lignes],
+                profondeur[lignes], position[lignes], epaisseur[lignes],
+            )
+            g = giron[lignes]
+            retenues = lignes[(g_bas - _EPSILON_BORNE <= g) & (g <= g_haut + _EPSILON_BORNE)]
+            nombre[retenues] = n[retenues]
+            conforme[retenues] = True
+    return nombre, conforme
+
+
+def _choisir_giron(g_bas, g_haut, cible):
+    """Giron le plus proche de la cible dans [g_bas, g_haut], arrondi au 1/16" si possible."""
+    confort = constants.GIRON_CONFORT_MIN_RES_STANDARD
+    if g_haut >= confort:
+        g_bas = max(g_bas, confort)
+    giron = min(max(cible, g_bas), g_haut)
+    arrondi = round(giron / PAS_GIRON) * PAS_GIRON
+    grille_bas = math.ceil(g_bas / PAS_GIRON) * PAS_GIRON
+    grille_haut = math.floor(g_haut / PAS_GIRON) * PAS_GIRON
+    if grille_bas <= grille_haut:
+        return min(max(arrondi, grille_bas), grille_haut)
+    return giron
+
+
+def resoudre_escalier(
+    hauteur_totale,
+    espace_disponible=0.0,
+    profondeur_tremie=0.0,
+    position_tremie=0.0,
+    epaisseur_plancher_sup=0.0,
+    giron_prefere=None,
+    hauteur_cm_cible=constants.HAUTEUR_CM_CONFORT_CIBLE,
+    giron_impose=None,
+):
+    """
+    Détermine en un seul appel le meilleur couple (nombre de contremarches, giron)
+    conforme pour une hauteur totale, un espace disponible et une trémie (pouces).
+
+    L'intervalle des n admissibles est obtenu analytiquement ; on part du n le plus
+    proche de la hauteur cible et on s'en écarte seulement si l'échappée interdit
+    tout giron. Le giron retenu est le plus proche de `giron_prefere` (à défaut,
+    celui qui donne la valeur de Blondel idéale). Si seule l'échappée est
+    impossible à respecter, retourne le meilleur couple hors trémie ; si aucun n
+    n'est admissible, l'arrondi classique sur la hauteur cible. Dans les deux cas
+    `conforme` vaut False.
+
+    Avec `giron_impose`, seul le nombre de contremarches est cherché : le giron
+    saisi est conservé tel quel.
+    """
+    hauteur_totale = float(hauteur_totale)
+    if not math.isfinite(hauteur_totale):
+        raise ValueError(f"Hauteur totale invalide : {hauteur_totale}.")
+    if hauteur_totale <= 0:
+        raise ValueError("La hauteur totale doit être supérieure à zéro.")
+    if hauteur_totale > HAUTEUR_TOTALE_MAX:
+        raise ValueError(f"La hauteur totale ne peut pas dépasser {HAUTEUR_TOTALE_MAX:g} pouces.")
+
+    n_min, n_max = (int(v) for v in intervalle_contremarches(hauteur_totale, giron_impose, espace_disponible))
+    n_cible = max(2, round(hauteur_totale / hauteur_cm_cible))
+
+    n_retenu, giron_retenu, conforme = None, None, False
+    if n_min <= n_max:
+        depart = min(max(n_cible, n_min), n_max)
+        for ecart in range(n_max - n_min + 1):
+            for n in ((depart - ecart, depart + ecart) if ecart else (depart,)):
+                if not n_min <= n <= n_max:
+                    continue
+                g_bas, g_haut = _bornes_giron(
+                    n, hauteur_totale, espace_disponible,
+                    profondeur_tremie, position_tremie, epaisseur_plancher_sup,
+                )
+                if giron_impose:
+                    if g_bas - _EPSILON_BORNE <= giron_impose <= g_haut + _EPSILON_BORNE:
+                        n_retenu, giron_retenu, conforme = n, giron_impose, True
+                        break
+                elif g_bas <= g_haut:
+                    cible = giron_prefere if giron_prefere else constants.BLONDEL_IDEAL - 2 * hauteur_totale / n
+                    n_retenu, giron_retenu, conforme = n, _choisir_giron(g_bas, g_haut, cible), True
+                    break
+            if conforme:
+                break
+
+    if not conforme and n_min <= n_max:
+        # Seule l'échappée bloque : on garde le meilleur couple sans contrainte de trémie
+        n_retenu = depart
+        if giron_impose:
+            giron_retenu = giron_impose
+        else:
+            g_bas, g_haut = _bornes_giron(n_retenu, hauteur_totale, espace_disponible, 0.0, 0.0, 0.0)
+            cible = giron_prefere if giron_prefere else constants.BLONDEL_IDEAL - 2 * hauteur_totale / n_retenu
+            giron_retenu = _choisir_giron(g_bas, g_haut, cible)
+    elif not conforme:
+        n_retenu = n_cible
+        giron_retenu = giron_impose or giron_prefere or constants.GIRON_CONFORT_CIBLE
+
+    nb_marches = n_retenu - 1
+    return {
+        "nombre_contremarches": n_retenu,
+        "nombre_marches": nb_marches,
+        "nombre_girons": nb_marches,
+        "hauteur_cm": hauteur_totale / n_retenu,
+        "giron": giron_retenu,
+        "longueur_totale": nb_marches * giron_retenu,
+        "intervalle_contremarches": (n_min, n_max),
+        "conforme": conforme,
+    }
+
+
 class StairCalculator:
     @staticmethod
     def adjust_from_height(height_total, giron_standard=9.25):
-        """Calcule NM, NG, HCM à partir de la hauteur totale"""
-        # Estimation initiale avec hauteur de contremarche idéale (7")
-        nb_cm_ideal = round(height_total / 7.0)
-        hcm = height_total / nb_cm_ideal
-        nb_marches = nb_cm_ideal - 1
+        """Calcule NM, NG, HCM à partir de la hauteur totale (solveur analytique)"""
+        solution = resoudre_escalier(height_total, giron_prefere=giron_standard)
         return {
-            "nombre_contremarches": nb_cm_ideal,
-            "nombre_marches": nb_marches,
-            "nombre_girons": nb_marches,
-            "hauteur_cm": hcm,
-            "giron": giron_standard,
-            "longueur_totale": nb_marches * giron_standard
+            key: solution[key]
+            for key in ("nombre_contremarches", "nombre_marches", "nombre_girons", "hauteur_cm", "giron", "longueur_totale")
         }
 
     @staticmethod
@@ -1,9 +1,15 @@
 ﻿# Fichier: Calcul_escalierPy/core/validation.py
 # Contenu actuel (vérifié et validé)
 
-from tkinter import messagebox # Dépendance à Tkinter pour les messages
 from utils.formatting import parser_fraction
 
+
+def _afficher_erreur(titre, message, parent_window):
+    # Tkinter n'est importé qu'au premier message : le paquet core reste utilisable sans interface
+    from tkinter import messagebox
+    messagebox.showerror(titre, message, parent=parent_window)
+
+
 def validate_generic_fraction_format(value_str, field_name="Ce champ", can_be_empty=False, parent_window=None):
     """
     Valide le format de fraction générique.
@@ -12,13 +18,13 @@ def validate_generic_fraction_format(value_str, field_name="Ce champ", can_be_em
     if not value_str.strip():
         if can_be_empty:
             return True
-        messagebox.showerror("Erreur Format", f"{field_name} ne peut être vide.", parent=parent_window)
+        _afficher_erreur("Erreur Format", f"{field_name} ne peut être vide.", parent_window)
         return False
     try:
         parser_fraction(value_str) # Utilise la fonction de utils.formatting
         return True
     except ValueError as e:
-        messagebox.showerror(f"Erreur Format ({field_name})", str(e), parent=parent_window)
+        _afficher_erreur(f"Erreur Format ({field_name})", str(e), parent_window)
         return False
 
 # Fonctions de validation spécifiques
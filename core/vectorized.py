@@ -0,0 +1,307 @@
+# Fichier: core/vectorized.py
+
+"""
+Moteur de calcul vectorisé (NumPy) pour traiter des lots de variantes d'escalier.
+
+Toutes les entrées sont des colonnes (listes, tableaux ou scalaires diffusables)
+exprimées en pouces décimaux. Aucune boucle Python par ligne : chaque étape du
+calcul opère sur la colonne entière. Le moteur par étapes de
+`calculer_escalier_ajuste` (core.incremental) réutilise ces fonctions sur des
+scalaires, ce qui garantit des valeurs identiques dans les deux chemins.
+"""
+
+import numpy as np
+from core import constants
+from core.stair_logic import HAUTEUR_TOTALE_MAX, contremarches_giron_impose
+
+# --- Bits du masque de conformité (un bit par règle et par verdict) ---
+HAUTEUR_CM_NON_CONFORME = 1 << 0
+HAUTEUR_CM_CONFORT_LIMITE = 1 << 1
+GIRON_NON_CONFORME = 1 << 2
+GIRON_CONFORT_LIMITE = 1 << 3
+BLONDEL_NON_CONFORME = 1 << 4
+ECHAPPEE_NON_CONFORME = 1 << 5
+ECHAPPEE_HORS_ZONE = 1 << 6
+ECHAPPEE_DONNEES_INCOMPLETES = 1 << 7
+LONGUEUR_DEPASSE_ESPACE = 1 << 8
+LONGUEUR_ESPACE_NON_RENSEIGNE = 1 << 9
+ANGLE_TRES_RAIDE = 1 << 10
+ANGLE_CONFORT_LIMITE = 1 << 11
+HAUTEUR_TOTALE_ECART = 1 << 12
+DONNEES_INVALIDES = 1 << 13
+
+# Bits qui rendent une ligne non conforme (les autres ne sont que des avertissements)
+MASQUE_NON_CONFORME = (
+    HAUTEUR_CM_NON_CONFORME
+    | GIRON_NON_CONFORME
+    | BLONDEL_NON_CONFORME
+    | ECHAPPEE_NON_CONFORME
+    | LONGUEUR_DEPASSE_ESPACE
+    | ANGLE_TRES_RAIDE
+    | DONNEES_INVALIDES
+)
+
+# Tolérance sur l'écart de hauteur totale (1/64")
+TOLERANCE_ECART_HAUTEUR = 1 / 64
+
+
+def _colonne(valeur, taille=None):
+    """Convertit une entrée en colonne float64 (None → 0.0)."""
+    if valeur is None:
+        valeur = 0.0
+    colonne = np.asarray(valeur, dtype=np.float64)
+    if taille is not None and colonne.shape != (taille,):
+        colonne = np.broadcast_to(colonne, (taille,))
+    return colonne
+
+
+def _nombre_contremarches(hauteur_totale, giron, nombre_contremarches, hauteur_cm_souhaitee,
+                          espace_disponible, profondeur_tremie, position_tremie, epaisseur_plancher_sup):
+    """
+    Étape 2 : nombre de contremarches (manuel si > 0, au moins 2), sinon solveur
+    analytique à giron imposé, comme calculer_escalier_ajuste.
+    """
+    hcm = np.where(hauteur_cm_souhaitee > 0, hauteur_cm_souhaitee, constants.HAUTEUR_CM_CONFORT_CIBLE)
+    n = np.where(np.isfinite(nombre_contremarches), nombre_contremarches, 0)
+    n = np.maximum(n, 2).astype(np.int64)
+    # Lignes invalides (hauteur ou giron ≤ 0) : masquées par l'appelant, le solveur n'y est pas appelé
+    auto = np.flatnonzero(
+        ~(nombre_contremarches > 0) & (hauteur_totale > 0) & (hauteur_totale <= HAUTEUR_TOTALE_MAX)
+        & (giron > 0) & np.isfinite(giron)
+    )
+    if auto.size:
+        n[auto] = contremarches_giron_impose(
+            hauteur_totale[auto], giron[auto], espace_disponible[auto], profondeur_tremie[auto],
+            position_tremie[auto], epaisseur_plancher_sup[auto], hcm[auto],
+        )[0]
+    return n
+
+
+def _verifier_hauteur_cm(hauteur_reelle_contremarche):
+    """Étape 3 : conformité de la hauteur de contremarche."""
+    h = hauteur_reelle_contremarche
+    hors_normes = ~((constants.HAUTEUR_CM_MIN_REGLEMENTAIRE <= h) & (h <= constants.HAUTEUR_CM_MAX_REGLEMENTAIRE))
+    confort = ~hors_normes & (np.abs(h - constants.HAUTEUR_CM_CONFORT_CIBLE) > 0.5)
+    return np.where(hors_normes, HAUTEUR_CM_NON_CONFORME, np.where(confort, HAUTEUR_CM_CONFORT_LIMITE, 0))
+
+
+def _verifier_giron(giron):
+    """Étape 5 : conformité du giron."""
+    hors_normes = ~((constants.GIRON_MIN_REGLEMENTAIRE <= giron) & (giron <= constants.GIRON_MAX_REGLEMENTAIRE))
+    confort = ~hors_normes & (giron < constants.GIRON_CONFORT_MIN_RES_STANDARD)
+    return np.where(hors_normes, GIRON_NON_CONFORME, np.where(confort, GIRON_CONFORT_LIMITE, 0))
+
+
+def _geometrie(hauteur_totale, giron, nombre_girons):
+    """Étape 6 : longueur, angle et longueur de limon."""
+    longueur = nombre_girons * giron
+    with np.errstate(divide="ignore", invalid="ignore"):
+        angle = np.where(
+            (longueur > 0) & (hauteur_totale > 0),
+            np.degrees(np.arctan(hauteur_totale / longueur)),
+            np.where((hauteur_totale > 0) & (longueur == 0), 90.0, 0.0),
+        )
+    limon = np.sqrt(hauteur_totale ** 2 + longueur ** 2)
+    return longueur, angle, limon
+
+
+def _verifier_blondel(hauteur_reelle_contremarche, giron):
+    """Étape 7 : loi de Blondel (2H + G)."""
+    blondel = (2 * hauteur_reelle_contremarche) + giron
+    hors_normes = ~((constants.BLONDEL_MIN_POUCES <= blondel) & (blondel <= constants.BLONDEL_MAX_POUCES))
+    return blondel, np.where(hors_normes, BLONDEL_NON_CONFORME, 0)
+
+
+def _indices_sous_tremie(giron, nombre_contremarches, profondeur_tremie, position_tremie):
+    """
+    Premier et dernier indice de nez de marche (1..n) dont l'abscisse (i-1)·g
+    tombe dans [position, position + profondeur], en O(1) par ligne.
+
+    Les indices sont estimés par division puis corrigés d'un cran avec les
+    mêmes comparaisons flottantes que le test nez par nez, pour que les bords
+    exacts de la trémie donnent le même verdict. premier > dernier si aucun
+    nez n'est sous l'ouverture.
+    """
+    fin = position_tremie + profondeur_tremie
+    with np.errstate(divide="ignore", invalid="ignore"):
+        premier = np.ceil(position_tremie / giron) + 1
+        dernier = np.floor(fin / giron) + 1
+    premier = np.where((premier - 2) * giron >= position_tremie, premier - 1, premier)
+    premier = np.where((premier - 1) * giron < position_tremie, premier + 1, premier)
+    dernier = np.where((dernier - 1) * giron > fin, dernier - 1, dernier)
+    dernier = np.where(dernier * giron <= fin, dernier + 1, dernier)
+    return np.maximum(premier, 1), np.minimum(dernier, nombre_contremarches)
+
+
+def _echappee(hauteur_totale, hauteur_reelle_contremarche, giron, nombre_contremarches,
+              epaisseur_plancher_sup, profondeur_tremie, position_tremie):
+    """
+    Étape 8 : échappée minimale mesurée au nez des marches situées sous la trémie.
+
+    Le nez i est en ((i-1)·g, i·h) : l'échappée sous le plancher supérieur
+    décroît avec i, donc le minimum est atteint au dernier nez sous l'ouverture,
+    obtenu directement par `_indices_sous_tremie`. Retourne (échappée, bits) ;
+    l'échappée vaut NaN quand les données de trémie sont incomplètes.
+    """
+    calculable = (profondeur_tremie > 0) & (position_tremie >= 0) & (giron > 0) & (hauteur_reelle_contremarche > 0)
+    premier, dernier = _indices_sous_tremie(giron, nombre_contremarches, profondeur_tremie, position_tremie)
+    hors_zone = calculable & ~(premier <= dernier)
+    echappee = (hauteur_totale - epaisseur_plancher_sup) - dernier * hauteur_reelle_contremarche
+
+    non_conforme = calculable & ~hors_zone & (echappee < constants.HAUTEUR_LIBRE_MIN_REGLEMENTAIRE)
+    echappee = np.where(hors_zone, 0.0, np.where(calculable, echappee, np.nan))
+    bits = np.where(
+        ~calculable, ECHAPPEE_DONNEES_INCOMPLETES,
+        np.where(hors_zone, ECHAPPEE_HORS_ZONE, np.where(non_conforme, ECHAPPEE_NON_CONFORME, 0)),
+    )
+    return echappee, bits
+
+
+def profil_echappee(hauteur_totale, hauteur_reelle_contremarche, giron, nombre_contremarches,
+                    epaisseur_plancher_sup=0.0, profondeur_tremie=0.0, position_tremie=0.0, points=200):
+    """
+    Profil complet de l'échappée d'un escalier (pouces), sous forme de tableaux.
+
+    Retourne un dictionnaire :
+    - x_nez, y_nez, echappee_nez : position de chaque nez de marche et hauteur
+      libre jusqu'au dessous du plancher supérieur ;
+    - sous_tremie_nez : nez situés sous l'ouverture (ceux que la norme vérifie) ;
+    - x_ligne, echappee_ligne, sous_tremie_ligne : même chose le long de la
+      ligne de foulée continue (droite passant par les nez), échantillonnée
+      sur `points` abscisses ;
+    - min_echappee, indice_min : échappée minimale sous la trémie et indice
+      (1..n) du nez correspondant (NaN / 0 si aucun nez n'est sous l'ouverture).
+    """
+    n = int(nombre_contremarches)
+    indices = np.arange(1, n + 1, dtype=np.float64)
+    dessous_plancher = hauteur_totale - epaisseur_plancher_sup
+    x_nez = (indices - 1) * giron
+    y_nez = indices * hauteur_reelle_contremarche
+    fin = position_tremie + profondeur_tremie
+    tremie = profondeur_tremie > 0 and position_tremie >= 0
+
+    x_ligne = np.linspace(0.0, x_nez[-1] if n else 0.0, points)
+    pente = hauteur_reelle_contremarche / giron if giron > 0 else 0.0
+    y_ligne = hauteur_reelle_contremarche + x_ligne * pente
+
+    sous_tremie_nez = tremie & (x_nez >= position_tremie) & (x_nez <= fin)
+    sous_tremie_ligne = tremie & (x_ligne >= position_tremie) & (x_ligne <= fin)
+
+    premier, dernier = (int(v) for v in _indices_sous_tremie(
+        np.float64(giron), n, np.float64(profondeur_tremie), np.float64(position_tremie)))
+    if tremie and giron > 0 and premier <= dernier:
+        indice_min, min_echappee = dernier, dessous_plancher - dernier * hauteur_reelle_contremarche
+    else:
+        indice_min, min_echappee = 0, np.nan
+
+    return {
+        "x_nez": x_nez,
+        "y_nez": y_nez,
+        "echappee_nez": dessous_plancher - y_nez,
+        "sous_tremie_nez": sous_tremie_nez,
+        "x_ligne": x_ligne,
+        "echappee_ligne": dessous_plancher - y_ligne,
+        "sous_tremie_ligne": sous_tremie_ligne,
+        "min_echappee": min_echappee,
+        "indice_min": indice_min,
+    }
+
+
+def _verifier_longueur(longueur, espace_disponible):
+    """Étape 9 : longueur calculée face à l'espace disponible."""
+    renseigne = espace_disponible > 0
+    return np.where(
+        renseigne,
+        np.where(longueur > espace_disponible, LONGUEUR_DEPASSE_ESPACE, 0),
+        LONGUEUR_ESPACE_NON_RENSEIGNE,
+    )
+
+
+def _verifier_angle(angle):
+    """Étape 10 : angle de l'escalier."""
+    return np.where(
+        angle > constants.ANGLE_CONFORT_RAIDE_MAIS_CONFORME_MAX, ANGLE_TRES_RAIDE,
+        np.where(angle > constants.ANGLE_CONFORT_STANDARD_MAX, ANGLE_CONFORT_LIMITE, 0),
+    )
+
+
+def calculer_escalier_vectorise(
+    hauteur_totale,
+    giron,
+    nombre_contremarches=None,
+    epaisseur_plancher_sup=0.0,
+    profondeur_tremie=0.0,
+    position_tremie=0.0,
+    espace_disponible=0.0,
+    hauteur_cm_souhaitee=None,
+):
+    """
+    Calcule un lot d'escaliers en une seule passe vectorisée.
+
+    `nombre_contremarches` ≤ 0 (ou absent) déclenche la détermination automatique
+    par le solveur analytique à giron imposé (stair_logic.contremarches_giron_impose),
+    en partant de `hauteur_cm_souhaitee` (cible de confort si absente ou ≤ 0).
+    Les lignes dont la hauteur totale ou le giron est ≤ 0 (ou la hauteur au-delà
+    de stair_logic.HAUTEUR_TOTALE_MAX, ou une valeur non finie) sont marquées
+    DONNEES_INVALIDES et leurs résultats valent NaN. L'épaisseur du plancher
+    inférieur n'intervient pas dans le calcul et n'est donc pas une colonne.
+
+    Retourne un dictionnaire de colonnes NumPy :
+    hauteur_reelle_contremarche, nombre_contremarches, nombre_girons,
+    longueur_calculee_escalier, angle_escalier, longueur_limon_approximative,
+    blondel_value, min_echappee_calculee, ecart_hauteur, masque, is_conform.
+    """
+    hauteur_totale = np.atleast_1d(_colonne(hauteur_totale))
+    taille = hauteur_totale.shape[0]
+    giron = _colonne(giron, taille)
+    nombre_contremarches = _colonne(nombre_contremarches, taille)
+    epaisseur_plancher_sup = _colonne(epaisseur_plancher_sup, taille)
+    profondeur_tremie = _colonne(profondeur_tremie, taille)
+    position_tremie = _colonne(position_tremie, taille)
+    espace_disponible = _colonne(espace_disponible, taille)
+    hauteur_cm_souhaitee = _colonne(hauteur_cm_souhaitee, taille)
+
+    valides = (hauteur_totale > 0) & (hauteur_totale <= HAUTEUR_TOTALE_MAX) & (giron > 0) & np.isfinite(giron)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n = _nombre_contremarches(
+            hauteur_totale, giron, nombre_contremarches, hauteur_cm_souhaitee,
+            espace_disponible, profondeur_tremie, position_tremie, epaisseur_plancher_sup,
+        )
+        h = hauteur_totale / n
+        nombre_girons = n - 1
+
+        longueur, angle, limon = _geometrie(hauteur_totale, giron, nombre_girons)
+        blondel, bits_blondel = _verifier_blondel(h, giron)
+        echappee, bits_echappee = _echappee(
+            hauteur_totale, h, giron, n, epaisseur_plancher_sup, profondeur_tremie, position_tremie
+        )
+        ecart = hauteur_totale - h * n
+
+    masque = (
+        _verifier_hauteur_cm(h)
+        | _verifier_giron(giron)
+        | bits_blondel
+        | bits_echappee
+        | _verifier_longueur(longueur, espace_disponible)
+        | _verifier_angle(angle)
+        | np.where(np.abs(ecart) > TOLERANCE_ECART_HAUTEUR, HAUTEUR_TOTALE_ECART, 0)
+    ).astype(np.int64)
+    masque = np.where(valides, masque, DONNEES_INVALIDES)
+
+    def invalider(colonne):
+        return np.where(valides, colonne, np.nan)
+
+    return {
+        "hauteur_reelle_contremarche": invalider(h),
+        "nombre_contremarches": np.where(valides, n, 0),
+        "nombre_girons": np.where(valides, nombre_girons, 0),
+        "longueur_calculee_escalier": invalider(longueur),
+        "angle_escalier": invalider(angle),
+        "longueur_limon_approximative": invalider(limon),
+        "blondel_value": invalider(blondel),
+        "min_echappee_calculee": invalider(echappee),
+        "ecart_hauteur": invalider(ecart),
+        "masque": masque,
+        "is_conform": (masque & MASQUE_NON_CONFORME) == 0,
+    }
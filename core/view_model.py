@@ -0,0 +1,445 @@
+# Fichier: core/view_model.py
+
+"""
+Modèle de vue de la saisie d'un escalier, sans aucune dépendance graphique.
+
+`StairViewModel` porte toute l'orchestration des champs : validation, règle de
+saisie minimale, conversion d'unités, boutons +/-, cascade hauteur totale →
+nombre de contremarches → hauteur de CM, calcul par étapes et mise en forme
+des résultats. Les interfaces (Tk ou autres) se contentent de relier leurs
+variables aux champs observables ; le chemin frappe → résultat peut ainsi être
+mesuré et profilé sans affichage.
+
+Usage sans interface :
+    modele = StairViewModel(preferences)
+    modele.saisir("hauteur_totale", "108")
+    resultat = modele.recalculer()
+    modele.get("conformity_status")
+"""
+
+from collections import defaultdict
+from time import perf_counter
+
+from core import constants
+from core.formatting import decimal_to_fraction_str, parser_fraction
+from core.incremental import MoteurIncremental
+from core.instrumentation import CHRONO
+from core.stair_logic import resoudre_escalier
+
+# Champs saisis par l'utilisateur (les interfaces les lient à leurs entrées)
+CHAMPS_SAISIE = (
+    "hauteur_totale",
+    "hauteur_cm_souhaitee",
+    "giron_souhaite",
+    "epaisseur_plancher_sup",
+    "epaisseur_plancher_inf",
+    "profondeur_tremie_ouverture",
+    "position_tremie",
+    "espace_disponible",
+    "nombre_marches_manuel",
+    "nombre_cm_manuel",
+)
+
+# Champs exprimés dans l'unité d'affichage, convertis quand elle change
+CHAMPS_UNITE = (
+    "hauteur_totale",
+    "giron_souhaite",
+    "hauteur_cm_souhaitee",
+    "epaisseur_plancher_sup",
+    "epaisseur_plancher_inf",
+    "profondeur_tremie_ouverture",
+    "position_tremie",
+    "espace_disponible",
+)
+
+# Champs calculés, prêts à afficher
+CHAMPS_AFFICHAGE = (
+    "hauteur_reelle_cm_res",
+    "giron_utilise_res",
+    "longueur_totale_res",
+    "angle_res",
+    "limon_res",
+    "echappee_res",
+    "longueur_min_escalier",
+    "hauteur_cm_message",
+    "giron_message",
+    "echappee_message",
+    "blondel_message",
+    "longueur_disponible_message",
+    "angle_message",
+    "hauteur_totale_ecart_message",
+    "warnings",
+    "conformity_status",
+    "couleur_conformite",  # clé de couleur du thème : fg, success, warning ou error
+)
+
+_CHAMPS_MESSAGES = (
+    "warnings",
+    "hauteur_cm_message",
+    "giron_message",
+    "echappee_message",
+    "blondel_message",
+    "longueur_disponible_message",
+    "angle_message",
+    "hauteur_totale_ecart_message",
+)
+
+# Champs obligatoires → libellé dans les messages de validation
+_CHAMPS_OBLIGATOIRES = {
+    "giron_souhaite": "giron",
+    "epaisseur_plancher_sup": "ep_plancher_sup",
+    "epaisseur_plancher_inf": "ep_plancher_inf",
+}
+
+# Pas des boutons +/- et bornes de chaque champ
+PAS_AJUSTEMENT = 0.125
+NOMBRE_CM_MAX = 50
+
+
+class StairViewModel:
+    """
+    État observable de la saisie d'un escalier.
+
+    Chaque champ est une chaîne ; `observer(nom, rappel)` appelle rappel(valeur)
+    à chaque changement effectif du champ. `saisir` enregistre une frappe sans
+    recalculer ; `recalculer` traite les champs modifiés depuis le dernier
+    calcul (cascade depuis la hauteur totale comprise) et met à jour les champs
+    d'affichage. `stats` compte, pour le dernier recalcul, les écritures faites
+    et celles évitées parce que la valeur n'avait pas changé.
+    """
+
+    def __init__(self, preferences=None, unite=None):
+        self.preferences = dict(constants.DEFAULT_APP_PREFERENCES)
+        self.preferences.update(preferences or {})
+        self.unite = unite or self.preferences.get("unites_affichage", "pouces")
+        self.moteur = MoteurIncremental()
+        self.resultat = None
+        self.erreur = None
+        self._observateurs = defaultdict(list)
+        self._modifies = []
+        self.stats = {"ecrites": 0, "evitees": 0}
+        self.total = {"ecrites": 0, "evitees": 0, "recalculs": 0}
+
+        self._valeurs = dict.fromkeys(CHAMPS_SAISIE + CHAMPS_AFFICHAGE, "")
+        self._valeurs.update({
+            "epaisseur_plancher_sup": self.preferences.get("default_floor_finish_thickness_upper", "0"),
+            "epaisseur_plancher_inf": self.preferences.get("default_floor_finish_thickness_lower", "0"),
+            "giron_souhaite": self.preferences.get("default_tread_width_straight", "9 1/4"),
+            "hauteur_cm_souhaitee": decimal_to_fraction_str(constants.HAUTEUR_CM_CONFORT_CIBLE, self.preferences),
+            "conformity_status": "EN ATTENTE",
+            "couleur_conformite": "fg",
+        })
+
+    # --- Champs observables ---
+
+    def get(self, nom):
+        return self._valeurs[nom]
+
+    def observer(self, nom, rappel):
+        """Abonne rappel(valeur) aux changements du champ `nom`."""
+        self._observateurs[nom].append(rappel)
+
+    def _ecrire(self, nom, valeur):
+        """Écrit un champ et prévient les observateurs, seulement si la valeur change."""
+        if self._valeurs[nom] == valeur:
+            self.stats["evitees"] += 1
+            self.total["evitees"] += 1
+            return False
+        self._valeurs[nom] = valeur
+        self.stats["ecrites"] += 1
+        self.total["ecrites"] += 1
+        for rappel in self._observateurs[nom]:
+            rappel(valeur)
+        return True
+
+    def saisir(self, nom, valeur):
+        """Enregistre une saisie de l'utilisateur ; le calcul est fait au prochain `recalculer`."""
+        self._ecrire(nom, valeur)
+        self._marquer(nom)
+
+    def _marquer(self, nom):
+        if nom not in self._modifies:
+            self._modifies.append(nom)
+
+    # --- Projets ---
+
+    def etat(self):
+        """Unité, champs saisis et champs affichés (pour l'enregistrement d'un projet)."""
+        return {
+            "unite": self.unite,
+            "saisies": {nom: self._valeurs[nom] for nom in CHAMPS_SAISIE},
+            "affichage": {nom: self._valeurs[nom] for nom in CHAMPS_AFFICHAGE},
+        }
+
+    def restaurer(self, unite, saisies, affichage, resultat, preferences=None):
+        """
+        Remet un état enregistré tel quel, résultat compris : rien n'est parsé
+        ni recalculé. Le prochain `recalculer` ne traite que les champs saisis
+        après la restauration.
+        """
+        if preferences:
+            self.preferences.update(preferences)
+        self.unite = unite
+        self.preferences["unites_affichage"] = unite
+        for nom, valeur in (*saisies.items(), *affichage.items()):
+            if nom in self._valeurs:
+                self._ecrire(nom, valeur)
+        self._modifies = []
+        self.resultat = resultat
+        self.erreur = resultat.erreur if resultat is not None else None
+
+    # --- Conversions ---
+
+    def _facteur(self):
+        return constants.POUCE_EN_CM if self.unite == "cm" else 1.0
+
+    def _formater_saisie(self, pouces, unite=None):
+        """Valeur en pouces → texte d'un champ de saisie dans l'unité courante (ou `unite`)."""
+        if (unite or self.unite) == "cm":
+            return f"{pouces * constants.POUCE_EN_CM:.2f}"
+        return decimal_to_fraction_str(pouces, self.preferences)
+
+    def _valeur_facultative(self, nom):
+        """Champ optionnel en pouces (0 si vide ou invalide)."""
+        brut = self._valeurs[nom].strip().replace(',', '.')
+        try:
+            return parser_fraction(brut) / self._facteur() if brut else 0.0
+        except ValueError:
+            return 0.0
+
+    def changer_unite(self, nouvelle_unite):
+        """Convertit les champs de saisie vers `nouvelle_unite` ("pouces" ou "cm")."""
+        ancienne_unite = self.unite
+        self.preferences["unites_affichage"] = nouvelle_unite
+        if nouvelle_unite == ancienne_unite:
+            return
+        for nom in CHAMPS_UNITE:
+            brut = self._valeurs[nom].strip()
+            if not brut:
+                continue
+            try:
+                pouces = parser_fraction(brut.replace(',', '.'))
+            except ValueError:
+                continue
+            if ancienne_unite == "cm":
+                pouces /= constants.POUCE_EN_CM
+            # Simple conversion : ne compte pas comme une saisie (pas de cascade)
+            self._ecrire(nom, self._formater_saisie(pouces, nouvelle_unite))
+        self.unite = nouvelle_unite
+
+    # --- Cascade entre hauteur totale, nombre de marches et de contremarches ---
+
+    def nombre_cm_optimal(self, hauteur):
+        """
+        Nombre de CM conforme selon le solveur, avec l'espace et la trémie si
+        renseignés ; None si le solveur refuse la hauteur (au-delà de HAUTEUR_TOTALE_MAX).
+        """
+        giron = self._valeur_facultative("giron_souhaite")
+        try:
+            solution = resoudre_escalier(
+                hauteur / self._facteur(),
+                espace_disponible=self._valeur_facultative("espace_disponible"),
+                profondeur_tremie=self._valeur_facultative("profondeur_tremie_ouverture"),
+                position_tremie=self._valeur_facultative("position_tremie"),
+                epaisseur_plancher_sup=self._valeur_facultative("epaisseur_plancher_sup"),
+                giron_impose=giron or None,
+            )
+        except ValueError:
+            return None
+        return solution["nombre_contremarches"]
+
+    def _hauteur_totale(self):
+        return parser_fraction(self._valeurs["hauteur_totale"] or "0")
+
+    def _depuis_hauteur(self):
+        """La hauteur totale a changé : NM, NCM et HCM sont recalculés."""
+        try:
+            hauteur = parser_fraction(self._valeurs["hauteur_totale"])
+        except ValueError:
+            return
+        if hauteur <= 0:
+            return
+        nombre_cm = self.nombre_cm_optimal(hauteur)
+        if nombre_cm is None:
+            return
+        self._ecrire("nombre_cm_manuel", str(nombre_cm))
+        self._ecrire("nombre_marches_manuel", str(nombre_cm - 1))
+        self._ecrire("hauteur_cm_souhaitee", decimal_to_fraction_str(hauteur / nombre_cm, self.preferences))
+
+    def _imposer_nombre_cm(self, nombre_cm):
+        self._ecrire("nombre_cm_manuel", str(nombre_cm))
+        self._ecrire("nombre_marches_manuel", str(nombre_cm - 1))
+        hauteur = self._hauteur_totale()
+        if hauteur > 0:
+            self._ecrire("hauteur_cm_souhaitee", decimal_to_fraction_str(hauteur / nombre_cm, self.preferences))
+
+    def definir_nombre_cm(self, nombre_cm):
+        """Impose le nombre de contremarches et ajuste NM et HCM."""
+        self._imposer_nombre_cm(nombre_cm)
+        self._marquer("nombre_cm_manuel")
+
+    def definir_nombre_marches(self, nombre_marches):
+        """Impose le nombre de marches et ajuste NCM et HCM."""
+        self._imposer_nombre_cm(nombre_marches + 1)
+        self._marquer("nombre_marches_manuel")
+
+    def incrementer(self, nom, sens=1):
+        """Bouton +/- : `sens` vaut +1 ou -1. Les valeurs hors bornes ou illisibles sont ignorées."""
+        try:
+            if nom == "nombre_cm_manuel":
+                valeur = int(self._valeurs[nom].strip() or "0") + sens
+                if 2 <= valeur <= NOMBRE_CM_MAX:
+                    self.definir_nombre_cm(valeur)
+            elif nom == "nombre_marches_manuel":
+                valeur = int(self._valeurs[nom].strip() or "0") + sens
+                if 1 <= valeur <= NOMBRE_CM_MAX - 1:
+                    self.definir_nombre_marches(valeur)
+            else:
+                bornes = {
+                    "hauteur_cm_souhaitee": (constants.HAUTEUR_CM_MIN_REGLEMENTAIRE, constants.HAUTEUR_CM_MAX_REGLEMENTAIRE),
+                    "giron_souhaite": (constants.GIRON_MIN_REGLEMENTAIRE, constants.GIRON_MAX_REGLEMENTAIRE),
+                }[nom]
+                valeur = parser_fraction(self._valeurs[nom]) + sens * PAS_AJUSTEMENT
+                valeur = min(max(valeur, bornes[0]), bornes[1])
+                self.saisir(nom, decimal_to_fraction_str(valeur, self.preferences))
+        except ValueError:
+            pass
+
+    def appliquer_valeurs_ideales(self):
+        """Giron par défaut, hauteur de CM de confort et nombre de CM optimal."""
+        giron = parser_fraction(self.preferences.get("default_tread_width_straight", "9 1/4").replace('"', ''))
+        self.saisir("giron_souhaite", decimal_to_fraction_str(giron, self.preferences))
+        self.saisir("hauteur_cm_souhaitee", decimal_to_fraction_str(constants.HAUTEUR_CM_CONFORT_CIBLE, self.preferences))
+        hauteur = self._hauteur_totale()
+        nombre_cm = self.nombre_cm_optimal(hauteur) if hauteur > 0 else None
+        if nombre_cm is not None:
+            self.saisir("nombre_cm_manuel", str(nombre_cm))
+            self.saisir("nombre_marches_manuel", str(nombre_cm - 1))
+
+    # --- Calcul ---
+
+    def _valider(self):
+        """Champs obligatoires et règle de saisie minimale ; lève ValueError."""
+        valeurs = {nom: self._valeurs[nom].strip() for nom in CHAMPS_SAISIE}
+        for nom, libelle in _CHAMPS_OBLIGATOIRES.items():
+            if not valeurs[nom]:
+                raise ValueError(f"Le champ {libelle} est obligatoire")
+            try:
+                parser_fraction(valeurs[nom])
+            except Exception as e:
+                raise ValueError(f"Format invalide pour {libelle}: {valeurs[nom]} ({str(e)})")
+        if not (valeurs["hauteur_cm_souhaitee"] and (valeurs["hauteur_totale"] or valeurs["nombre_cm_manuel"])):
+            raise ValueError("Configuration invalide: fournir (hauteur totale ET hauteur CM) OU (nombre CM ET hauteur CM)")
+        return valeurs
+
+    def recalculer(self, changed_var_name=None):
+        """
+        Traite les champs modifiés depuis le dernier appel et met à jour les
+        champs d'affichage. Retourne le StairResult, ou None si la saisie est
+        invalide (le message est alors dans `erreur` et dans "warnings").
+        """
+        if not CHRONO.actif:
+            return self._recalculer(changed_var_name, False)
+        debut = perf_counter()
+        resultat = self._recalculer(changed_var_name, True)
+        CHRONO.enregistrer("modele.recalculer", perf_counter() - debut)
+        return resultat
+
+    def _recalculer(self, changed_var_name, mesurer):
+        self.stats = {"ecrites": 0, "evitees": 0}
+        self.total["recalculs"] += 1
+        modifies, self._modifies = self._modifies, []
+        if "hauteur_totale" in modifies:
+            self._depuis_hauteur()
+        if changed_var_name is None and len(modifies) == 1:
+            changed_var_name = modifies[0]
+
+        try:
+            valeurs = self._valider()
+        except ValueError as ve:
+            self.afficher_erreur("DONNÉES INVALIDES", f"Erreur de validation: {str(ve)}")
+            return None
+
+        resultat = self.moteur.calculer(
+            {
+                "hauteur_totale_escalier_str": valeurs["hauteur_totale"],
+                "giron_souhaite_str": valeurs["giron_souhaite"],
+                "hauteur_cm_souhaitee_str": valeurs["hauteur_cm_souhaitee"],
+                "nombre_marches_manuel_str": valeurs["nombre_marches_manuel"],
+                "nombre_cm_manuel_str": valeurs["nombre_cm_manuel"],
+                "epaisseur_plancher_sup_str": valeurs["epaisseur_plancher_sup"],
+                "epaisseur_plancher_inf_str": valeurs["epaisseur_plancher_inf"],
+                "profondeur_tremie_ouverture_str": self._valeurs["profondeur_tremie_ouverture"],
+                "position_tremie_ouverture_str": self._valeurs["position_tremie"],
+                "espace_disponible_str": self._valeurs["espace_disponible"],
+            },
+            self.preferences,
+            unite="Pouces" if self.unite == "pouces" else "Centimètres",
+            changed_var_name=changed_var_name,
+        )
+        self.resultat, self.erreur = resultat, resultat.erreur
+        debut = perf_counter() if mesurer else 0.0
+        self._afficher_resultat(resultat)
+        if mesurer:
+            CHRONO.enregistrer("modele.messages", perf_counter() - debut)
+        return resultat
+
+    def afficher_erreur(self, statut, message):
+        """Vide les messages et affiche `statut` et `message` (saisie invalide ou erreur de calcul)."""
+        for nom in _CHAMPS_MESSAGES:
+            self._ecrire(nom, "")
+        self.erreur = message
+        self._ecrire("conformity_status", statut)
+        self._ecrire("couleur_conformite", "fg")
+        self._ecrire("warnings", message)
+
+    def _afficher_resultat(self, res):
+        prefs = self.preferences
+        # Valeurs calculées réécrites dans les champs de saisie
+        if res.hauteur_reelle_contremarche is not None:
+            self._ecrire("hauteur_cm_souhaitee", self._formater_saisie(res.hauteur_reelle_contremarche))
+        if res.giron_utilise is not None:
+            self._ecrire("giron_souhaite", self._formater_saisie(res.giron_utilise))
+        if res.nombre_contremarches is not None:
+            self._ecrire("nombre_cm_manuel", str(res.nombre_contremarches))
+        if res.nombre_girons is not None:
+            self._ecrire("nombre_marches_manuel", str(res.nombre_girons))
+
+        def df(v):
+            return decimal_to_fraction_str(v, prefs) if v is not None else ""
+
+        if self.unite == "cm":
+            def df_mm(v):
+                return f"{v * constants.POUCE_EN_CM:.2f} cm" if v is not None else ""
+        else:
+            def df_mm(v):
+                return f"{df(v)} ({round(v * constants.POUCE_EN_MM)} mm)" if v else ""
+
+        self._ecrire("hauteur_reelle_cm_res", df_mm(res.hauteur_reelle_contremarche))
+        self._ecrire("giron_utilise_res", df_mm(res.giron_utilise))
+        self._ecrire("longueur_totale_res", df_mm(res.longueur_calculee_escalier))
+        self._ecrire("angle_res", f"{res.angle_escalier or 0:.2f}°")
+        self._ecrire("limon_res", df_mm(res.longueur_limon_approximative))
+        self._ecrire("echappee_res", df_mm(res.min_echappee_calculee))
+        nombre_girons = res.nombre_girons or 0
+        self._ecrire("longueur_min_escalier",
+                     f"Req: {df_mm(nombre_girons * constants.GIRON_MIN_REGLEMENTAIRE)}" if nombre_girons else "")
+        self._ecrire("hauteur_cm_message", res.message("hauteur_cm"))
+        self._ecrire("giron_message", res.message("giron"))
+        self._ecrire("echappee_message", res.message("echappee"))
+        self._ecrire("blondel_message", f"{res.message('blondel')} ({df(res.blondel_value)}\")")
+        self._ecrire("longueur_disponible_message", res.message("longueur_disponible"))
+        self._ecrire("angle_message", res.message("angle"))
+        self._ecrire("hauteur_totale_ecart_message", res.message("hauteur_totale_ecart"))
+
+        # Les messages ne sont formatés qu'ici, au moment de l'affichage
+        warnings = res.textes_avertissements(prefs)
+        self._ecrire("warnings", "\n".join(warnings) if warnings else "Aucun avertissement.")
+        if not res.is_conform:
+            statut, couleur = "✗ NON CONFORME", "error"
+        elif warnings:
+            statut, couleur = "CONFORME AVEC AVERTISSEMENTS", "warning"
+        else:
+            statut, couleur = "✓ CONFORME", "success"
+        self._ecrire("conformity_status", statut)
+        self._ecrire("couleur_conformite", couleur)
@@ -0,0 +1,46 @@
+"""
+Liaison entre un StairViewModel et des variables Tk.
+
+Dans le sens Tk → modèle, chaque écriture de l'utilisateur est transmise à
+`modele.saisir` puis signalée à `au_changement(nom)` (qui planifie ou lance le
+recalcul). Dans le sens modèle → Tk, seules les valeurs qui changent sont
+écrites, et ces écritures ne sont pas renvoyées au modèle.
+"""
+
+import tkinter as tk
+
+
+class LiaisonTk:
+    def __init__(self, modele, variables, au_changement=None):
+        """`variables` : nom du champ du modèle → variable Tk (StringVar ou IntVar)."""
+        self.modele = modele
+        self.variables = dict(variables)
+        self.au_changement = au_changement
+        self._propagation = False
+        for nom, var in self.variables.items():
+            self._vers_tk(var, modele.get(nom))
+            var.trace_add("write", lambda *args, n=nom, v=var: self._depuis_tk(n, v))
+            modele.observer(nom, lambda valeur, v=var: self._vers_tk(v, valeur))
+
+    def _depuis_tk(self, nom, var):
+        if self._propagation:
+            return
+        try:
+            valeur = str(var.get())
+        except tk.TclError:  # IntVar vide ou illisible
+            valeur = ""
+        self.modele.saisir(nom, valeur)
+        if self.au_changement:
+            self.au_changement(nom)
+
+    def _vers_tk(self, var, valeur):
+        try:
+            if str(var.get()) == valeur:
+                return
+        except tk.TclError:
+            pass
+        self._propagation = True
+        try:
+            var.set(valeur)
+        finally:
+            self._propagation = False
@@ -1,17 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import math
-from core import constants
+from core.view_model import StairViewModel
 from gui.dialogs import PreferencesDialog
-from utils.formatting import decimal_to_fraction_str, parser_fraction
+from gui.liaison_tk import LiaisonTk
 from utils.reporting import generer_texte_trace
 from utils.file_operations import load_application_preferences
 
 class MainWindow:
     def __init__(self, master, app_prefs):
         self.master = master
-        self.app_preferences = app_prefs
-        self.latest_results = {}
+        # Saisie, cascade et calcul : même modèle de vue que la fenêtre principale
+        self.modele = StairViewModel(app_prefs)
 
         self.master.title("Calculateur d'Escalier Interactif")
         self.master.geometry("850x700")
@@ -30,11 +29,25 @@ class MainWindow:
         self._create_main_layout()
         self._bind_events()
 
+    @property
+    def app_preferences(self):
+        return self.modele.preferences
+
+    @app_preferences.setter
+    def app_preferences(self, preferences):
+        self.modele.preferences = preferences
+
+    @property
+    def latest_results(self):
+        resultat = self.modele.resultat
+        return resultat.as_dict() if resultat is not None and resultat.is_valid else {}
+
     def open_preferences_dialog(self):
         prefs_dialog = PreferencesDialog(self.master, self.app_preferences)
         self.master.wait_window(prefs_dialog)
         # Recharger les préférences pour qu'elles soient disponibles pour les prochains calculs
         self.app_preferences = load_application_preferences()
+        self.recalculate_and_update_ui()
 
     def _setup_style(self):
         style = ttk.Style()
@@ -44,19 +57,19 @@ class MainWindow:
         style.configure("Error.TLabel", foreground="red", font=('TkDefaultFont', 10, 'bold'))
 
     def _setup_tk_variables(self):
-        # Variables pour les entrées
+        # Variables pour les entrées (valeurs initiales fournies par le modèle de vue)
         self.hauteur_totale_var = tk.StringVar()
-        self.giron_souhaite_var = tk.StringVar(value=self.app_preferences.get("default_tread_width_straight", "9 1/4"))
-        self.epaisseur_plancher_inf_var = tk.StringVar(value="0")
+        self.giron_souhaite_var = tk.StringVar()
+        self.epaisseur_plancher_inf_var = tk.StringVar()
         self.espace_disponible_var = tk.StringVar()
         self.longueur_marche_var = tk.StringVar(value="36")
         self.profondeur_limon_var = tk.StringVar(value="9 1/4")
-        self.nombre_cm_var = tk.IntVar()
+        self.nombre_cm_var = tk.StringVar()
         
         # Variables pour la trémie
         self.longueur_tremie_var = tk.StringVar()
         self.position_tremie_var = tk.StringVar()
-        self.epaisseur_plancher_sup_var = tk.StringVar(value=self.app_preferences.get("default_floor_finish_thickness_upper", "1 1/2"))
+        self.epaisseur_plancher_sup_var = tk.StringVar()
 
         # Variables pour les résultats et messages
         self.hauteur_reelle_cm_res_var = tk.StringVar()
@@ -154,102 +167,38 @@ class MainWindow:
         ttk.Label(parent, textvariable=self.echappee_message_var, style="Error.TLabel").grid(row=len(results_labels)+2, column=2, sticky="w", padx=10)
 
     def _bind_events(self):
-        """Lie les événements aux fonctions."""
-        # La variable de hauteur a un traitement spécial
-        self.hauteur_totale_var.trace_add("write", self.on_hauteur_change)
-        
-        # Toutes les autres variables déclenchent une mise à jour directe
-        for var in [self.hauteur_totale_var, self.giron_souhaite_var, self.espace_disponible_var,
-                    self.longueur_marche_var, self.profondeur_limon_var, self.longueur_tremie_var,
-                    self.position_tremie_var, self.epaisseur_plancher_sup_var,
-                    self.epaisseur_plancher_inf_var]: # <-- AJOUTER ICI
-            var.trace_add("write", self.recalculate_and_update_ui)
-
-    def on_hauteur_change(self, *args):
-        try:
-            h_tot = parser_fraction(self.hauteur_totale_var.get())
-            nb_cm = math.ceil(h_tot / constants.HAUTEUR_CM_CONFORT_CIBLE) if h_tot > 0 else 0
-            self.nombre_cm_var.set(nb_cm if nb_cm > 1 else 2) # S'assurer d'au moins 2 contremarches
-        except (ValueError, ZeroDivisionError, tk.TclError):
-            self.nombre_cm_var.set(0)
+        """Lie les variables Tk aux champs du modèle de vue."""
+        self.liaison = LiaisonTk(self.modele, {
+            "hauteur_totale": self.hauteur_totale_var,
+            "giron_souhaite": self.giron_souhaite_var,
+            "espace_disponible": self.espace_disponible_var,
+            "profondeur_tremie_ouverture": self.longueur_tremie_var,
+            "position_tremie": self.position_tremie_var,
+            "epaisseur_plancher_sup": self.epaisseur_plancher_sup_var,
+            "epaisseur_plancher_inf": self.epaisseur_plancher_inf_var,
+            "nombre_cm_manuel": self.nombre_cm_var,
+            "hauteur_reelle_cm_res": self.hauteur_reelle_cm_res_var,
+            "longueur_totale_res": self.longueur_totale_res_var,
+            "angle_res": self.angle_res_var,
+            "limon_res": self.limon_res_var,
+            "echappee_res": self.echappee_res_var,
+            "hauteur_cm_message": self.hauteur_cm_message_var,
+            "giron_message": self.giron_message_var,
+            "longueur_disponible_message": self.longueur_message_var,
+            "echappee_message": self.echappee_message_var,
+        }, au_changement=self.recalculate_and_update_ui)
 
     def decrement_cm(self):
-        if self.nombre_cm_var.get() > 2:
-            self.nombre_cm_var.set(self.nombre_cm_var.get() - 1)
-            self.recalculate_and_update_ui()
+        self.modele.incrementer("nombre_cm_manuel", -1)
+        self.recalculate_and_update_ui("nombre_cm_manuel")
 
     def increment_cm(self):
-        self.nombre_cm_var.set(self.nombre_cm_var.get() + 1)
-        self.recalculate_and_update_ui()
-
-    def recalculate_and_update_ui(self, *args):
-        self.clear_results()
-        try:
-            h_tot = parser_fraction(self.hauteur_totale_var.get())
-            giron = parser_fraction(self.giron_souhaite_var.get())
-            nb_cm = self.nombre_cm_var.get()
-
-            if nb_cm < 2: return
-
-            self.latest_results['hauteur_totale'] = h_tot
-            self.latest_results['giron_utilise'] = giron
-            self.latest_results['nombre_contremarches'] = nb_cm
-            self.latest_results['kwargs'] = {
-                'epaisseur_marche': parser_fraction(self.app_preferences.get('default_tread_thickness')),
-                'epaisseur_plancher_sup': parser_fraction(self.epaisseur_plancher_sup_var.get())
-            }
-
-            h_reel = h_tot / nb_cm
-            self.latest_results['hauteur_reelle_contremarche'] = h_reel
-            longueur_totale = (nb_cm - 1) * giron
-            angle = math.degrees(math.atan(h_tot / longueur_totale)) if longueur_totale > 0 else 90
-            longueur_limon = math.sqrt(h_tot**2 + longueur_totale**2)
-
-            self.hauteur_reelle_cm_res_var.set(decimal_to_fraction_str(h_reel, self.app_preferences))
-            self.longueur_totale_res_var.set(decimal_to_fraction_str(longueur_totale, self.app_preferences))
-            self.angle_res_var.set(f"{angle:.2f}°")
-            self.limon_res_var.set(decimal_to_fraction_str(longueur_limon, self.app_preferences))
-            
-            self.hauteur_cm_message_var.set("NON CONFORME" if not (constants.HAUTEUR_CM_MIN_REGLEMENTAIRE <= h_reel <= constants.HAUTEUR_CM_MAX_REGLEMENTAIRE) else "")
-            
-            if not (constants.GIRON_MIN_REGLEMENTAIRE <= giron <= constants.GIRON_MAX_REGLEMENTAIRE):
-                self.giron_message_var.set("Giron NON CONFORME")
-            elif giron < constants.GIRON_CONFORT_MIN:
-                self.giron_message_var.set(f"Conforme mais < {constants.GIRON_CONFORT_MIN}\"")
-            else:
-                self.giron_message_var.set("")
-            
-            espace_dispo = parser_fraction(self.espace_disponible_var.get())
-            longueur_marche = parser_fraction(self.longueur_marche_var.get())
-            if espace_dispo > 0:
-                self.longueur_message_var.set("DÉPASSE ESPACE DISPO" if (longueur_totale + longueur_marche) > espace_dispo else "")
-            
-            long_tremie = parser_fraction(self.longueur_tremie_var.get())
-            pos_tremie = parser_fraction(self.position_tremie_var.get())
-            ep_plancher = parser_fraction(self.epaisseur_plancher_sup_var.get())
-
-            if long_tremie > 0 and giron > 0:
-                hauteur_plafond = h_tot - ep_plancher
-                marche_critique_index = math.floor(pos_tremie / giron)
-                hauteur_dessus_marche_critique = (marche_critique_index + 1) * h_reel
-                echappee_calculee = hauteur_plafond - hauteur_dessus_marche_critique
-                
-                self.echappee_res_var.set(decimal_to_fraction_str(echappee_calculee, self.app_preferences))
-                if echappee_calculee < constants.HAUTEUR_LIBRE_MIN_REGLEMENTAIRE:
-                    self.echappee_message_var.set("NON CONFORME")
-                elif echappee_calculee < constants.HAUTEUR_LIBRE_CONFORT_MIN:
-                    self.echappee_message_var.set(f"Conforme mais < {decimal_to_fraction_str(constants.HAUTEUR_LIBRE_CONFORT_MIN, self.app_preferences)}\"")
-                else:
-                    self.echappee_message_var.set("")
-        except (ValueError, ZeroDivisionError, tk.TclError):
-            pass
+        self.modele.incrementer("nombre_cm_manuel", 1)
+        self.recalculate_and_update_ui("nombre_cm_manuel")
 
-    def clear_results(self):
-        for var in [self.hauteur_reelle_cm_res_var, self.longueur_totale_res_var, self.angle_res_var,
-                    self.limon_res_var, self.echappee_res_var, self.hauteur_cm_message_var,
-                    self.giron_message_var, self.longueur_message_var, self.echappee_message_var]:
-            var.set("")
-        self.latest_results = {}
+    def recalculate_and_update_ui(self, changed_var_name=None):
+        # Les champs de résultats liés sont mis à jour par le modèle de vue
+        self.modele.recalculer(changed_var_name)
 
     def generate_and_display_report(self):
         if not self.latest_results:
@@ -1,51 +1,67 @@
 ﻿# Fichier: Calcul_escalierPy/utils/file_operations.py
 
-import json
 import os
-from core import constants
+import sqlite3
+from core.preferences import PREFERENCES
 
 def load_application_preferences():
     """
-    Charge les préférences de l'application depuis un fichier JSON.
-    Retourne les préférences chargées ou les préférences par défaut si le fichier n'existe pas.
-    """
-    preferences = {}
-    if os.path.exists(constants.DEFAULTS_FILE):
-        try:
-            with open(constants.DEFAULTS_FILE, 'r', encoding='utf-8') as f:
-                preferences = json.load(f)
-        except json.JSONDecodeError:
-            print(f"Erreur: Le fichier de préférences '{constants.DEFAULTS_FILE}' est corrompu. Utilisation des préférences par défaut.")
-        except Exception as e:
-            print(f"Erreur inattendue lors du chargement des préférences: {e}. Utilisation des préférences par défaut.")
-    
-    # S'assurer que toutes les clés par défaut sont présentes
-    # REF-014: Utilisation de DEFAULT_APP_PREFERENCES au lieu de FALLBACK_PREFERENCES
-    merged_preferences = constants.DEFAULT_APP_PREFERENCES.copy() 
-    merged_preferences.update(preferences)
-    return merged_preferences
+    Charge les préférences de l'application (magasin unique core.preferences).
+    Retourne une copie modifiable : valeurs par défaut complétées par le fichier.
+    """
+    return PREFERENCES.instantane().copy()
 
 def save_application_preferences(preferences):
     """
-    Sauvegarde les préférences de l'application dans un fichier JSON.
-    Crée le dossier 'data' si nécessaire.
+    Sauvegarde les préférences de l'application (écriture atomique, dossier 'data' créé si nécessaire).
     """
-    data_dir = os.path.dirname(constants.DEFAULTS_FILE)
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-    
     try:
-        with open(constants.DEFAULTS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(preferences, f, indent=4)
-    except Exception as e:
+        PREFERENCES.enregistrer(preferences)
+    except OSError as e:
         print(f"Erreur lors de la sauvegarde des préférences: {e}")
 
+def _types_projet():
+    from core.projets import EXTENSION_PROJET
+    return [("Projet d'escalier", f"*{EXTENSION_PROJET}"), ("Tous les fichiers", "*.*")]
+
 def charger_projet(app):
-    """Charge les données du projet dans l'application."""
-    # Fonctionnalité future : Implémenter le chargement d'un projet
-    messagebox.showinfo("Charger Projet", "La fonction de chargement de projet est en développement !", parent=app)
+    """
+    Demande un fichier de projet et le charge dans l'application, sans recalcul.
+    Retourne le projet chargé, ou None si l'utilisateur annule ou si le fichier est illisible.
+    """
+    from tkinter import filedialog, messagebox
+    from core.projets import lire_projet
+    chemin = filedialog.askopenfilename(parent=app, title="Ouvrir un projet", filetypes=_types_projet())
+    if not chemin:
+        return None
+    try:
+        projet = lire_projet(chemin)
+    except (OSError, ValueError) as e:
+        messagebox.showerror("Ouvrir un projet", f"Impossible d'ouvrir le projet :\n{e}", parent=app)
+        return None
+    app.ouvrir_projet(projet)
+    return projet
 
 def sauvegarder_projet(data, app):
-    """Sauvegarde les données du projet."""
-    # Fonctionnalité future : Implémenter la sauvegarde d'un projet
-    messagebox.showinfo("Sauvegarder Projet", "La fonction de sauvegarde de projet est en développement !", parent=app)
+    """
+    Demande un nom de fichier et y enregistre le projet `data` ; le projet est
+    aussi ajouté à l'archive. Retourne le chemin choisi, ou None si l'utilisateur annule.
+    """
+    from tkinter import filedialog, messagebox
+    from core.projets import EXTENSION_PROJET, ArchiveProjets, ecrire_projet
+    chemin = filedialog.asksaveasfilename(
+        parent=app, title="Enregistrer le projet", defaultextension=EXTENSION_PROJET,
+        initialfile=data.get("nom") or "", filetypes=_types_projet(),
+    )
+    if not chemin:
+        return None
+    if not data.get("nom"):
+        data["nom"] = os.path.splitext(os.path.basename(chemin))[0]
+    try:
+        ecrire_projet(data, chemin)
+        with ArchiveProjets() as archive:
+            archive.enregistrer(data)
+    except (OSError, sqlite3.Error) as e:
+        messagebox.showerror("Enregistrer le projet", f"Impossible d'enregistrer le projet :\n{e}", parent=app)
+        return None
+    return chemin